@@ -1,231 +1,2655 @@
-from typing import List, Tuple, Dict
+import heapq
+import math
+import random
+import threading
+import time
+from collections import OrderedDict, deque
+from functools import partial
+from itertools import count, islice
+from multiprocessing import Pipe, Pool, Process, Value
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Tuple, Union
 
-class Node:
+import numpy as np
+
+from compact_graph import CompactGraph, as_compact
+
+class NodePool:
+    """
+    Array-backed store for the nodes generated during a search.
+
+    A search node is an integer index into parallel lists holding its graph
+    node id, the index of its parent (-1 for the root) and its accumulated g
+    and h costs. Search nodes do not carry their own copy of the path; it is
+    rebuilt from the parent indices only when it is needed.
+
+    Parameters:
+    - labels: Node names indexed by graph node id, used when rebuilding paths.
+    """
+    __slots__ = ("labels", "nodes", "parents", "g", "h")
+
+    def __init__(self, labels: List[str]):
+        self.labels = labels
+        self.nodes = []
+        self.parents = []
+        self.g = []
+        self.h = []
+
+    def add(self, node: int, parent: int = -1, g=0, h=0) -> int:
+        """Stores a new search node for a graph node id and returns its index."""
+        self.nodes.append(node)
+        self.parents.append(parent)
+        self.g.append(g)
+        self.h.append(h)
+        return len(self.nodes) - 1
+
+    def path(self, index: int) -> List[str]:
+        """Rebuilds the node names from the root to the node at index (empty for -1)."""
+        labels = self.labels
+        nodes = self.nodes
+        parents = self.parents
+        path = []
+        while index != -1:
+            path.append(labels[nodes[index]])
+            index = parents[index]
+        path.reverse()
+        return path
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+
+class PriorityFrontier:
+    """
+    Binary-heap frontier shared by the cost-ordered searches.
+
+    Entries are ordered by (priority, insertion order), so nodes with equal
+    priority leave the frontier in the order they were pushed, exactly like the
+    stable sort used before. Entries whose node has already been settled are
+    discarded lazily when they reach the top of the heap.
+
+    Parameters:
+    - settled: Optional bytearray flagging the graph node ids already expanded.
+    - nodes: Graph node id of every pushed entry (NodePool.nodes); required with settled.
+    """
+    def __init__(self, settled: bytearray = None, nodes: List[int] = None):
+        self._heap = []
+        self._counter = count()
+        self._settled = settled
+        self._nodes = nodes
+
+    def _discard_stale(self) -> None:
+        """Drops settled entries sitting at the top of the heap."""
+        heap = self._heap
+        settled = self._settled
+        if settled is not None:
+            nodes = self._nodes
+            while heap and settled[nodes[heap[0][2]]]:
+                heapq.heappop(heap)
+
+    def push(self, node: int, priority) -> None:
+        """Adds a node index to the frontier in O(log n)."""
+        heapq.heappush(self._heap, (priority, next(self._counter), node))
+
+    def pop(self) -> int:
+        """Removes and returns the node index with the lowest priority in O(log n)."""
+        self._discard_stale()
+        return heapq.heappop(self._heap)[2]
+
+    def nodes(self) -> List[int]:
+        """Returns the live node indices in the order they would be popped."""
+        entries = sorted(self._heap)
+        if self._settled is None:
+            return [entry[2] for entry in entries]
+        settled = self._settled
+        nodes = self._nodes
+        return [entry[2] for entry in entries if not settled[nodes[entry[2]]]]
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def __bool__(self) -> bool:
+        self._discard_stale()
+        return bool(self._heap)
+
+
+class SortedListFrontier:
+    """
+    The original list frontier: sorted on every pop, popped from the front.
+
+    Kept so the heap frontier can be compared against the old behaviour.
+    """
+    def __init__(self):
+        self._items = []
+
+    def push(self, node: int, priority) -> None:
+        """Appends a node index to the frontier."""
+        self._items.append((priority, node))
+
+    def pop(self) -> int:
+        """Sorts the whole list and removes the node index with the lowest priority."""
+        self._items.sort(key=lambda x: x[0])
+        return self._items.pop(0)[1]
+
+    def nodes(self) -> List[int]:
+        """Returns the node indices in their current list order."""
+        return [item[1] for item in self._items]
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+def _parent_paths(pool: NodePool, frontier) -> List[List[str]]:
+    """
+    Lists the distinct paths leading to the frontier nodes, in frontier order.
+
+    Parameters:
+    - pool: The node pool of the running search.
+    - frontier: Iterable of node indices currently on the frontier.
+
+    Returns:
+    - The path to the parent of every frontier node, without duplicates.
     """
-    Represents a node in the search graph.
+    parents = pool.parents
+    seen = set()
+    iteration = []
+    for index in frontier:
+        parent = parents[index]
+        if parent not in seen:
+            seen.add(parent)
+            iteration.append(pool.path(parent))
+    return iteration
+
+
+class SearchStats:
+    """
+    Counters and timings of one search, filled in when passed as stats=.
+
+    Leaving stats as None skips all of this, so an uninstrumented search only
+    pays for one None check per expansion.
 
     Attributes:
-    - name: The name of the node.
-    - path: The path from the start node to this node.
-    - cost: The cost of reaching this node from the start node.
-    """
-    def __init__(self, name: str, path: List[str], cost: int = None):
-        self.name = name
-        self.path = path
-        self.cost = cost
-        
-    def __lt__(self, other: 'Node') -> bool:
-        """Comparison method for nodes based on their cost."""
-        return self.cost < other.cost    
-  
+    - expanded: Nodes whose neighbours were generated.
+    - generated: Search nodes added to the frontier, not counting the start.
+    - duplicates: Pushes of a graph node that had already been pushed before.
+    - max_frontier: Largest number of entries held by the frontier.
+      generated, duplicates and max_frontier are None for searches that do not
+      track them (see untracked()); reports leave them out.
+    - evaluations: Heuristic evaluations, for the searches that count them (restart_hill_climbing).
+    - total_seconds: Wall time of the whole search.
+    - trace_seconds: Part of total_seconds spent recording the frontier trace.
+    """
+    __slots__ = ("expanded", "generated", "duplicates", "max_frontier", "evaluations",
+                 "total_seconds", "trace_seconds", "_began")
+
+    def __init__(self):
+        self.expanded = 0
+        self.generated = 0
+        self.duplicates = 0
+        self.max_frontier = 0
+        self.evaluations = 0
+        self.total_seconds = 0.0
+        self.trace_seconds = 0.0
+        self._began = 0.0
+
+    @property
+    def expand_seconds(self) -> float:
+        """Time spent searching rather than recording the trace."""
+        return self.total_seconds - self.trace_seconds
+
+    def start(self) -> None:
+        """Marks the start of the search."""
+        self._began = time.perf_counter()
+
+    def expansion(self, frontier_size: int) -> None:
+        """Counts one expansion and the frontier size right after it."""
+        self.expanded += 1
+        if frontier_size > self.max_frontier:
+            self.max_frontier = frontier_size
+
+    def finish(self, pool: NodePool = None) -> None:
+        """Stops the clock and derives the generated and duplicate counts from the node pool."""
+        self.total_seconds = time.perf_counter() - self._began
+        if pool is not None and len(pool):
+            self.generated = len(pool) - 1
+            self.duplicates = len(pool) - len(set(pool.nodes))
+            self.max_frontier = max(self.max_frontier, 1)
+
+    def untracked(self, *counters: str) -> None:
+        """Sets counters the search does not track to None, so they are not reported as 0."""
+        for counter in counters:
+            setattr(self, counter, None)
+
+    def timed(self, func: Callable) -> Callable:
+        """Wraps a trace-recording callable so its run time is added to trace_seconds."""
+        clock = time.perf_counter
+
+        def timed_func(*args):
+            began = clock()
+            result = func(*args)
+            self.trace_seconds += clock() - began
+            return result
+        return timed_func
+
+    def as_dict(self) -> Dict[str, float]:
+        """Returns the counters and timings as a dictionary."""
+        return {
+            "expanded": self.expanded,
+            "generated": self.generated,
+            "duplicates": self.duplicates,
+            "max_frontier": self.max_frontier,
+            "evaluations": self.evaluations,
+            "expand_seconds": self.expand_seconds,
+            "trace_seconds": self.trace_seconds,
+            "total_seconds": self.total_seconds,
+        }
+
     def __str__(self) -> str:
-        """String representation of the node."""
-        return f"Node: {self.name}, Path: {self.path}, Cost: {self.cost}"
+        counters = [("expanded", self.expanded), ("generated", self.generated), ("duplicates", self.duplicates),
+                    ("max frontier", self.max_frontier), ("heuristic evaluations", self.evaluations or None)]
+        reported = [f"{label} {value}" for label, value in counters if value is not None]
+        return ", ".join(reported + [f"search {self.expand_seconds * 1000:.2f} ms",
+                                     f"trace {self.trace_seconds * 1000:.2f} ms"])
 
 
-def DFS(graph, start, goal) -> Tuple[List[str], int]:
+class _TimedRecorder:
+    """Forwards to a trace recorder while timing every call into a SearchStats."""
+    def __init__(self, recorder, stats: SearchStats):
+        self.pushed = stats.timed(recorder.pushed)
+        self.popped = stats.timed(recorder.popped)
+        self.reached = stats.timed(recorder.reached)
+        self.result = recorder.result
+
+
+def _finish(pool: NodePool, recorder, stats: SearchStats = None):
+    """Closes the stats of a search and returns its recorded frontier states."""
+    if stats is not None:
+        stats.finish(pool)
+    return [] if recorder is None else recorder.result()
+
+
+TRACE_MODES = ("off", "delta", "full")
+
+PUSH = 0
+POP = 1
+
+
+class _SnapshotLog:
     """
-    Depth-First Search (DFS) algorithm explores as far as possible along each branch before backtracking.
+    Keeps the list of distinct frontier states in the order they were seen.
+
+    Parameters:
+    - pool: The node pool of the search.
+    - parent_paths: Show the path to each node's parent instead of the node itself.
+    """
+    def __init__(self, pool: NodePool, parent_paths: bool):
+        self.pool = pool
+        self.parent_paths = parent_paths
+        self.states = []
+        self.last = []
+        self._seen = set()
+
+    def add(self, frontier) -> None:
+        """Records the frontier (node indices in frontier order) if it is new."""
+        pool = self.pool
+        if self.parent_paths:
+            iteration = _parent_paths(pool, frontier)
+        else:
+            iteration = [pool.path(node) for node in frontier]
+        key = tuple(map(tuple, iteration))
+        if key not in self._seen:
+            self._seen.add(key)
+            self.states.append(iteration)
+        self.last = iteration
+
+    def add_goal(self, node: int) -> None:
+        """Appends the final state: the last frontier plus the goal path."""
+        self.states.append(self.last + [self.pool.path(node)])
+
+
+class _FullTrace:
+    """Recorder for the "full" trace mode: snapshots the frontier after every pop."""
+    def __init__(self, pool: NodePool, frontier_nodes, parent_paths: bool = True):
+        self._log = _SnapshotLog(pool, parent_paths)
+        self._frontier_nodes = frontier_nodes
+
+    def pushed(self, node: int, priority=None) -> None:
+        pass
+
+    def popped(self, node: int) -> None:
+        self._log.add(self._frontier_nodes())
+
+    def reached(self, node: int) -> None:
+        self._log.add_goal(node)
+
+    def result(self) -> List[List[List[str]]]:
+        return self._log.states
+
+
+class FrontierTrace:
+    """
+    Frontier history recorded as push and pop events ("delta" trace mode).
+
+    Recording costs O(1) per event. Any frontier snapshot is rebuilt on demand
+    by replaying the events, and iterating the trace yields the same frontier
+    states the "full" mode records.
+
+    Parameters:
+    - pool: The node pool of the search.
+    - ordering: How the frontier orders its nodes: "lifo", "fifo" or "priority".
+    - parent_paths: Show the path to each node's parent instead of the node itself.
+    - lazy: Hide entries of already settled nodes, like the heap frontier does.
+    """
+    def __init__(self, pool: NodePool, ordering: str, parent_paths: bool = True, lazy: bool = False):
+        self.pool = pool
+        self.ordering = ordering
+        self.parent_paths = parent_paths
+        self.lazy = lazy
+        self.events = []
+        self.goal = -1
+        self.steps = 0
+
+    def pushed(self, node: int, priority=None) -> None:
+        """Records a node entering the frontier."""
+        self.events.append((PUSH, node, priority))
+
+    def popped(self, node: int) -> None:
+        """Records a node leaving the frontier; every pop is one step."""
+        self.events.append((POP, node, None))
+        self.steps += 1
+
+    def reached(self, node: int) -> None:
+        """Records the goal node."""
+        self.goal = node
+
+    def result(self) -> 'FrontierTrace':
+        return self
+
+    def frontiers(self):
+        """
+        Replays the events, yielding the frontier after each pop.
+
+        Yields:
+        - List of node indices in frontier order.
+        """
+        nodes_of = self.pool.nodes
+        by_priority = self.ordering == "priority"
+        lazy = self.lazy
+        live = {}
+        settled = set()
+        seq = 0
+        for op, node, priority in self.events:
+            if op == PUSH:
+                live[node] = (priority, seq) if by_priority else seq
+                seq += 1
+                continue
+            del live[node]
+            if by_priority:
+                nodes = sorted(live, key=live.__getitem__)
+                if lazy:
+                    nodes = [n for n in nodes if nodes_of[n] not in settled]
+            else:
+                nodes = list(live)
+            yield nodes
+            if lazy:
+                settled.add(nodes_of[node])
+
+    def snapshot(self, step: int) -> List[List[str]]:
+        """
+        Rebuilds the frontier paths as they were after the given pop.
+
+        Parameters:
+        - step: Index of the pop, from 0 to steps - 1.
+
+        Returns:
+        - The frontier paths at that step.
+        """
+        if not 0 <= step < self.steps:
+            raise IndexError(f"step {step} out of range for a trace of {self.steps} steps")
+        for index, nodes in enumerate(self.frontiers()):
+            if index == step:
+                if self.parent_paths:
+                    return _parent_paths(self.pool, nodes)
+                return [self.pool.path(node) for node in nodes]
+
+    def __iter__(self):
+        log = _SnapshotLog(self.pool, self.parent_paths)
+        for nodes in self.frontiers():
+            count_before = len(log.states)
+            log.add(nodes)
+            if len(log.states) > count_before:
+                yield log.states[-1]
+        if self.goal != -1:
+            log.add_goal(self.goal)
+            yield log.states[-1]
+
+
+class _VisitLog:
+    """Recorder of hill climbing: the path of every search node, the first time it is pushed or popped."""
+    def __init__(self, pool: NodePool):
+        self.pool = pool
+        self.states = []
+        self._recorded = set()
+
+    def pushed(self, node: int, priority=None) -> None:
+        if node not in self._recorded:
+            self._recorded.add(node)
+            self.states.append(self.pool.path(node))
+
+    popped = pushed
+
+    def reached(self, node: int) -> None:
+        pass
+
+    def result(self) -> List[List[str]]:
+        return self.states
+
+
+class _FrontierView(NamedTuple):
+    """How the frontier of a running search is read and recorded."""
+    nodes: Callable
+    ordering: str
+    parent_paths: bool = True
+    lazy: bool = False
+    record_goal: bool = True
+
+
+class SearchEvent(NamedTuple):
+    """
+    One step reported by a step generator such as DFS_steps.
+
+    Events name search nodes by their index in the search's NodePool, so
+    yielding one rebuilds no path; path, cost and frontier_paths() are worked
+    out on demand. frontier_paths() reads the live frontier, so it only
+    describes the event until the generator is resumed.
+
+    Attributes:
+    - pool: The NodePool of the search.
+    - index: The search node the event is about.
+    - priority: Frontier priority of the node (Push events of the cost-ordered searches).
+    - view: How the frontier of the search is read.
+    """
+    pool: NodePool
+    index: int
+    priority: float = None
+    view: _FrontierView = None
+
+    @property
+    def node(self) -> str:
+        """Name of the graph node."""
+        return self.pool.labels[self.pool.nodes[self.index]]
+
+    @property
+    def path(self) -> List[str]:
+        """Path from the start to the node."""
+        return self.pool.path(self.index)
+
+    @property
+    def cost(self):
+        """Cost of that path."""
+        return self.pool.g[self.index]
+
+    def frontier_paths(self, limit: int = None) -> List[List[str]]:
+        """
+        Lists the frontier as the search shows it in its trace.
+
+        Parameters:
+        - limit: Only read the first limit frontier entries.
+
+        Returns:
+        - The paths on the frontier (to each entry's parent for the uninformed searches).
+        """
+        nodes = self.view.nodes()
+        if limit is not None:
+            nodes = islice(nodes, limit)
+        if self.view.parent_paths:
+            return _parent_paths(self.pool, nodes)
+        return [self.pool.path(node) for node in nodes]
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.node!r}, cost={self.cost})"
+
+
+class Push(SearchEvent):
+    """A search node entered the frontier."""
+    __slots__ = ()
+
+
+class Expand(SearchEvent):
+    """A search node left the frontier to be expanded (searches skip it if its graph node already was)."""
+    __slots__ = ()
+
+
+class GoalFound(SearchEvent):
+    """The goal was reached; path and cost are the search's answer. It is the last event."""
+    __slots__ = ()
+
+
+def _trace_recorder(trace: str, pool: NodePool, ordering: str, frontier_nodes,
+                    parent_paths: bool = True, lazy: bool = False, stats: SearchStats = None):
+    """
+    Creates the frontier recorder for the requested trace mode.
+
+    Parameters:
+    - trace: One of TRACE_MODES.
+    - pool: The node pool of the search.
+    - ordering: How the frontier orders its nodes: "lifo", "fifo" or "priority"; "visit"
+      records every node's path once instead, in both modes.
+    - frontier_nodes: Callable returning the current frontier in order (used by "full").
+    - parent_paths: Show the path to each node's parent instead of the node itself.
+    - lazy: Hide entries of already settled nodes, like the heap frontier does.
+    - stats: Optional SearchStats that times the recording.
+
+    Returns:
+    - The recorder, or None when tracing is off.
+    """
+    if trace == "off":
+        return None
+    if trace not in TRACE_MODES:
+        raise ValueError(f"Unknown trace mode {trace!r}; expected one of {TRACE_MODES}")
+    if ordering == "visit":
+        recorder = _VisitLog(pool)
+    elif trace == "delta":
+        recorder = FrontierTrace(pool, ordering, parent_paths, lazy)
+    else:
+        recorder = _FullTrace(pool, frontier_nodes, parent_paths)
+    if stats is not None:
+        return _TimedRecorder(recorder, stats)
+    return recorder
+
+
+def run_steps(steps: Iterator[SearchEvent], trace: str = "full", stats: SearchStats = None,
+              on_state: Callable = None) -> Tuple[List[str], int]:
+    """
+    Drains a step generator into the result of the matching search function.
+
+    Parameters:
+    - steps: A step generator, e.g. DFS_steps(graph, start, goal).
+    - trace: Frontier tracing mode: "off", "delta" or "full".
+    - stats: The SearchStats given to the generator, so the recording is timed.
+    - on_state: Optional callable receiving every new frontier state as soon as it is
+      recorded (with trace="full"), for printing the search while it runs.
+
+    Returns:
+    - Tuple containing the path (empty if goal was not reached), its cost, and frontier states explored.
+    """
+    if trace not in TRACE_MODES:
+        raise ValueError(f"Unknown trace mode {trace!r}; expected one of {TRACE_MODES}")
+    recorder = None
+    states = None
+    emitted = 0
+    path, cost = [], 0
+    for event in steps:
+        kind = type(event)
+        if kind is GoalFound:
+            if recorder is not None and event.view.record_goal:
+                recorder.reached(event.index)
+            path, cost = event.path, event.cost
+            break
+        if recorder is None:
+            if trace == "off":
+                continue
+            view = event.view
+            recorder = _trace_recorder(trace, event.pool, view.ordering, view.nodes, view.parent_paths,
+                                       view.lazy, stats)
+            pushed = recorder.pushed
+            popped = recorder.popped
+            if trace == "full" and on_state is not None:
+                states = recorder.result()
+        if kind is Push:
+            pushed(event.index, event.priority)
+        else:
+            popped(event.index)
+        if states is not None:
+            while emitted < len(states):
+                on_state(states[emitted])
+                emitted += 1
+    if states is not None:
+        for state in states[emitted:]:
+            on_state(state)
+    return path, cost, [] if recorder is None else recorder.result()
+
+
+def _heuristic_list(graph: CompactGraph, h_table, goal: str = None) -> list:
+    """
+    Lays a heuristic table out by node id.
+
+    Parameters:
+    - graph: The CompactGraph being searched.
+    - h_table: Dictionary keyed by node name, a sequence already indexed by node id,
+      or an object computing estimates per goal through heuristic(goal), such as a
+      landmarks.LandmarkTable.
+    - goal: The goal node, used by heuristic(goal).
+
+    Returns:
+    - List of heuristic values indexed by node id.
+    """
+    if hasattr(h_table, "heuristic"):
+        h_table = h_table.heuristic(goal)
+    if isinstance(h_table, dict):
+        return [h_table[name] for name in graph.names]
+    if hasattr(h_table, "tolist"):
+        return h_table.tolist()
+    return list(h_table)
+
+
+def DFS_steps(graph, start, goal, stats: SearchStats = None, progress: bool = True) -> Iterator[SearchEvent]:
+    """
+    The search of DFS() as a generator of events.
 
     Parameters:
-    - graph: The graph represented as a dictionary.
+    - graph: The graph as a dictionary or a CompactGraph.
     - start: The starting node.
     - goal: The goal node.
+    - stats: Optional SearchStats to fill with counters and timings.
+    - progress: Yield Push and Expand events; False only yields GoalFound.
 
-    Returns:
-    - Tuple containing the optimal path, its cost, and frontier states explored.
+    Yields:
+    - Push and Expand events, then GoalFound if the goal is reached.
     """
-    frontier_states = []
-    visited = set()
-    stack = [Node(start, [], 0)]
+    if stats is not None:
+        stats.start()
+    graph = as_compact(graph)
+    start_node = graph.node_id(start)
+    goal_node = graph.index.get(goal, -1)
+    visited = bytearray(len(graph))
+    pool = NodePool(graph.names)
+    nodes = pool.nodes
+    g = pool.g
+    stack = [pool.add(start_node)]
+    view = _FrontierView(lambda: stack, "lifo")
+    if progress:
+        yield Push(pool, stack[0], None, view)
 
     while stack:
-        current_node = stack.pop()
-        iteration = []
-        for node in stack:
-            if node.path not in iteration:
-                iteration.append(node.path)
-        if iteration not in frontier_states:       
-            frontier_states.append(iteration)
-
-        if current_node.name == goal:
-            frontier_states.append(iteration + [current_node.path + [current_node.name]])
-            return current_node.path + [current_node.name], current_node.cost, frontier_states
+        current = stack.pop()
+        node = nodes[current]
+        if progress:
+            yield Expand(pool, current, None, view)
+
+        if node == goal_node:
+            if stats is not None:
+                stats.finish(pool)
+            yield GoalFound(pool, current, None, view)
+            return
         
-        if current_node.name not in visited:
-            visited.add(current_node.name)
+        if not visited[node]:
+            visited[node] = 1
 
-            for next_node, edge_cost in list(graph[current_node.name].items()):
-                new_path = current_node.path + [current_node.name]
-                new_cost = current_node.cost + edge_cost
-                new_node = Node(next_node, new_path, new_cost)
-                stack.append(new_node)
+            cost = g[current]
+            for next_node, edge_cost in graph.neighbors(node):
+                child = pool.add(next_node, current, cost + edge_cost)
+                stack.append(child)
+                if progress:
+                    yield Push(pool, child, None, view)
+            if stats is not None:
+                stats.expansion(len(stack))
 
-    return [], 0, frontier_states
-    
-def BFS(graph, start, goal) -> Tuple[List[str], int]:
+    if stats is not None:
+        stats.finish(pool)
+
+
+def DFS(graph, start, goal, trace: str = "full", stats: SearchStats = None) -> Tuple[List[str], int]:
     """
-    Breadth-First Search (BFS) algorithm explores all neighbor nodes at the present depth prior to moving on to the nodes at the next depth level.
+    Depth-First Search (DFS) algorithm explores as far as possible along each branch before backtracking.
 
     Parameters:
-    - graph: The graph represented as a dictionary.
+    - graph: The graph as a dictionary or a CompactGraph.
     - start: The starting node.
     - goal: The goal node.
+    - trace: Frontier tracing mode: "off", "delta" or "full".
+    - stats: Optional SearchStats to fill with counters and timings.
 
     Returns:
     - Tuple containing the optimal path, its cost, and frontier states explored.
     """
-    frontier_states = []
-    visited = set()
-    queue = [Node(start, [], 0)]
+    return run_steps(DFS_steps(graph, start, goal, stats, trace != "off"), trace, stats)
+
+
+def BFS_steps(graph, start, goal, visited_on_enqueue: bool = False, stats: SearchStats = None,
+              progress: bool = True) -> Iterator[SearchEvent]:
+    """
+    The search of BFS() as a generator of events.
+
+    Parameters:
+    - graph: The graph as a dictionary or a CompactGraph.
+    - start: The starting node.
+    - goal: The goal node.
+    - visited_on_enqueue: See BFS().
+    - stats: Optional SearchStats to fill with counters and timings.
+    - progress: Yield Push and Expand events; False only yields GoalFound.
+
+    Yields:
+    - Push and Expand events, then GoalFound if the goal is reached.
+    """
+    if stats is not None:
+        stats.start()
+    graph = as_compact(graph)
+    start_node = graph.node_id(start)
+    goal_node = graph.index.get(goal, -1)
+    visited = bytearray(len(graph))
+    if visited_on_enqueue:
+        visited[start_node] = 1
+    pool = NodePool(graph.names)
+    nodes = pool.nodes
+    g = pool.g
+    queue = deque([pool.add(start_node)])
+    view = _FrontierView(lambda: queue, "fifo")
+    if progress:
+        yield Push(pool, queue[0], None, view)
     
     while queue:
-        current_node = queue.pop(0)
-        iteration = []
-        for node in queue:
-            if node.path not in iteration:
-                iteration.append(node.path)
-        if iteration not in frontier_states:       
-            frontier_states.append(iteration)
-
-        if current_node.name == goal:
-            frontier_states.append(iteration + [current_node.path + [current_node.name]])
-            return current_node.path + [current_node.name], current_node.cost, frontier_states
-
-        if current_node.name not in visited:
-            visited.add(current_node.name)
+        current = queue.popleft()
+        node = nodes[current]
+        if progress:
+            yield Expand(pool, current, None, view)
+
+        if node == goal_node:
+            if stats is not None:
+                stats.finish(pool)
+            yield GoalFound(pool, current, None, view)
+            return
+
+        if visited_on_enqueue:
+            cost = g[current]
+            for next_node, next_cost in graph.neighbors(node):
+                if not visited[next_node]:
+                    visited[next_node] = 1
+                    child = pool.add(next_node, current, cost + next_cost)
+                    queue.append(child)
+                    if progress:
+                        yield Push(pool, child, None, view)
+            if stats is not None:
+                stats.expansion(len(queue))
+
+        elif not visited[node]:
+            visited[node] = 1
             
-            for next_node, next_cost in graph[current_node.name].items():
-                new_path = current_node.path + [current_node.name]
-                new_cost = current_node.cost + next_cost
-                new_node = Node(next_node, new_path, new_cost)
-                queue.append(new_node)
+            cost = g[current]
+            for next_node, next_cost in graph.neighbors(node):
+                child = pool.add(next_node, current, cost + next_cost)
+                queue.append(child)
+                if progress:
+                    yield Push(pool, child, None, view)
+            if stats is not None:
+                stats.expansion(len(queue))
+
+    if stats is not None:
+        stats.finish(pool)
 
-    return [], 0, frontier_states
 
-def Uninformed_cost_search(graph, start, end) -> Tuple[List[str], int]:
+def BFS(graph, start, goal, visited_on_enqueue: bool = False, trace: str = "full",
+        stats: SearchStats = None) -> Tuple[List[str], int]:
     """
-    Uninformed Cost Search algorithm explores nodes in the order of their total path costs from the start node.
+    Breadth-First Search (BFS) algorithm explores all neighbor nodes at the present depth prior to moving on to the nodes at the next depth level.
 
     Parameters:
-    - graph: The graph represented as a dictionary.
+    - graph: The graph as a dictionary or a CompactGraph.
     - start: The starting node.
-    - end: The goal node.
+    - goal: The goal node.
+    - visited_on_enqueue: Mark nodes as visited when they are queued, so no node enters the queue twice.
+    - trace: Frontier tracing mode: "off", "delta" or "full".
+    - stats: Optional SearchStats to fill with counters and timings.
 
     Returns:
     - Tuple containing the optimal path, its cost, and frontier states explored.
     """
-    frontier_states = []
-    visited = set()
-    priority_queue = [Node(start, [], 0)]
+    return run_steps(BFS_steps(graph, start, goal, visited_on_enqueue, stats, trace != "off"), trace, stats)
+
+
+def Uninformed_cost_search_steps(graph, start, end, use_heap: bool = True, stats: SearchStats = None,
+                                 progress: bool = True) -> Iterator[SearchEvent]:
+    """
+    The search of Uninformed_cost_search() as a generator of events.
+
+    Parameters:
+    - graph: The graph as a dictionary or a CompactGraph.
+    - start: The starting node.
+    - end: The goal node.
+    - use_heap: See Uninformed_cost_search().
+    - stats: Optional SearchStats to fill with counters and timings.
+    - progress: Yield Push and Expand events; False only yields GoalFound.
+
+    Yields:
+    - Push and Expand events, then GoalFound if the goal is reached.
+    """
+    if stats is not None:
+        stats.start()
+    graph = as_compact(graph)
+    start_node = graph.node_id(start)
+    goal_node = graph.index.get(end, -1)
+    visited = bytearray(len(graph))
+    pool = NodePool(graph.names)
+    nodes = pool.nodes
+    g = pool.g
+    priority_queue = PriorityFrontier(visited, nodes) if use_heap else SortedListFrontier()
+    view = _FrontierView(priority_queue.nodes, "priority", lazy=use_heap)
+    root = pool.add(start_node)
+    priority_queue.push(root, 0)
+    if progress:
+        yield Push(pool, root, 0, view)
     
     while priority_queue:
-        priority_queue.sort(key=lambda x: x.cost)
-        current_node = priority_queue.pop(0)
+        current = priority_queue.pop()
+        node = nodes[current]
+        if progress:
+            yield Expand(pool, current, None, view)
         
-        iteration = []
-        for node in priority_queue:
-            if node.path not in iteration:
-                iteration.append(node.path)
-        if iteration not in frontier_states:       
-            frontier_states.append(iteration)
-        
-        if current_node.name == end:
-            frontier_states.append(iteration + [current_node.path + [current_node.name]])
-            return current_node.path + [current_node.name], current_node.cost, frontier_states
+        if node == goal_node:
+            if stats is not None:
+                stats.finish(pool)
+            yield GoalFound(pool, current, None, view)
+            return
+
+        if not visited[node]:
+            visited[node] = 1
 
-        if current_node.name not in visited:
-            visited.add(current_node.name)
+            cost = g[current]
+            for neighbor, edge_cost in graph.neighbors(node):
+                new_cost = cost + edge_cost
+                child = pool.add(neighbor, current, new_cost)
+                priority_queue.push(child, new_cost)
+                if progress:
+                    yield Push(pool, child, new_cost, view)
+            if stats is not None:
+                stats.expansion(len(priority_queue))
 
-            for neighbor, edge_cost in graph[current_node.name].items():
-                new_cost = current_node.cost + edge_cost
-                new_path = current_node.path + [current_node.name]
-                new_node = Node(neighbor, new_path, new_cost)
-                priority_queue.append(new_node)
+    if stats is not None:
+        stats.finish(pool)
 
-    return [], 0, frontier_states
 
-def A_star_search(graph, start, end, h_table) -> Tuple[List[str], int]:
+def Uninformed_cost_search(graph, start, end, use_heap: bool = True, trace: str = "full",
+                           one_to_all: bool = False, stats: SearchStats = None) -> Tuple[List[str], int]:
     """
-    A* Search algorithm finds the optimal path from start to end node using heuristics.
+    Uninformed Cost Search algorithm explores nodes in the order of their total path costs from the start node.
 
     Parameters:
-    - graph: The graph represented as a dictionary.
+    - graph: The graph as a dictionary or a CompactGraph.
     - start: The starting node.
     - end: The goal node.
-    - h_table: A heuristic table containing estimated costs from each node to the goal node.
+    - use_heap: Use the binary-heap frontier; False falls back to the old sort-based list.
+    - trace: Frontier tracing mode: "off", "delta" or "full".
+    - one_to_all: Answer from the cached shortest-path tree of start (see shortest_path_tree),
+      building it on first use. No frontier is traced in this mode.
+    - stats: Optional SearchStats to fill with counters and timings; in one_to_all
+      mode only total_seconds is recorded.
 
     Returns:
     - Tuple containing the optimal path, its cost, and frontier states explored.
     """
-    frontier_states = []
-    visited = set()
-    priority_queue = [Node(start, [start], (0, h_table[start] + 0))] 
+    if one_to_all:
+        if stats is not None:
+            stats.start()
+        path, cost = shortest_path_tree(graph, start).query(end)
+        return path, cost, _finish(None, None, stats)
+    return run_steps(Uninformed_cost_search_steps(graph, start, end, use_heap, stats, trace != "off"), trace, stats)
+
+
+def A_star_search_steps(graph, start, end, h_table, use_heap: bool = True, stats: SearchStats = None,
+                        progress: bool = True) -> Iterator[SearchEvent]:
+    """
+    The search of A_star_search() as a generator of events.
+
+    Parameters:
+    - graph: The graph as a dictionary or a CompactGraph.
+    - start: The starting node.
+    - end: The goal node.
+    - h_table: Heuristic table, as accepted by A_star_search().
+    - use_heap: See A_star_search().
+    - stats: Optional SearchStats to fill with counters and timings.
+    - progress: Yield Push and Expand events; False only yields GoalFound.
+
+    Yields:
+    - Push and Expand events, then GoalFound if the goal is reached.
+    """
+    if stats is not None:
+        stats.start()
+    graph = as_compact(graph)
+    start_node = graph.node_id(start)
+    goal_node = graph.index.get(end, -1)
+    visited = bytearray(len(graph))
+    pool = NodePool(graph.names)
+    nodes = pool.nodes
+    g = pool.g
+    priority_queue = PriorityFrontier(visited, nodes) if use_heap else SortedListFrontier()
+    view = _FrontierView(priority_queue.nodes, "priority", parent_paths=False, lazy=use_heap, record_goal=False)
+    h_table = _heuristic_list(graph, h_table, end)
+    root = pool.add(start_node, -1, 0, h_table[start_node])
+    priority_queue.push(root, h_table[start_node] + 0)
+    if progress:
+        yield Push(pool, root, h_table[start_node] + 0, view)
 
     while priority_queue:
-        priority_queue.sort(key=lambda x: x.cost[1])  
-        current_node = priority_queue.pop(0)
-        
-    
-        iteration = [node.path for node in priority_queue if node.path not in iteration]
-        if iteration not in frontier_states:       
-            frontier_states.append(iteration)
+        current = priority_queue.pop()
+        node = nodes[current]
+        if progress:
+            yield Expand(pool, current, None, view)
         
-        if current_node.name not in visited:
-            visited.add(current_node.name)
+        if not visited[node]:
+            visited[node] = 1
 
-            if current_node.name == end:
-                return current_node.path, current_node.cost[0], frontier_states
+            if node == goal_node:
+                if stats is not None:
+                    stats.finish(pool)
+                yield GoalFound(pool, current, None, view)
+                return
 
-            for next_node, cost in graph[current_node.name].items():
-                if next_node not in visited:
-                    new_path_cost = cost + current_node.cost[0]
-                    new_heuristic = h_table[next_node] + new_path_cost
-                    new_path = current_node.path + [next_node] 
-                    priority_queue.append(Node(next_node, new_path, (new_path_cost, new_heuristic)))
+            cost = g[current]
+            for next_node, edge_cost in graph.neighbors(node):
+                if not visited[next_node]:
+                    new_path_cost = edge_cost + cost
+                    h = h_table[next_node]
+                    child = pool.add(next_node, current, new_path_cost, h)
+                    priority_queue.push(child, h + new_path_cost)
+                    if progress:
+                        yield Push(pool, child, h + new_path_cost, view)
+            if stats is not None:
+                stats.expansion(len(priority_queue))
 
-    return [], 0, frontier_states
-  
-def hill_climbing(graph, start, goal, heuristic_values) -> Tuple[List[str], int]:
+    if stats is not None:
+        stats.finish(pool)
+
+
+def A_star_search(graph, start, end, h_table, use_heap: bool = True, trace: str = "full",
+                  stats: SearchStats = None) -> Tuple[List[str], int]:
     """
-    Hill Climbing algorithm is a local search algorithm that iteratively makes small improvements
-    to a current solution until no further improvements can be made.
+    A* Search algorithm finds the optimal path from start to end node using heuristics.
 
     Parameters:
-    - graph: The graph represented as a dictionary.
+    - graph: The graph as a dictionary or a CompactGraph.
     - start: The starting node.
-    - goal: The goal node.
-    - heuristic_values: Heuristic values for nodes in the graph.
+    - end: The goal node.
+    - h_table: A heuristic table containing estimated costs from each node to the goal node,
+      either a dictionary keyed by node name, a sequence indexed by node id, or a
+      landmarks.LandmarkTable.
+    - use_heap: Use the binary-heap frontier; False falls back to the old sort-based list.
+    - trace: Frontier tracing mode: "off", "delta" or "full".
+    - stats: Optional SearchStats to fill with counters and timings.
 
     Returns:
     - Tuple containing the optimal path, its cost, and frontier states explored.
     """
-    frontier_states = []
-    explored = set()
-    stack = [Node(start, [start], (heuristic_values[start], 0))]
+    return run_steps(A_star_search_steps(graph, start, end, h_table, use_heap, stats, trace != "off"), trace, stats)
+
+
+def hill_climbing_steps(graph, start, goal, heuristic_values, stats: SearchStats = None,
+                        progress: bool = True) -> Iterator[SearchEvent]:
+    """
+    The search of hill_climbing() as a generator of events.
+
+    Parameters:
+    - graph: The graph as a dictionary or a CompactGraph.
+    - start: The starting node.
+    - goal: The goal node.
+    - heuristic_values: Heuristic values, as accepted by hill_climbing().
+    - stats: Optional SearchStats to fill with counters and timings.
+    - progress: Yield Push and Expand events; False only yields GoalFound.
+
+    Yields:
+    - Push and Expand events, then GoalFound if the goal is reached.
+    """
+    if stats is not None:
+        stats.start()
+    graph = as_compact(graph)
+    start_node = graph.node_id(start)
+    goal_node = graph.index.get(goal, -1)
+    heuristic_values = _heuristic_list(graph, heuristic_values, goal)
+    explored = bytearray(len(graph))
+    pool = NodePool(graph.names)
+    nodes = pool.nodes
+    g = pool.g
+    h = pool.h
+    stack = [pool.add(start_node, -1, 0, heuristic_values[start_node])]
+    view = _FrontierView(lambda: stack, "visit", parent_paths=False)
+    if progress:
+        yield Push(pool, stack[0], None, view)
 
     while stack:
-        stack.sort(key=lambda x: x.cost)
-        current_node = stack.pop()
-        
-        if current_node.path not in frontier_states:
-            frontier_states.append(current_node.path)
+        stack.sort(key=lambda x: (h[x], g[x]))
+        current = stack.pop()
+        node = nodes[current]
+        if progress:
+            yield Expand(pool, current, None, view)
         
-        if current_node.name == goal:
-            return current_node.path, current_node.cost[1], frontier_states
+        if node == goal_node:
+            if stats is not None:
+                stats.finish(pool)
+            yield GoalFound(pool, current, None, view)
+            return
 
-        explored.add(current_node.name)
+        explored[node] = 1
         
-        for neighbor in graph[current_node.name]:
-            if neighbor not in explored:
+        for neighbor, edge_cost in graph.neighbors(node):
+            if not explored[neighbor]:
                 neighbor_cost = heuristic_values[neighbor] 
                 
-                if neighbor_cost < current_node.cost[0]:
-                    new_path = current_node.path + [neighbor]
-                    if new_path not in frontier_states:
-                        frontier_states.append(new_path)
-                    new_cost = current_node.cost[1] + graph[current_node.name][neighbor]
-                    new_node = Node(neighbor, new_path, (neighbor_cost, new_cost))
+                if neighbor_cost < h[current]:
+                    new_node = pool.add(neighbor, current, g[current] + edge_cost, neighbor_cost)
                     stack.append(new_node)
+                    if progress:
+                        yield Push(pool, new_node, None, view)
+        if stats is not None:
+            stats.expansion(len(stack))
+
+    if stats is not None:
+        stats.finish(pool)
+
+
+def hill_climbing(graph, start, goal, heuristic_values, trace: str = "full",
+                  stats: SearchStats = None) -> Tuple[List[str], int]:
+    """
+    Hill Climbing algorithm is a local search algorithm that iteratively makes small improvements
+    to a current solution until no further improvements can be made.
 
-    return [], 0, frontier_states
\ No newline at end of file
+    Parameters:
+    - graph: The graph as a dictionary or a CompactGraph.
+    - start: The starting node.
+    - goal: The goal node.
+    - heuristic_values: Heuristic values for nodes in the graph, by node name, by node id,
+      or as a landmarks.LandmarkTable.
+    - trace: "off" skips recording; "delta" and "full" both record each visited path once,
+      which is already incremental.
+    - stats: Optional SearchStats to fill with counters and timings.
+
+    Returns:
+    - Tuple containing the optimal path, its cost, and frontier states explored.
+    """
+    return run_steps(hill_climbing_steps(graph, start, goal, heuristic_values, stats, trace != "off"), trace, stats)
+
+
+CLIMB_VARIANTS = ("steepest", "first_choice", "stochastic")
+
+_climb_state = {}
+
+
+class _EvaluationBudget:
+    """
+    Heuristic evaluations left to all the climbs of one run, shared by the worker processes.
+
+    Parameters:
+    - total: Evaluations allowed in all.
+    """
+    def __init__(self, total: int):
+        self._left = Value("q", max(0, total))
+
+    def take(self, wanted: int, partial: bool = True) -> int:
+        """
+        Reserves evaluations.
+
+        Parameters:
+        - wanted: Number of evaluations the caller is about to make.
+        - partial: Grant fewer than wanted when that is all that is left; otherwise all or nothing.
+
+        Returns:
+        - The number of evaluations granted.
+        """
+        with self._left.get_lock():
+            granted = min(wanted, self._left.value)
+            if granted < wanted and not partial:
+                granted = 0
+            self._left.value -= granted
+        return granted
+
+    def refund(self, unused: int) -> None:
+        """Returns reserved evaluations that were not made."""
+        if unused:
+            with self._left.get_lock():
+                self._left.value += unused
+
+
+def _climb_settings(graph: CompactGraph, start_node: int, goal_node: int, h: list, variant: str,
+                    walk_length: int, seed: int, deadline: float, budget: _EvaluationBudget) -> dict:
+    """Bundles the graph and climb settings shared by all restarts of one run."""
+    return dict(graph=graph, start_node=start_node, goal_node=goal_node, h=h, variant=variant,
+                walk_length=walk_length, seed=seed, deadline=deadline, budget=budget)
+
+
+def _init_climb_worker(*settings) -> None:
+    """Process-pool initializer: receives the graph and climb settings once per worker process."""
+    _climb_state.update(_climb_settings(*settings))
+
+
+def _climb(graph: CompactGraph, start_node: int, goal_node: int, h: list, variant: str, rng: random.Random,
+           walk: int, deadline: float = None, budget: _EvaluationBudget = None) -> Tuple[List[int], int, int, int]:
+    """
+    Climbs from start towards goal once, never revisiting a node.
+
+    The first walk steps go to random neighbours, which is what makes restarts
+    explore different regions; after that every step must lower the heuristic.
+
+    Parameters:
+    - graph: The CompactGraph.
+    - start_node: The start node id.
+    - goal_node: The goal node id.
+    - h: Heuristic values indexed by node id.
+    - variant: One of CLIMB_VARIANTS.
+    - rng: Random generator of this climb.
+    - walk: Number of random steps taken first.
+    - deadline: time.monotonic() value after which the climb gives up.
+    - budget: Heuristic evaluations left to the run; the climb stops when it cannot get the ones it needs.
+
+    Returns:
+    - Tuple of the node ids of the path (None if goal was not reached), its cost,
+      the heuristic evaluations and the steps taken.
+    """
+    node = start_node
+    path = [node]
+    visited = {node}
+    cost = 0
+    evaluations = 0
+    clock = time.monotonic
+    while node != goal_node:
+        if deadline is not None and clock() > deadline:
+            break
+        candidates = [(neighbor, edge_cost) for neighbor, edge_cost in graph.neighbors(node) if neighbor not in visited]
+        if not candidates:
+            break
+        if walk > 0:
+            walk -= 1
+            choice = rng.choice(candidates)
+        elif variant == "first_choice":
+            # Look at neighbours in random order and take the first one that improves
+            rng.shuffle(candidates)
+            here = h[node]
+            granted = budget.take(len(candidates)) if budget is not None else len(candidates)
+            choice = None
+            used = 0
+            for candidate in candidates[:granted]:
+                used += 1
+                if h[candidate[0]] < here:
+                    choice = candidate
+                    break
+            evaluations += used
+            if budget is not None:
+                budget.refund(granted - used)
+            if choice is None:
+                break
+        else:
+            if budget is not None and not budget.take(len(candidates), partial=False):
+                break
+            here = h[node]
+            evaluations += len(candidates)
+            improving = [candidate for candidate in candidates if h[candidate[0]] < here]
+            if not improving:
+                break
+            if variant == "steepest":
+                lowest = min(h[neighbor] for neighbor, _ in improving)
+                choice = rng.choice([candidate for candidate in improving if h[candidate[0]] == lowest])
+            elif here == float("inf"):
+                choice = rng.choice(improving)
+            else:
+                # Stochastic: steeper improvements are proportionally more likely
+                choice = rng.choices(improving, [here - h[neighbor] for neighbor, _ in improving])[0]
+        node, edge_cost = choice
+        path.append(node)
+        visited.add(node)
+        cost = cost + edge_cost
+    return (path if node == goal_node else None), cost, evaluations, len(path) - 1
+
+
+def _climb_chunk(restarts: Iterable[int], state: dict = None) -> List[Tuple[int, List[int], int, int, int]]:
+    """
+    Runs some restarts.
+
+    Restart 0 climbs straight from start; every other restart first takes a
+    random walk of up to walk_length steps. Each restart seeds its own random
+    generator, so results do not depend on which process ran it. Restarts not
+    begun by the deadline are skipped.
+
+    Parameters:
+    - restarts: Numbers of the restarts to run.
+    - state: Settings from _climb_settings; defaults to the ones held by this worker process.
+
+    Returns:
+    - List of (restart, path or None, cost, evaluations, steps).
+    """
+    if state is None:
+        state = _climb_state
+    deadline = state["deadline"]
+    results = []
+    for restart in restarts:
+        if deadline is not None and time.monotonic() > deadline:
+            break
+        rng = random.Random(state["seed"] * 1000003 + restart)
+        walk = rng.randint(1, state["walk_length"]) if restart and state["walk_length"] else 0
+        results.append((restart,) + _climb(state["graph"], state["start_node"], state["goal_node"], state["h"],
+                                           state["variant"], rng, walk, state["deadline"], state["budget"]))
+    return results
+
+
+def restart_hill_climbing(graph, start, goal, heuristic_values, trace: str = "full", stats: SearchStats = None,
+                          variant: str = "stochastic", restarts: int = 32, walk_length: int = 8,
+                          workers: int = 1, time_budget: float = 1.0, max_evaluations: int = None,
+                          seed: int = 0, chunksize: int = 8) -> Tuple[List[str], int]:
+    """
+    Random-restart Hill Climbing runs many short climbs and keeps the cheapest path that reached the goal.
+
+    A single climb stops at the first local optimum; restarting from a random walk
+    around start lets later climbs get past it. Restarts can run in a process pool
+    and the whole run is bounded by a wall-clock and/or evaluation budget.
+
+    Parameters:
+    - graph: The graph as a dictionary or a CompactGraph.
+    - start: The starting node.
+    - goal: The goal node.
+    - heuristic_values: Heuristic values for nodes in the graph, by node name, by node id,
+      or as a landmarks.LandmarkTable.
+    - trace: "off" skips recording; "delta" and "full" both record the path of every
+      climb that reached the goal, in the order they finished.
+    - stats: Optional SearchStats; expanded counts climb steps and evaluations the
+      heuristic evaluations. Climbs keep no frontier, so no other counter is tracked.
+    - variant: "steepest" (best improving neighbour), "first_choice" (first improving
+      neighbour in random order) or "stochastic" (random improving neighbour,
+      weighted by the improvement).
+    - restarts: Number of climbs.
+    - walk_length: Maximum length of the random walk that starts each restart after the first.
+    - workers: Number of worker processes; 1 runs the climbs in this process.
+    - time_budget: Seconds after which no new step is taken (None for no limit).
+    - max_evaluations: Total heuristic evaluations allowed to all restarts together; a climb
+      stops as soon as the evaluations it needs for its next step are no longer left.
+    - seed: Random seed.
+    - chunksize: Number of restarts sent to a worker at a time.
+
+    Returns:
+    - Tuple containing the best path found (empty if no climb reached the goal), its cost,
+      and the recorded climbs.
+    """
+    if trace not in TRACE_MODES:
+        raise ValueError(f"Unknown trace mode {trace!r}; expected one of {TRACE_MODES}")
+    if variant not in CLIMB_VARIANTS:
+        raise ValueError(f"Unknown hill climbing variant {variant!r}; expected one of {CLIMB_VARIANTS}")
+    if stats is not None:
+        stats.start()
+        stats.untracked("generated", "duplicates", "max_frontier")
+    graph = as_compact(graph)
+    start_node = graph.node_id(start)
+    goal_node = graph.index.get(goal, -1)
+    frontier_states = []
+    best = None
+    if goal_node != -1 and restarts > 0:
+        h = _heuristic_list(graph, heuristic_values, goal)
+        deadline = time.monotonic() + time_budget if time_budget is not None else None
+        budget = _EvaluationBudget(max_evaluations) if max_evaluations is not None else None
+        settings = (graph, start_node, goal_node, h, variant, walk_length, seed, deadline, budget)
+        chunks = [range(first, min(first + chunksize, restarts)) for first in range(0, restarts, chunksize)]
+
+        def collect(chunk_results):
+            nonlocal best
+            for restart, path, cost, evaluations, steps in chunk_results:
+                if path is not None:
+                    if trace != "off":
+                        frontier_states.append([graph.names[node] for node in path])
+                    if best is None or (cost, restart) < best[:2]:
+                        best = (cost, restart, path)
+                if stats is not None:
+                    stats.expanded += steps
+                    stats.evaluations += evaluations
+
+        if workers <= 1:
+            state = _climb_settings(*settings)
+            for chunk in chunks:
+                if deadline is not None and time.monotonic() > deadline:
+                    break
+                collect(_climb_chunk(chunk, state))
+        else:
+            with Pool(workers, initializer=_init_climb_worker, initargs=settings) as pool:
+                for chunk_results in pool.imap_unordered(_climb_chunk, chunks):
+                    collect(chunk_results)
+    if stats is not None:
+        stats.finish()
+    if best is None:
+        return [], 0, frontier_states
+    cost, _, path = best
+    return [graph.names[node] for node in path], cost, frontier_states
+
+
+def _expand_layer(adjacency: CompactGraph, layer: List[int], labels: Dict[int, int],
+                  other: Dict[int, int], stats: SearchStats = None) -> Tuple[List[int], int]:
+    """
+    Expands one BFS layer of a bidirectional search.
+
+    Parameters:
+    - adjacency: The graph, or its reverse for the backward search.
+    - layer: Node ids of the layer, all at the same depth.
+    - labels: Depth of every node reached by this side; updated in place.
+    - other: Depth of every node reached by the opposite side.
+    - stats: Optional SearchStats.
+
+    Returns:
+    - Tuple of the next layer and the length of the shortest start-goal path
+      through a newly reached node (-1 if the two sides did not meet).
+    """
+    depth = labels[layer[0]] + 1
+    next_layer = []
+    shortest = -1
+    for node in layer:
+        for neighbor, _ in adjacency.neighbors(node):
+            if neighbor not in labels:
+                labels[neighbor] = depth
+                next_layer.append(neighbor)
+                other_depth = other.get(neighbor)
+                if other_depth is not None and (shortest == -1 or depth + other_depth < shortest):
+                    shortest = depth + other_depth
+        if stats is not None:
+            stats.expansion(len(next_layer))
+    return next_layer, shortest
+
+
+def _first_bfs_path(graph: CompactGraph, reverse: CompactGraph, start_node: int, goal_node: int,
+                    forward: Dict[int, int], backward: Dict[int, int], length: int) -> Tuple[List[int], int]:
+    """
+    Picks, among all fewest-edge paths, the one a one-way BFS would return.
+
+    The nodes lying on a fewest-edge path are collected outwards from the layer
+    where the two searches met, then BFS is replayed from start over those nodes
+    only. A node's BFS parent is always one of them, so the replay reaches goal
+    through the same parents, in the same order, as the full BFS.
+
+    Parameters:
+    - graph: The searched graph.
+    - reverse: Its reverse graph.
+    - start_node: The start node id.
+    - goal_node: The goal node id.
+    - forward: Depth from start of every node the forward side reached.
+    - backward: Depth to goal of every node the backward side reached.
+    - length: Number of edges of the shortest path.
+
+    Returns:
+    - Tuple of the node ids of the path and its cost.
+    """
+    meeting = [node for node, depth in forward.items() if backward.get(node, -1) == length - depth]
+    on_path = set(meeting)
+    pending = list(meeting)
+    while pending:
+        node = pending.pop()
+        depth = forward.get(node)
+        if depth is not None and depth > 0:
+            for previous, _ in reverse.neighbors(node):
+                if forward.get(previous) == depth - 1 and previous not in on_path:
+                    on_path.add(previous)
+                    pending.append(previous)
+        depth = backward.get(node)
+        if depth is not None and depth > 0:
+            for following, _ in graph.neighbors(node):
+                if backward.get(following) == depth - 1 and following not in on_path:
+                    on_path.add(following)
+                    pending.append(following)
+
+    parents = {start_node: (-1, 0)}
+    queue = deque([start_node])
+    while goal_node not in parents:
+        node = queue.popleft()
+        for neighbor, edge_cost in graph.neighbors(node):
+            if neighbor in on_path and neighbor not in parents:
+                parents[neighbor] = (node, edge_cost)
+                queue.append(neighbor)
+
+    path = []
+    edge_costs = []
+    node = goal_node
+    while node != -1:
+        path.append(node)
+        node, edge_cost = parents[node]
+        edge_costs.append(edge_cost)
+    path.reverse()
+    cost = 0
+    for edge_cost in reversed(edge_costs[:-1]):
+        cost = cost + edge_cost
+    return path, cost
+
+
+def bidirectional_BFS(graph, start, goal, trace: str = "full", stats: SearchStats = None) -> Tuple[List[str], int]:
+    """
+    Bidirectional Breadth-First Search grows a BFS from start and one backwards from goal,
+    always expanding the smaller layer, and stops once the two meet.
+
+    The path and cost are the same as BFS returns: among the paths with the fewest
+    edges, the one the one-way search would reach first.
+
+    Parameters:
+    - graph: The graph as a dictionary or a CompactGraph.
+    - start: The starting node.
+    - goal: The goal node.
+    - trace: Accepted for a uniform signature; no frontier states are recorded.
+    - stats: Optional SearchStats to fill with counters and timings.
+
+    Returns:
+    - Tuple containing the path, its cost, and an empty list of frontier states.
+    """
+    if trace not in TRACE_MODES:
+        raise ValueError(f"Unknown trace mode {trace!r}; expected one of {TRACE_MODES}")
+    if stats is not None:
+        stats.start()
+    graph = as_compact(graph)
+    start_node = graph.node_id(start)
+    goal_node = graph.index.get(goal, -1)
+    path, cost = [], 0
+    if start_node == goal_node:
+        path = [start_node]
+    elif goal_node != -1:
+        reverse = graph.reverse()
+        forward = {start_node: 0}
+        backward = {goal_node: 0}
+        forward_layer = [start_node]
+        backward_layer = [goal_node]
+        length = -1
+        while forward_layer and backward_layer and length == -1:
+            if len(forward_layer) <= len(backward_layer):
+                forward_layer, length = _expand_layer(graph, forward_layer, forward, backward, stats)
+            else:
+                backward_layer, length = _expand_layer(reverse, backward_layer, backward, forward, stats)
+        if length != -1:
+            path, cost = _first_bfs_path(graph, reverse, start_node, goal_node, forward, backward, length)
+        if stats is not None:
+            stats.generated = len(forward) + len(backward) - 2
+    if stats is not None:
+        stats.finish()
+    names = graph.names
+    return [names[node] for node in path], cost, []
+
+
+def _first_ucs_path(graph: CompactGraph, start_node: int, goal_node: int, best, to_goal: Dict[int, float],
+                    floor: float) -> Tuple[List[int], List[float]]:
+    """
+    Picks, among all cheapest paths, the one a one-way UCS would return.
+
+    UCS is replayed from start with the same tie-breaking, keeping only the
+    entries that can still lie on a path of cost best: g + h <= best, where h is
+    the exact distance to goal of the nodes the backward side settled and floor
+    for the others. That h is consistent, so the winning entry of every kept
+    node comes from a kept node and the kept nodes are settled in the same
+    order as in the full search.
+
+    Parameters:
+    - graph: The searched graph.
+    - start_node: The start node id.
+    - goal_node: The goal node id.
+    - best: Cost of the shortest path.
+    - to_goal: Distance to goal of every node settled by the backward side.
+    - floor: Smallest distance to goal left on the backward frontier (math.inf if it is empty).
+
+    Returns:
+    - Tuple of the node ids of the path and the costs of its edges.
+    """
+    # Costs summed from the two ends can differ in the last bits; keeping extra entries is harmless
+    limit = best + abs(best) * 1e-9 if isinstance(best, float) else best
+    heap = [(0, 0, start_node, -1, 0)]
+    sequence = count(1)
+    parents = {}
+    while heap:
+        g, _, node, parent, edge_cost = heapq.heappop(heap)
+        if node in parents:
+            continue
+        parents[node] = (parent, edge_cost)
+        if node == goal_node:
+            break
+        for neighbor, edge_cost in graph.neighbors(node):
+            if neighbor in parents:
+                continue
+            new_cost = g + edge_cost
+            if new_cost + to_goal.get(neighbor, floor) <= limit:
+                heapq.heappush(heap, (new_cost, next(sequence), neighbor, node, edge_cost))
+
+    path = []
+    edge_costs = []
+    node = goal_node
+    while node != -1:
+        path.append(node)
+        node, edge_cost = parents[node]
+        edge_costs.append(edge_cost)
+    path.reverse()
+    return path, edge_costs[-2::-1]
+
+
+def bidirectional_UCS(graph, start, end, trace: str = "full", stats: SearchStats = None) -> Tuple[List[str], int]:
+    """
+    Bidirectional Uniform Cost Search runs UCS forwards from start and backwards from end,
+    expanding the side with the smaller frontier, until no shorter path can exist.
+
+    The best path through a node labelled by both sides is kept, and the search
+    stops once the smallest costs on the two frontiers add up to at least its
+    cost. When several paths share that cost, the one the one-way UCS returns
+    is picked by replaying it over the nodes that can lie on a cheapest path,
+    so path and cost both match Uninformed_cost_search.
+
+    Parameters:
+    - graph: The graph as a dictionary or a CompactGraph.
+    - start: The starting node.
+    - end: The goal node.
+    - trace: Accepted for a uniform signature; no frontier states are recorded.
+    - stats: Optional SearchStats to fill with counters and timings.
+
+    Returns:
+    - Tuple containing the optimal path, its cost, and an empty list of frontier states.
+    """
+    if trace not in TRACE_MODES:
+        raise ValueError(f"Unknown trace mode {trace!r}; expected one of {TRACE_MODES}")
+    if stats is not None:
+        stats.start()
+    graph = as_compact(graph)
+    start_node = graph.node_id(start)
+    goal_node = graph.index.get(end, -1)
+    path, edge_costs = [], []
+    if start_node == goal_node:
+        path = [start_node]
+    elif goal_node != -1:
+        adjacency = (graph, graph.reverse())
+        dist = ({start_node: 0}, {goal_node: 0})
+        settled = (set(), set())
+        heaps = ([(0, 0, start_node)], [(0, 0, goal_node)])
+        sequence = count(1)
+        best = None
+        meeting = -1
+        while True:
+            for side in (0, 1):
+                heap = heaps[side]
+                while heap and heap[0][2] in settled[side]:
+                    heapq.heappop(heap)
+            forward_heap, backward_heap = heaps
+            if not forward_heap or not backward_heap:
+                break
+            if best is not None and forward_heap[0][0] + backward_heap[0][0] >= best:
+                break
+            side = 0 if len(forward_heap) <= len(backward_heap) else 1
+            d, _, node = heapq.heappop(heaps[side])
+            settled[side].add(node)
+            own_dist = dist[side]
+            other_dist = dist[1 - side]
+            for neighbor, edge_cost in adjacency[side].neighbors(node):
+                if neighbor in settled[side]:
+                    continue
+                new_cost = d + edge_cost
+                known = own_dist.get(neighbor)
+                if known is None or new_cost < known:
+                    own_dist[neighbor] = new_cost
+                    heapq.heappush(heaps[side], (new_cost, next(sequence), neighbor))
+                    through = other_dist.get(neighbor)
+                    if through is not None and (best is None or new_cost + through < best):
+                        best = new_cost + through
+                        meeting = neighbor
+            if stats is not None:
+                stats.expansion(len(forward_heap) + len(backward_heap))
+
+        if meeting != -1:
+            backward_heap = heaps[1]
+            to_goal = {node: dist[1][node] for node in settled[1]}
+            floor = backward_heap[0][0] if backward_heap else math.inf
+            path, edge_costs = _first_ucs_path(graph, start_node, goal_node, best, to_goal, floor)
+        if stats is not None:
+            pushes = next(sequence) - 1
+            stats.generated = pushes
+            stats.duplicates = pushes - (len(dist[0]) + len(dist[1]) - 2)
+    if stats is not None:
+        stats.finish()
+    # Sum from start like the one-way search, so float costs round the same way.
+    cost = 0
+    for edge_cost in edge_costs:
+        cost = cost + edge_cost
+    names = graph.names
+    return [names[node] for node in path], cost, []
+
+
+def _contour_search(graph: CompactGraph, start_node: int, goal_node: int, bound, h: list, unit_steps: bool,
+                    table: OrderedDict = None, table_size: int = 0, stats: SearchStats = None,
+                    record: Callable = None) -> Tuple[List[int], int, float]:
+    """
+    One depth-first pass of an iterative-deepening search, following only nodes with g + h <= bound.
+
+    Only the current path and one neighbour iterator per path node are kept,
+    so memory grows with the depth of the search, not with the graph.
+
+    Parameters:
+    - graph: The CompactGraph.
+    - start_node: The start node id.
+    - goal_node: The goal node id.
+    - bound: The g + h limit of this pass.
+    - h: Heuristic values indexed by node id, or None for zero everywhere.
+    - unit_steps: Measure g in edges (iterative deepening) instead of edge costs (IDA*).
+    - table: Optional transposition table mapping node ids to the smallest g they were
+      reached with in this pass; nodes reached again with no smaller g are pruned.
+    - table_size: Maximum number of table entries; the least recently used is evicted.
+    - stats: Optional SearchStats.
+    - record: Optional callable receiving the node ids of every expanded path.
+
+    Returns:
+    - Tuple of the node ids of the path found (None if none within bound), its cost,
+      and the smallest g + h that exceeded bound (inf if nothing was cut off).
+    """
+    next_bound = float("inf")
+    if h is not None and h[start_node] > bound:
+        return None, 0, h[start_node]
+    path = [start_node]
+    costs = [0]
+    depths = [0]
+    on_path = {start_node}
+    stack = [iter(graph.neighbors(start_node))]
+    while stack:
+        child = next(stack[-1], None)
+        if child is None:
+            stack.pop()
+            on_path.discard(path.pop())
+            costs.pop()
+            depths.pop()
+            continue
+        neighbor, edge_cost = child
+        if neighbor in on_path:
+            continue
+        g = depths[-1] + (1 if unit_steps else edge_cost)
+        f = g if h is None else g + h[neighbor]
+        if f > bound:
+            if f < next_bound:
+                next_bound = f
+            continue
+        if stats is not None:
+            stats.generated += 1
+        if neighbor == goal_node:
+            return path + [neighbor], costs[-1] + edge_cost, next_bound
+        if table is not None:
+            seen = table.get(neighbor)
+            if seen is not None and seen <= g:
+                continue
+            table[neighbor] = g
+            table.move_to_end(neighbor)
+            if len(table) > table_size:
+                table.popitem(last=False)
+        path.append(neighbor)
+        costs.append(costs[-1] + edge_cost)
+        depths.append(g)
+        on_path.add(neighbor)
+        stack.append(iter(graph.neighbors(neighbor)))
+        if stats is not None:
+            stats.expansion(len(stack))
+        if record is not None:
+            record(path)
+    return None, 0, next_bound
+
+
+def _iterative_deepening(graph: CompactGraph, start_node: int, goal_node: int, h: list, unit_steps: bool,
+                         trace: str, stats: SearchStats, table_size: int, max_bound=None) -> Tuple[List[str], int, list]:
+    """
+    Repeats _contour_search with growing bounds until the goal is found, nothing was cut off, or
+    the bound passes max_bound. The transposition table is emptied before every pass, since a
+    node pruned under one bound may lead to the goal under a larger one.
+
+    Returns:
+    - Tuple containing the path, its cost, and the expanded paths when tracing.
+    """
+    names = graph.names
+    frontier_states = []
+    record = None
+    if stats is not None:
+        # Nodes are generated again in every pass, so there is no meaningful duplicate count
+        stats.untracked("duplicates")
+    if trace != "off":
+        def record(path):
+            frontier_states.append([names[node] for node in path])
+        if stats is not None:
+            record = stats.timed(record)
+    if start_node == goal_node:
+        if stats is not None:
+            stats.finish()
+        return [names[start_node]], 0, frontier_states
+
+    bound = 0 if h is None else h[start_node]
+    table = OrderedDict() if table_size > 0 else None
+    path = None
+    cost = 0
+    while path is None and goal_node != -1 and bound != float("inf"):
+        if max_bound is not None and bound > max_bound:
+            break
+        if table is not None:
+            table.clear()
+        path, cost, bound = _contour_search(graph, start_node, goal_node, bound, h, unit_steps,
+                                            table, table_size, stats, record)
+    if stats is not None:
+        stats.finish()
+    if path is None:
+        return [], 0, frontier_states
+    return [names[node] for node in path], cost, frontier_states
+
+
+def iterative_deepening_DFS(graph, start, goal, trace: str = "off", stats: SearchStats = None,
+                            max_depth: int = None, table_size: int = 0) -> Tuple[List[str], int]:
+    """
+    Iterative Deepening DFS repeats a depth-limited DFS with limits 0, 1, 2, ... until it reaches the goal.
+
+    It finds a path with the fewest edges, like BFS, while keeping only the current
+    path in memory, like DFS. Nodes are not revisited along the current path.
+
+    Parameters:
+    - graph: The graph as a dictionary or a CompactGraph.
+    - start: The starting node.
+    - goal: The goal node.
+    - trace: "off" (the default) skips recording; "delta" and "full" both record every
+      expanded path, for all iterations, so memory then grows with the expansions
+      instead of the depth.
+    - stats: Optional SearchStats to fill with counters and timings; max_frontier is the
+      deepest path held and duplicates is not tracked.
+    - max_depth: Give up after this depth limit (None searches until the graph is exhausted).
+    - table_size: Entries of an optional transposition table that prunes nodes already
+      reached at no greater depth in the same iteration (0 disables it).
+
+    Returns:
+    - Tuple containing the path, its cost, and frontier states explored.
+    """
+    if trace not in TRACE_MODES:
+        raise ValueError(f"Unknown trace mode {trace!r}; expected one of {TRACE_MODES}")
+    if stats is not None:
+        stats.start()
+    graph = as_compact(graph)
+    start_node = graph.node_id(start)
+    goal_node = graph.index.get(goal, -1)
+    return _iterative_deepening(graph, start_node, goal_node, None, True, trace, stats,
+                                table_size, max_depth)
+
+
+def IDA_star_search(graph, start, end, h_table, trace: str = "off", stats: SearchStats = None,
+                    table_size: int = 0) -> Tuple[List[str], int]:
+    """
+    IDA* Search repeats a depth-first search bounded by f = g + h, raising the bound to the
+    smallest f that exceeded it, until it reaches the goal.
+
+    With an admissible heuristic it returns an optimal path, like A_star_search, while
+    keeping only the current path in memory. With many distinct float costs the bound
+    grows slowly and many iterations are needed.
+
+    Parameters:
+    - graph: The graph as a dictionary or a CompactGraph.
+    - start: The starting node.
+    - end: The goal node.
+    - h_table: Heuristic table, as accepted by A_star_search.
+    - trace: "off" (the default) skips recording; "delta" and "full" both record every
+      expanded path, for all iterations, so memory then grows with the expansions
+      instead of the depth.
+    - stats: Optional SearchStats to fill with counters and timings; max_frontier is the
+      deepest path held and duplicates is not tracked.
+    - table_size: Entries of an optional transposition table that prunes nodes already
+      reached at no greater cost in the same iteration (0 disables it).
+
+    Returns:
+    - Tuple containing the path, its cost, and frontier states explored.
+    """
+    if trace not in TRACE_MODES:
+        raise ValueError(f"Unknown trace mode {trace!r}; expected one of {TRACE_MODES}")
+    if stats is not None:
+        stats.start()
+    graph = as_compact(graph)
+    start_node = graph.node_id(start)
+    goal_node = graph.index.get(end, -1)
+    return _iterative_deepening(graph, start_node, goal_node, _heuristic_list(graph, h_table, end), False,
+                                trace, stats, table_size)
+
+
+class AnytimeSolution(NamedTuple):
+    """
+    A solution reported by anytime_A_star.
+
+    Attributes:
+    - path: The path found.
+    - cost: Its cost.
+    - bound: Its cost is at most bound times the optimal cost (for a consistent heuristic).
+    - weight: Weight on h of the pass that produced or confirmed it.
+    - expanded: Nodes expanded by all passes so far.
+    - seconds: Time since the search started.
+    """
+    path: List[str]
+    cost: float
+    bound: float
+    weight: float
+    expanded: int
+    seconds: float
+
+
+def anytime_A_star(graph, start, end, h_table, weight: float = 5.0, weight_step: float = 1.0,
+                   time_budget: float = 1.0, max_expansions: int = None,
+                   stats: SearchStats = None) -> Iterator[AnytimeSolution]:
+    """
+    Anytime weighted A*: a quick first path, then better ones as long as the budget lasts.
+
+    Each pass is a weighted A* ordering nodes by g + weight * h, which finds a
+    path costing at most weight times the optimum, usually after far fewer
+    expansions than A*. After every pass the weight drops by weight_step, down
+    to 1. Later passes drop every node whose g + h cannot beat the best path so
+    far, so they only look for improvements. Once a pass with weight 1 ends,
+    the best path is optimal.
+
+    Parameters:
+    - graph: The graph as a dictionary or a CompactGraph.
+    - start: The starting node.
+    - end: The goal node.
+    - h_table: Heuristic table, as accepted by A_star_search.
+    - weight: Weight on h of the first pass (at least 1).
+    - weight_step: Amount the weight drops after each pass.
+    - time_budget: Seconds after which the search stops (None for no limit).
+    - max_expansions: Total expansions after which the search stops (None for no limit).
+    - stats: Optional SearchStats to fill with counters and timings.
+
+    Yields:
+    - An AnytimeSolution each time the best path or its bound improves.
+    """
+    if weight < 1:
+        raise ValueError(f"weight must be at least 1, got {weight!r}")
+    if weight_step <= 0:
+        raise ValueError(f"weight_step must be positive, got {weight_step!r}")
+    began = time.perf_counter()
+    if stats is not None:
+        stats.start()
+    graph = as_compact(graph)
+    start_node = graph.node_id(start)
+    goal_node = graph.index.get(end, -1)
+    h = _heuristic_list(graph, h_table, end)
+    names = graph.names
+    deadline = time.monotonic() + time_budget if time_budget is not None else None
+    clock = time.monotonic
+    inf = float("inf")
+    best_cost = inf
+    best_path = None
+    expanded = 0
+    while goal_node != -1:
+        g = {start_node: 0}
+        parents = {start_node: -1}
+        closed = set()
+        sequence = count(1)
+        heap = [(weight * h[start_node], 0, start_node)]
+        found = None
+        out_of_budget = False
+        while heap:
+            if ((deadline is not None and clock() > deadline)
+                    or (max_expansions is not None and expanded >= max_expansions)):
+                out_of_budget = True
+                break
+            _, _, node = heapq.heappop(heap)
+            if node in closed:
+                continue
+            cost = g[node]
+            if cost + h[node] >= best_cost:
+                continue
+            if node == goal_node:
+                found = node
+                break
+            closed.add(node)
+            expanded += 1
+            for neighbor, edge_cost in graph.neighbors(node):
+                if neighbor in closed:
+                    continue
+                new_cost = cost + edge_cost
+                known = g.get(neighbor)
+                if (known is None or new_cost < known) and new_cost + h[neighbor] < best_cost:
+                    g[neighbor] = new_cost
+                    parents[neighbor] = node
+                    heapq.heappush(heap, (new_cost + weight * h[neighbor], next(sequence), neighbor))
+            if stats is not None:
+                stats.expansion(len(heap))
+        if out_of_budget:
+            break
+        if found is not None:
+            best_cost = g[found]
+            best_path = []
+            node = found
+            while node != -1:
+                best_path.append(names[node])
+                node = parents[node]
+            best_path.reverse()
+        if best_path is not None:
+            # A finished pass found the best path or proved nothing beats it by more than weight
+            yield AnytimeSolution(best_path, best_cost, weight, weight, expanded, time.perf_counter() - began)
+        if weight == 1:
+            break
+        weight = max(1, weight - weight_step)
+    if stats is not None:
+        stats.finish()
+
+
+def anytime_A_star_search(graph, start, end, h_table, trace: str = "full", stats: SearchStats = None,
+                          weight: float = 5.0, weight_step: float = 1.0, time_budget: float = 1.0,
+                          max_expansions: int = None) -> Tuple[List[str], int]:
+    """
+    Anytime Weighted A* Search returns the best path anytime_A_star found within its budget.
+
+    Parameters:
+    - graph: The graph as a dictionary or a CompactGraph.
+    - start: The starting node.
+    - end: The goal node.
+    - h_table: Heuristic table, as accepted by A_star_search.
+    - trace: "off" skips recording; "delta" and "full" both record the path of every
+      improvement, in the order they were found.
+    - stats: Optional SearchStats to fill with counters and timings.
+    - weight, weight_step, time_budget, max_expansions: See anytime_A_star.
+
+    Returns:
+    - Tuple containing the best path (empty if none was found in time), its cost, and the improvements.
+    """
+    if trace not in TRACE_MODES:
+        raise ValueError(f"Unknown trace mode {trace!r}; expected one of {TRACE_MODES}")
+    path, cost = [], 0
+    frontier_states = []
+    for solution in anytime_A_star(graph, start, end, h_table, weight, weight_step, time_budget,
+                                   max_expansions, stats):
+        if trace != "off" and solution.path != path:
+            frontier_states.append(solution.path)
+        path, cost = solution.path, solution.cost
+    return path, cost, frontier_states
+
+
+def beam_search(graph, start, goal, h_table, trace: str = "full", stats: SearchStats = None,
+                width: int = 64, max_expansions: int = None) -> Tuple[List[str], int]:
+    """
+    Beam Search expands the graph layer by layer but keeps only the width most promising nodes of each layer.
+
+    Nodes are ranked by g + h. Memory is bounded by width times the depth
+    reached, but the search may miss every path to the goal, and the path it
+    returns need not be optimal. Reaching the goal does not stop the search:
+    nodes that cannot beat the best path found so far are dropped, and the
+    search ends once no layer is left.
+
+    Parameters:
+    - graph: The graph as a dictionary or a CompactGraph.
+    - start: The starting node.
+    - goal: The goal node.
+    - h_table: Heuristic table, as accepted by A_star_search.
+    - trace: "off" skips recording; "delta" and "full" both record the paths of every beam.
+    - stats: Optional SearchStats to fill with counters and timings.
+    - width: Number of nodes kept per layer.
+    - max_expansions: Expansions after which the best path so far is returned (None for no limit).
+
+    Returns:
+    - Tuple containing the best path found (empty if none), its cost, and frontier states explored.
+    """
+    if trace not in TRACE_MODES:
+        raise ValueError(f"Unknown trace mode {trace!r}; expected one of {TRACE_MODES}")
+    if width < 1:
+        raise ValueError(f"width must be at least 1, got {width!r}")
+    if stats is not None:
+        stats.start()
+    graph = as_compact(graph)
+    start_node = graph.node_id(start)
+    goal_node = graph.index.get(goal, -1)
+    h = _heuristic_list(graph, h_table, goal)
+    pool = NodePool(graph.names)
+    nodes = pool.nodes
+    g = pool.g
+    frontier_states = []
+    best = -1
+    best_cost = float("inf")
+    expanded = 0
+    beam = [pool.add(start_node, -1, 0, h[start_node])]
+    in_beam = {start_node}
+    if start_node == goal_node:
+        best, beam = beam[0], []
+    while beam:
+        if trace != "off":
+            frontier_states.append([pool.path(index) for index in beam])
+        candidates = {}
+        for current in beam:
+            if max_expansions is not None and expanded >= max_expansions:
+                break
+            expanded += 1
+            cost = g[current]
+            for neighbor, edge_cost in graph.neighbors(nodes[current]):
+                if neighbor in in_beam:
+                    continue
+                new_cost = cost + edge_cost
+                if new_cost + h[neighbor] >= best_cost:
+                    continue
+                if neighbor == goal_node:
+                    best_cost = new_cost
+                    best = pool.add(neighbor, current, new_cost, 0)
+                    continue
+                known = candidates.get(neighbor)
+                if known is None or new_cost < known[0]:
+                    candidates[neighbor] = (new_cost, current)
+            if stats is not None:
+                stats.expansion(len(candidates))
+        else:
+            ranked = heapq.nsmallest(width, candidates.items(), key=lambda item: item[1][0] + h[item[0]])
+            beam = []
+            for neighbor, (new_cost, parent) in ranked:
+                if new_cost + h[neighbor] < best_cost:
+                    in_beam.add(neighbor)
+                    beam.append(pool.add(neighbor, parent, new_cost, h[neighbor]))
+            continue
+        break
+    if stats is not None:
+        stats.finish(pool)
+    if best == -1:
+        return [], 0, frontier_states
+    return pool.path(best), g[best], frontier_states
+
+
+def dijkstra(graph: CompactGraph, source: int) -> Tuple[list, list]:
+    """
+    Settles every node reachable from source, in order of distance.
+
+    Ties are broken like Uninformed_cost_search: among equally short routes the
+    predecessor that was settled first wins, so both report the same paths.
+
+    Parameters:
+    - graph: The CompactGraph to search.
+    - source: The source node id.
+
+    Returns:
+    - Tuple of the distance list (None for unreachable nodes) and the
+      predecessor list (-1 for the source and unreachable nodes).
+    """
+    dist = [None] * len(graph)
+    pred = [-1] * len(graph)
+    settled = bytearray(len(graph))
+    dist[source] = 0
+    sequence = count(1)
+    heap = [(0, 0, source)]
+    while heap:
+        d, _, node = heapq.heappop(heap)
+        if settled[node]:
+            continue
+        settled[node] = 1
+        for neighbor, edge_cost in graph.neighbors(node):
+            new_cost = d + edge_cost
+            if not settled[neighbor] and (dist[neighbor] is None or new_cost < dist[neighbor]):
+                dist[neighbor] = new_cost
+                pred[neighbor] = node
+                heapq.heappush(heap, (new_cost, next(sequence), neighbor))
+    return dist, pred
+
+
+def distance_array(dist: list) -> np.ndarray:
+    """Converts a distance list from dijkstra() to a float64 array, with inf for unreachable nodes."""
+    return np.array([np.inf if d is None else d for d in dist], dtype=np.float64)
+
+
+class ShortestPathTree:
+    """
+    Single-source shortest-path tree: distance and predecessor arrays from one source.
+
+    Once built, any goal is answered in O(path length).
+
+    Attributes:
+    - graph: The CompactGraph the tree was computed on.
+    - source: The source node id.
+    - dist: float64 array of distances (inf for unreachable nodes).
+    - pred: int32 array of predecessors (-1 for the source and unreachable nodes).
+    - version: The graph version the tree belongs to.
+    """
+    def __init__(self, graph: CompactGraph, source: int, dist: list, pred: list):
+        self.graph = graph
+        self.source = source
+        self.dist = distance_array(dist)
+        self.pred = np.array(pred, dtype=np.int32)
+        self.version = graph.version
+        self._integer_costs = graph.weights.dtype.kind == "i"
+
+    def cost(self, goal: int):
+        """Returns the distance to a node id, or None if it is unreachable."""
+        d = self.dist[goal]
+        if d == np.inf:
+            return None
+        return int(d) if self._integer_costs else float(d)
+
+    def node_path(self, goal: int) -> List[int]:
+        """Rebuilds the node ids from the source to goal by following predecessors."""
+        pred = self.pred
+        path = [goal]
+        while goal != self.source:
+            goal = int(pred[goal])
+            path.append(goal)
+        path.reverse()
+        return path
+
+    def query(self, goal: str) -> Tuple[List[str], int]:
+        """
+        Answers a goal from the tree.
+
+        Parameters:
+        - goal: The goal node name.
+
+        Returns:
+        - Tuple of the shortest path and its cost, or ([], 0) if goal is unreachable.
+        """
+        goal_node = self.graph.index.get(goal, -1)
+        if goal_node == -1 or self.dist[goal_node] == np.inf:
+            return [], 0
+        names = self.graph.names
+        return [names[node] for node in self.node_path(goal_node)], self.cost(goal_node)
+
+
+def shortest_path_tree(graph, source: str, max_cached: int = 32) -> ShortestPathTree:
+    """
+    Returns the shortest-path tree of source, computing it at most once per graph version.
+
+    Trees are cached on the CompactGraph (least recently used first out) and
+    dropped automatically when the graph version changes. Dictionary graphs are
+    converted on every call, so pass a CompactGraph to benefit from the cache.
+
+    Parameters:
+    - graph: The graph as a dictionary or a CompactGraph.
+    - source: The source node name.
+    - max_cached: Maximum number of trees kept per graph.
+
+    Returns:
+    - The ShortestPathTree rooted at source.
+    """
+    graph = as_compact(graph)
+    source_node = graph.node_id(source)
+    trees = graph.derived("shortest_path_trees", OrderedDict)
+    tree = trees.get(source_node)
+    if tree is not None:
+        trees.move_to_end(source_node)
+        return tree
+    tree = ShortestPathTree(graph, source_node, *dijkstra(graph, source_node))
+    trees[source_node] = tree
+    if len(trees) > max_cached:
+        trees.popitem(last=False)
+    return tree
+
+
+def _edge_cost(graph: CompactGraph, source: int, target: int):
+    """Returns the cost of the cheapest edge source -> target."""
+    return min(cost for node, cost in graph.neighbors(source) if node == target)
+
+
+def _spur_path(graph: CompactGraph, spur: int, goal: int, to_goal: list, next_hop: list, blocked: bytearray,
+               banned_next: set, stats: SearchStats = None) -> List[int]:
+    """
+    Finds the cheapest path from spur to goal that avoids the blocked nodes and the edges spur -> banned_next.
+
+    It is A* guided by the exact distances to goal in the whole graph, which
+    stay admissible and consistent when nodes and edges are taken away. As
+    soon as a popped node's shortest-path-tree route to goal is still open,
+    that route completes an optimal path, so usually only a handful of nodes
+    are expanded.
+
+    Parameters:
+    - graph: The CompactGraph.
+    - spur: The node id the path leaves from.
+    - goal: The goal node id.
+    - to_goal: Distance from every node id to goal (inf when unreachable).
+    - next_hop: Next node id on each node's shortest route to goal (-1 for goal and unreachable nodes).
+    - blocked: Flags the node ids the path may not use.
+    - banned_next: Node ids the first edge from spur may not lead to.
+    - stats: Optional SearchStats counting the expansions.
+
+    Returns:
+    - The node ids of the path, or None if goal cannot be reached.
+    """
+    inf = float("inf")
+    if to_goal[spur] == inf:
+        return None
+    # open_route[v]: whether v's tree route to goal avoids the blocked nodes
+    open_route = {goal: True}
+
+    def route_is_open(node: int) -> bool:
+        trail = []
+        while node not in open_route:
+            if blocked[node]:
+                open_route[node] = False
+                break
+            trail.append(node)
+            node = next_hop[node]
+        result = open_route[node]
+        for visited in trail:
+            open_route[visited] = result
+        return result
+
+    first = next_hop[spur]
+    if first not in banned_next and route_is_open(first):
+        route = [spur]
+    else:
+        # Routes that come back through spur would leave it over the banned edge
+        open_route[spur] = False
+        g = {spur: 0}
+        parents = {spur: -1}
+        closed = set()
+        sequence = count(1)
+        heap = [(to_goal[spur], 0, spur)]
+        route = None
+        while heap:
+            _, _, node = heapq.heappop(heap)
+            if node in closed:
+                continue
+            if node != spur and route_is_open(node):
+                route = []
+                while node != -1:
+                    route.append(node)
+                    node = parents[node]
+                route.reverse()
+                break
+            closed.add(node)
+            cost = g[node]
+            for neighbor, edge_cost in graph.neighbors(node):
+                if blocked[neighbor] or neighbor in closed or to_goal[neighbor] == inf:
+                    continue
+                if node == spur and neighbor in banned_next:
+                    continue
+                new_cost = cost + edge_cost
+                known = g.get(neighbor)
+                if known is None or new_cost < known:
+                    g[neighbor] = new_cost
+                    parents[neighbor] = node
+                    heapq.heappush(heap, (new_cost + to_goal[neighbor], next(sequence), neighbor))
+            if stats is not None:
+                stats.expansion(len(heap))
+        if route is None:
+            return None
+    node = route[-1]
+    while node != goal:
+        node = next_hop[node]
+        route.append(node)
+    return route
+
+
+def k_shortest_paths(graph, start, goal, k: int, stats: SearchStats = None) -> List[Tuple[List[str], int]]:
+    """
+    Finds the k cheapest loopless paths from start to goal (Yen's algorithm).
+
+    Every new path branches off an accepted one at a spur node: it keeps the
+    accepted path up to the spur, then takes the cheapest route that avoids the
+    root nodes and every accepted continuation of the same root. The work is
+    shared between those spur searches:
+    - the shortest-path tree towards goal is built once (and cached on the
+      graph), and a spur whose tree route is still open needs no search at all;
+    - the remaining spur searches are A* with the exact tree distances;
+    - spurs are queued with a lower bound (root cost plus the best first step
+      by tree distance) and only searched once that bound is the cheapest
+      candidate left, so most spurs of long paths are never searched;
+    - a path is only branched at or after the node where it left its parent
+      path (Lawler's rule), since earlier spurs were already tried;
+    - root costs are prefix sums, and the accepted paths sharing the current
+      root are narrowed down one node at a time.
+
+    Parameters:
+    - graph: The graph as a dictionary or a CompactGraph.
+    - start: The starting node.
+    - goal: The goal node.
+    - k: Number of paths wanted.
+    - stats: Optional SearchStats; expanded counts the nodes expanded by spur searches.
+
+    Returns:
+    - Up to k (path, cost) pairs, cheapest first; the first is a shortest path.
+    """
+    if stats is not None:
+        stats.start()
+    graph = as_compact(graph)
+    start_node = graph.node_id(start)
+    goal_node = graph.index.get(goal, -1)
+    names = graph.names
+    found = []
+    tree = shortest_path_tree(graph.reverse(), goal) if goal_node != -1 and k > 0 else None
+    if tree is not None and tree.dist[start_node] != np.inf:
+        to_goal = tree.dist.tolist()
+        next_hop = tree.pred.tolist()
+        inf = float("inf")
+        first = [start_node]
+        while first[-1] != goal_node:
+            first.append(next_hop[first[-1]])
+        first_cost = 0
+        for source, target in zip(first, first[1:]):
+            first_cost = first_cost + _edge_cost(graph, source, target)
+        accepted = [(first, first_cost)]
+        deviation = 0
+        seen = {tuple(first)}
+        # (cost or lower bound, order, path or None until searched, parent path, spur index, banned next nodes, root cost)
+        candidates = []
+        sequence = count()
+        blocked = bytearray(len(graph))
+        while len(accepted) < k:
+            path = accepted[-1][0]
+            sharing = [other for other, _ in accepted]
+            root_cost = 0
+            for i in range(len(path) - 1):
+                spur = path[i]
+                if i:
+                    root_cost = root_cost + _edge_cost(graph, path[i - 1], spur)
+                sharing = [other for other in sharing if len(other) > i and other[i] == spur]
+                if i >= deviation:
+                    banned_next = {other[i + 1] for other in sharing if len(other) > i + 1}
+                    bound = min((edge_cost + to_goal[neighbor] for neighbor, edge_cost in graph.neighbors(spur)
+                                 if not blocked[neighbor] and neighbor not in banned_next), default=inf)
+                    if bound != inf:
+                        heapq.heappush(candidates, (root_cost + bound, next(sequence), None, path, i,
+                                                    banned_next, root_cost))
+                blocked[spur] = 1
+            for node in path:
+                blocked[node] = 0
+
+            while candidates and candidates[0][2] is None:
+                _, _, _, parent, i, banned_next, root_cost = heapq.heappop(candidates)
+                for node in parent[:i]:
+                    blocked[node] = 1
+                route = _spur_path(graph, parent[i], goal_node, to_goal, next_hop, blocked, banned_next, stats)
+                for node in parent[:i]:
+                    blocked[node] = 0
+                if route is None:
+                    continue
+                candidate = parent[:i] + route
+                key = tuple(candidate)
+                if key in seen:
+                    continue
+                seen.add(key)
+                cost = root_cost
+                for source, target in zip(route, route[1:]):
+                    cost = cost + _edge_cost(graph, source, target)
+                heapq.heappush(candidates, (cost, next(sequence), candidate, parent, i, None, root_cost))
+            if not candidates:
+                break
+            cost, _, candidate, _, deviation, _, _ = heapq.heappop(candidates)
+            accepted.append((candidate, cost))
+        found = [([names[node] for node in path], cost) for path, cost in accepted]
+    if stats is not None:
+        stats.finish()
+    return found
+
+
+ALGORITHMS = {
+    "dfs": DFS,
+    "bfs": BFS,
+    "ucs": Uninformed_cost_search,
+    "astar": A_star_search,
+    "hill_climbing": restart_hill_climbing,
+    "bibfs": bidirectional_BFS,
+    "biucs": bidirectional_UCS,
+    "iddfs": iterative_deepening_DFS,
+    "idastar": IDA_star_search,
+    "anytime_astar": anytime_A_star_search,
+    "beam": beam_search,
+}
+
+HEURISTIC_ALGORITHMS = {A_star_search, hill_climbing, restart_hill_climbing, IDA_star_search,
+                        anytime_A_star_search, beam_search}
+
+# Step generators of the searches that can report their progress event by event.
+STEP_FUNCTIONS = {
+    DFS: DFS_steps,
+    BFS: BFS_steps,
+    Uninformed_cost_search: Uninformed_cost_search_steps,
+    A_star_search: A_star_search_steps,
+    hill_climbing: hill_climbing_steps,
+}
+
+# Menu entries of the console and Streamlit apps, in display order.
+ALGORITHM_TITLES = {
+    "dfs": "Depth-First Search (DFS)",
+    "bfs": "Breadth-First Search (BFS)",
+    "ucs": "Uninformed Cost Search",
+    "astar": "A* Search",
+    "hill_climbing": "Hill Climbing",
+    "bibfs": "Bidirectional BFS",
+    "biucs": "Bidirectional Uniform Cost Search",
+    "iddfs": "Iterative Deepening DFS",
+    "idastar": "IDA* Search",
+    "anytime_astar": "Anytime Weighted A* Search",
+    "beam": "Beam Search",
+}
+
+
+def resolve_algorithm(algorithm: Union[str, Callable]) -> Callable:
+    """
+    Looks an algorithm up in ALGORITHMS by name; functions are returned unchanged.
+
+    Parameters:
+    - algorithm: A registry name such as "ucs" or a search function.
+
+    Returns:
+    - The search function.
+    """
+    if callable(algorithm):
+        return algorithm
+    try:
+        return ALGORITHMS[algorithm]
+    except KeyError:
+        raise ValueError(f"Unknown algorithm {algorithm!r}; expected one of {sorted(ALGORITHMS)}") from None
+
+
+_batch_state = {}
+
+
+def _init_batch_worker(graph: CompactGraph, algorithm: Callable, h_table) -> None:
+    """Process-pool initializer: receives the graph once per worker process."""
+    _batch_state["graph"] = graph
+    _batch_state["algorithm"] = algorithm
+    _batch_state["h_table"] = h_table
+
+
+def _run_batch_chunk(chunk: List[Tuple[int, str, str, str]]) -> List[dict]:
+    """Runs one chunk of queries against the graph held by this worker process."""
+    return _solve_batch_chunk(_batch_state["graph"], _batch_state["algorithm"], _batch_state["h_table"], chunk)
+
+
+def _solve_batch_chunk(graph: CompactGraph, algorithm: Callable, h_table,
+                       chunk: List[Tuple[int, str, str, str]]) -> List[dict]:
+    """
+    Runs one chunk of queries.
+
+    Parameters:
+    - graph: The CompactGraph.
+    - algorithm: The search function.
+    - h_table: Heuristic list or landmarks.LandmarkTable, for the algorithms that need one.
+    - chunk: List of (query index, start, goal, error) tuples; queries that could
+      not be read carry their error message and are not run.
+
+    Returns:
+    - One result dictionary per query, in chunk order.
+    """
+    extra = (h_table,) if algorithm in HEURISTIC_ALGORITHMS else ()
+    results = []
+    for index, start, goal, error in chunk:
+        if error is not None:
+            results.append({"index": index, "error": error})
+            continue
+        result = {"index": index, "start": start, "goal": goal}
+        try:
+            path, cost, _ = algorithm(graph, start, goal, *extra, trace="off")
+            result["path"] = path
+            result["cost"] = cost
+        except Exception as e:
+            result["error"] = f"{type(e).__name__}: {e}"
+        results.append(result)
+    return results
+
+
+def query_endpoints(query) -> Tuple[str, str]:
+    """
+    Reads the start and goal of one batch query.
+
+    Parameters:
+    - query: A (start, goal) pair or a {"start": ..., "goal": ...} dictionary. An
+      exception in its place, e.g. from decoding a JSONL line, is raised again.
+
+    Returns:
+    - Tuple of start and goal.
+    """
+    if isinstance(query, Exception):
+        raise query
+    if isinstance(query, dict):
+        missing = [key for key in ("start", "goal") if key not in query]
+        if missing:
+            raise ValueError(f"query has no {' or '.join(map(repr, missing))}")
+        return query["start"], query["goal"]
+    if isinstance(query, (list, tuple)) and len(query) == 2:
+        return query[0], query[1]
+    raise ValueError(f"expected a (start, goal) pair or a {{\"start\", \"goal\"}} object, got {query!r}")
+
+
+def _numbered_query(index: int, query) -> Tuple[int, str, str, str]:
+    """Returns (index, start, goal, None), or (index, None, None, error message) for an unreadable query."""
+    try:
+        start, goal = query_endpoints(query)
+    except Exception as e:
+        return index, None, None, f"{type(e).__name__}: {e}"
+    return index, start, goal, None
+
+
+def _query_chunks(queries: Iterable, chunksize: int) -> Iterator[List[Tuple[int, str, str, str]]]:
+    """Numbers and checks the queries and groups them lazily into chunks of chunksize."""
+    numbered = (_numbered_query(index, query) for index, query in enumerate(queries))
+    while True:
+        chunk = list(islice(numbered, chunksize))
+        if not chunk:
+            return
+        yield chunk
+
+
+def run_batch(graph, queries: Iterable, algorithm: Union[str, Callable], workers: int = 1,
+              h_table=None, chunksize: int = 64, ordered: bool = True) -> Iterator[dict]:
+    """
+    Runs many start/goal queries against the same graph, optionally in a process pool.
+
+    The graph is converted to a CompactGraph once and handed to every worker
+    process through the pool initializer, so it is transferred once per worker
+    rather than once per query. Queries are sent in chunks and tracing is off.
+
+    Parameters:
+    - graph: The graph as a dictionary or a CompactGraph.
+    - queries: Iterable of (start, goal) pairs or {"start": ..., "goal": ...} dictionaries.
+      It is consumed lazily, so it may be a stream. A malformed query, or an exception
+      in its place, gets an error row instead of stopping the batch.
+    - algorithm: A name from ALGORITHMS or one of the search functions.
+    - workers: Number of worker processes; 1 runs the queries in this process.
+    - h_table: Heuristic table for A* and hill climbing; a landmarks.LandmarkTable is
+      evaluated per query goal.
+    - chunksize: Number of queries sent to a worker at a time.
+    - ordered: Yield results in query order; False yields them as chunks complete.
+
+    Yields:
+    - A dictionary per query with its index, start and goal, and either path
+      and cost or an error message; a malformed query yields its index and error only.
+    """
+    algorithm = resolve_algorithm(algorithm)
+    if algorithm in HEURISTIC_ALGORITHMS and h_table is None:
+        raise ValueError(f"{algorithm.__name__} needs a heuristic table (h_table)")
+    graph = as_compact(graph)
+    if h_table is not None and not hasattr(h_table, "heuristic"):
+        h_table = _heuristic_list(graph, h_table)
+    chunks = _query_chunks(queries, chunksize)
+
+    if workers <= 1:
+        solve = partial(_solve_batch_chunk, graph, algorithm, h_table)
+        for chunk in chunks:
+            yield from solve(chunk)
+        return
+
+    with Pool(workers, initializer=_init_batch_worker, initargs=(graph, algorithm, h_table)) as pool:
+        mapper = pool.imap if ordered else pool.imap_unordered
+        for results in mapper(_run_batch_chunk, chunks):
+            yield from results
+
+
+# Algorithms run side by side by compare_algorithms, in table order.
+COMPARE_ALGORITHMS = ("dfs", "bfs", "ucs", "astar", "hill_climbing")
+
+# First message of a compare worker: it has unpacked its arguments, so its timeout starts now.
+_COMPARE_STARTED = "started"
+
+
+def _compare_one(connection, graph: CompactGraph, start: str, goal: str, h_table, name: str) -> None:
+    """
+    Process target: runs one algorithm on the query and sends back its row of compare_algorithms.
+
+    Parameters:
+    - connection: Sending end of a pipe; gets _COMPARE_STARTED, then the row.
+    - graph: The CompactGraph.
+    - start: The starting node.
+    - goal: The goal node.
+    - h_table: Heuristic table for the heuristic algorithms.
+    - name: Name from ALGORITHMS.
+    """
+    connection.send(_COMPARE_STARTED)
+    row = {"algorithm": name}
+    try:
+        algorithm = ALGORITHMS[name]
+        extra = (h_table,) if algorithm in HEURISTIC_ALGORITHMS else ()
+        stats = SearchStats()
+        path, cost, _ = algorithm(graph, start, goal, *extra, trace="off", stats=stats)
+        row.update(path=path, cost=cost, expanded=stats.expanded, seconds=stats.total_seconds)
+    except Exception as e:
+        row["error"] = f"{type(e).__name__}: {e}"
+    connection.send(row)
+    connection.close()
+
+
+def _stop_process(process: Process, connection) -> None:
+    """Terminates a compare worker if it is still running and releases its pipe."""
+    if process.is_alive():
+        process.terminate()
+    process.join()
+    connection.close()
+
+
+def compare_algorithms(graph, start, goal, h_table=None, algorithms: Iterable[str] = COMPARE_ALGORITHMS,
+                       timeout: float = 5.0, timeouts: Dict[str, float] = None, workers: int = None,
+                       cancel: threading.Event = None, poll: float = 0.01) -> Iterator[dict]:
+    """
+    Runs several algorithms on the same query at once, each in its own worker process.
+
+    At most workers algorithms run at a time; the others wait their turn. Each
+    algorithm's timeout counts from the moment its process has started and
+    received the query, so neither waiting in line nor transferring the graph
+    uses it up. A process that misses its deadline is terminated right away,
+    freeing its place for the next algorithm. Failures and cancellation are
+    reported per algorithm without holding up the others, and every process
+    still running is terminated when the generator finishes or is closed.
+
+    Parameters:
+    - graph: The graph as a dictionary or a CompactGraph.
+    - start: The starting node.
+    - goal: The goal node.
+    - h_table: Heuristic table for the heuristic algorithms.
+    - algorithms: Names from ALGORITHMS.
+    - timeout: Seconds each algorithm may run.
+    - timeouts: Seconds for particular algorithms, by name, overriding timeout.
+    - workers: Number of algorithms run at a time; defaults to all of them.
+    - cancel: Optional threading.Event; setting it stops the comparison.
+    - poll: Seconds between checks of the running algorithms.
+
+    Yields:
+    - A dictionary per algorithm as it finishes, with its name and either path,
+      cost, expanded and seconds, or an error message.
+    """
+    names = list(algorithms)
+    for name in names:
+        algorithm = resolve_algorithm(name)
+        if algorithm in HEURISTIC_ALGORITHMS and h_table is None:
+            raise ValueError(f"{algorithm.__name__} needs a heuristic table (h_table)")
+    if not names:
+        return
+    timeouts = timeouts or {}
+    workers = max(1, workers or len(names))
+    graph = as_compact(graph)
+    waiting = deque(names)
+    # name -> [process, receiving end of its pipe, deadline once it has started]
+    running = {}
+    try:
+        while waiting or running:
+            if cancel is not None and cancel.is_set():
+                for name in list(running) + list(waiting):
+                    yield {"algorithm": name, "error": "cancelled"}
+                return
+            while waiting and len(running) < workers:
+                name = waiting.popleft()
+                receiver, sender = Pipe(duplex=False)
+                process = Process(target=_compare_one, args=(sender, graph, start, goal, h_table, name), daemon=True)
+                process.start()
+                sender.close()
+                running[name] = [process, receiver, None]
+            now = time.monotonic()
+            for name in list(running):
+                process, receiver, deadline = running[name]
+                row = None
+                try:
+                    while row is None and receiver.poll():
+                        message = receiver.recv()
+                        if message == _COMPARE_STARTED:
+                            deadline = running[name][2] = now + timeouts.get(name, timeout)
+                        else:
+                            row = message
+                except EOFError:
+                    process.join()
+                    row = {"algorithm": name, "error": f"worker process exited with code {process.exitcode}"}
+                if row is None and deadline is not None and now >= deadline:
+                    row = {"algorithm": name, "error": f"timed out after {timeouts.get(name, timeout)} s"}
+                if row is not None:
+                    del running[name]
+                    _stop_process(process, receiver)
+                    yield row
+            if running:
+                time.sleep(poll)
+    finally:
+        for process, receiver, _ in running.values():
+            _stop_process(process, receiver)
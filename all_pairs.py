@@ -0,0 +1,270 @@
+from functools import partial
+from multiprocessing import Pool
+from typing import List, Tuple
+
+import numpy as np
+
+from algorithms import dijkstra, distance_array
+from compact_graph import CompactGraph, as_compact
+from graph_loader import load_sidecar, save_sidecar
+
+# Above this many nodes the n x n tables get too large to precompute by default.
+MAX_TABLE_NODES = 2048
+
+# Graphs with at least this edge density (edges / n^2) use Floyd-Warshall in "auto" mode.
+DENSE_THRESHOLD = 0.05
+
+
+class AllPairsTable:
+    """
+    Precomputed all-pairs shortest distances and next hops.
+
+    A query is a table lookup plus a walk along the next-hop matrix, so no
+    search runs until the graph changes.
+
+    Attributes:
+    - names: Node names indexed by node id.
+    - dist: n x n float64 matrix of shortest distances (inf when unreachable).
+    - next_hop: n x n int32 matrix; next_hop[u, v] is the node after u on a
+      shortest path to v (-1 when unreachable).
+    - integer_costs: Whether costs are reported as int.
+    - version: The graph version the table was computed at.
+    """
+    def __init__(self, names: List[str], dist: np.ndarray, next_hop: np.ndarray,
+                 integer_costs: bool, version: int = 0):
+        self.names = list(names)
+        self.index = {name: node for node, name in enumerate(self.names)}
+        self.dist = dist
+        self.next_hop = next_hop
+        self.integer_costs = integer_costs
+        self.version = version
+
+    def query(self, start: str, goal: str) -> Tuple[List[str], int]:
+        """
+        Looks up a shortest path.
+
+        Parameters:
+        - start: The start node name.
+        - goal: The goal node name.
+
+        Returns:
+        - Tuple of the path and its cost, or ([], 0) if goal is unreachable.
+        """
+        source = self.index[start]
+        target = self.index.get(goal, -1)
+        if target == -1 or self.dist[source, target] == np.inf:
+            return [], 0
+        next_hop = self.next_hop
+        names = self.names
+        path = [start]
+        node = source
+        while node != target:
+            node = int(next_hop[node, target])
+            path.append(names[node])
+        cost = self.dist[source, target]
+        return path, int(cost) if self.integer_costs else float(cost)
+
+    def save(self, path: str, source_path: str = None) -> None:
+        """
+        Writes the table to an .npz file.
+
+        Parameters:
+        - path: Destination file.
+        - source_path: Graph file the table was computed from; its size and mtime
+          are stored so load() can tell when the table is stale.
+        """
+        save_sidecar(path, source_path, names=np.array(self.names, dtype=str), dist=self.dist,
+                     next_hop=self.next_hop, integer_costs=self.integer_costs)
+
+    @classmethod
+    def load(cls, path: str, source_path: str = None):
+        """
+        Reads a table written by save().
+
+        Parameters:
+        - path: The .npz file.
+        - source_path: If given, the table is only returned when this graph file
+          is unchanged since the table was saved.
+
+        Returns:
+        - The AllPairsTable, or None if the file is missing or stale.
+        """
+        data = load_sidecar(path, source_path)
+        if data is None:
+            return None
+        return cls(data["names"].tolist(), data["dist"], data["next_hop"], bool(data["integer_costs"]))
+
+
+def _edge_matrices(graph: CompactGraph) -> Tuple[np.ndarray, np.ndarray]:
+    """Builds the initial distance and next-hop matrices from the direct edges."""
+    n = len(graph)
+    dist = np.full((n, n), np.inf)
+    next_hop = np.full((n, n), -1, dtype=np.int32)
+    sources = np.repeat(np.arange(n), np.diff(graph.offsets))
+    targets = graph.targets.astype(np.int64)
+    np.minimum.at(dist, (sources, targets), graph.weights.astype(np.float64))
+    has_edge = dist < np.inf
+    next_hop[has_edge] = np.nonzero(has_edge)[1]
+    diagonal = np.arange(n)
+    dist[diagonal, diagonal] = 0
+    next_hop[diagonal, diagonal] = diagonal
+    return dist, next_hop
+
+
+def floyd_warshall(graph) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Vectorized Floyd-Warshall: each of the n relaxation rounds is one NumPy operation.
+
+    Parameters:
+    - graph: The graph as a dictionary or a CompactGraph.
+
+    Returns:
+    - Tuple of the distance and next-hop matrices.
+    """
+    graph = as_compact(graph)
+    dist, next_hop = _edge_matrices(graph)
+    for k in range(len(graph)):
+        through_k = dist[:, k, None] + dist[None, k, :]
+        better = through_k < dist
+        np.copyto(dist, through_k, where=better)
+        np.copyto(next_hop, np.broadcast_to(next_hop[:, k, None], next_hop.shape), where=better)
+    return dist, next_hop
+
+
+_worker_graph = {}
+
+
+def _init_row_worker(graph: CompactGraph) -> None:
+    """Process-pool initializer: receives the graph once per worker process."""
+    _worker_graph["graph"] = graph
+
+
+def _worker_rows(sources: List[int]) -> List[Tuple[int, np.ndarray, np.ndarray]]:
+    """Computes the rows of some sources on the graph held by this worker process."""
+    return _dijkstra_rows(_worker_graph["graph"], sources)
+
+
+def _dijkstra_rows(graph: CompactGraph, sources: List[int]) -> List[Tuple[int, np.ndarray, np.ndarray]]:
+    """
+    Computes the distance and next-hop rows of some sources with heap Dijkstra.
+
+    Parameters:
+    - graph: The CompactGraph.
+    - sources: Source node ids.
+
+    Returns:
+    - List of (source, distance row, next-hop row).
+    """
+    rows = []
+    for source in sources:
+        dist, pred = dijkstra(graph, source)
+        next_hop = [-1] * len(graph)
+        next_hop[source] = source
+        for target in range(len(graph)):
+            if dist[target] is None or next_hop[target] != -1:
+                continue
+            chain = []
+            node = target
+            while next_hop[node] == -1:
+                chain.append(node)
+                node = pred[node]
+            for node in reversed(chain):
+                next_hop[node] = node if pred[node] == source else next_hop[pred[node]]
+        rows.append((source, distance_array(dist), np.array(next_hop, dtype=np.int32)))
+    return rows
+
+
+def repeated_dijkstra(graph, workers: int = 1, chunksize: int = 16) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    All-pairs distances by running heap Dijkstra from every node, optionally in a process pool.
+
+    Parameters:
+    - graph: The graph as a dictionary or a CompactGraph.
+    - workers: Number of worker processes; 1 runs in this process.
+    - chunksize: Number of sources sent to a worker at a time.
+
+    Returns:
+    - Tuple of the distance and next-hop matrices.
+    """
+    graph = as_compact(graph)
+    n = len(graph)
+    dist = np.empty((n, n))
+    next_hop = np.empty((n, n), dtype=np.int32)
+    chunks = [list(range(start, min(start + chunksize, n))) for start in range(0, n, chunksize)]
+    if workers <= 1:
+        for rows in map(partial(_dijkstra_rows, graph), chunks):
+            for source, dist_row, hop_row in rows:
+                dist[source] = dist_row
+                next_hop[source] = hop_row
+        return dist, next_hop
+    with Pool(workers, initializer=_init_row_worker, initargs=(graph,)) as pool:
+        for rows in pool.imap_unordered(_worker_rows, chunks):
+            for source, dist_row, hop_row in rows:
+                dist[source] = dist_row
+                next_hop[source] = hop_row
+    return dist, next_hop
+
+
+def compute_all_pairs(graph, method: str = "auto", workers: int = 1) -> AllPairsTable:
+    """
+    Precomputes the all-pairs table of a graph.
+
+    Parameters:
+    - graph: The graph as a dictionary or a CompactGraph.
+    - method: "floyd" (dense graphs), "dijkstra" (sparse graphs) or "auto", which
+      picks by edge density.
+    - workers: Worker processes for the "dijkstra" method.
+
+    Returns:
+    - The AllPairsTable.
+    """
+    graph = as_compact(graph)
+    n = len(graph)
+    if method == "auto":
+        method = "floyd" if n == 0 or graph.num_edges / (n * n) >= DENSE_THRESHOLD else "dijkstra"
+    if method == "floyd":
+        dist, next_hop = floyd_warshall(graph)
+    elif method == "dijkstra":
+        dist, next_hop = repeated_dijkstra(graph, workers)
+    else:
+        raise ValueError(f"Unknown all-pairs method {method!r}; expected 'auto', 'floyd' or 'dijkstra'")
+    return AllPairsTable(graph.names, dist, next_hop, graph.weights.dtype.kind == "i", graph.version)
+
+
+def all_pairs_table(graph: CompactGraph, source_path: str = None, method: str = "auto",
+                    workers: int = 1, max_nodes: int = MAX_TABLE_NODES):
+    """
+    Returns the all-pairs table of a graph, computing it only when the graph changes.
+
+    The table is cached on the graph per version. When source_path is given it
+    is also saved next to that file (source_path + ".apsp.npz") and reused by
+    later runs until the file changes.
+
+    Parameters:
+    - graph: The CompactGraph.
+    - source_path: The file the graph was loaded from, if any.
+    - method: See compute_all_pairs().
+    - workers: See compute_all_pairs().
+    - max_nodes: Graphs with more nodes are not tabulated.
+
+    Returns:
+    - The AllPairsTable, or None if the graph has more than max_nodes nodes.
+    """
+    if len(graph) > max_nodes:
+        return None
+
+    def build() -> AllPairsTable:
+        table_path = source_path + ".apsp.npz" if source_path else None
+        if table_path and graph.version == 0:
+            table = AllPairsTable.load(table_path, source_path)
+            if table is not None and table.names == graph.names:
+                return table
+        table = compute_all_pairs(graph, method, workers)
+        if table_path and graph.version == 0:
+            try:
+                table.save(table_path, source_path)
+            except OSError:
+                pass
+        return table
+
+    return graph.derived("all_pairs", build)
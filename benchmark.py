@@ -0,0 +1,283 @@
+import argparse
+import json
+import math
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from algorithms import ALGORITHMS, HEURISTIC_ALGORITHMS, SearchStats
+from compact_graph import CompactGraph
+
+DEFAULT_SIZES = [100, 1000, 10000, 100000, 1000000]
+# Iterative deepening re-walks every simple path within the bound, which grows
+# exponentially on grids; run them explicitly with --algorithms.
+DEFAULT_ALGORITHMS = [name for name in ALGORITHMS if name not in ("iddfs", "idastar")]
+
+
+def _names(n: int) -> List[str]:
+    return [str(node) for node in range(n)]
+
+
+def _undirected(n: int, sources: np.ndarray, targets: np.ndarray, weights: np.ndarray) -> CompactGraph:
+    """Builds a CompactGraph holding every edge in both directions."""
+    return CompactGraph.from_arrays(_names(n), np.concatenate([sources, targets]),
+                                    np.concatenate([targets, sources]), np.concatenate([weights, weights]))
+
+
+def grid_graph(n: int, seed: int = 0) -> Tuple[CompactGraph, list, str, str]:
+    """
+    Square 4-connected grid with random integer costs and a Manhattan heuristic.
+
+    Parameters:
+    - n: Approximate number of nodes (rounded up to a square).
+    - seed: Random seed.
+
+    Returns:
+    - Tuple of the graph, heuristic values by node id, start and goal (opposite corners).
+    """
+    rng = np.random.default_rng(seed)
+    side = max(2, math.isqrt(n - 1) + 1)
+    ids = np.arange(side * side).reshape(side, side)
+    right = (ids[:, :-1].ravel(), ids[:, 1:].ravel())
+    down = (ids[:-1, :].ravel(), ids[1:, :].ravel())
+    sources = np.concatenate([right[0], down[0]])
+    targets = np.concatenate([right[1], down[1]])
+    weights = rng.integers(1, 10, len(sources))
+    graph = _undirected(side * side, sources, targets, weights)
+    goal = side * side - 1
+    rows, cols = np.divmod(np.arange(side * side), side)
+    # Every step costs at least 1, so the Manhattan distance never overestimates.
+    h_table = ((side - 1 - rows) + (side - 1 - cols)).tolist()
+    return graph, h_table, "0", str(goal)
+
+
+def geometric_graph(n: int, seed: int = 0) -> Tuple[CompactGraph, list, str, str]:
+    """
+    Random geometric graph in the unit square with Euclidean costs and heuristic.
+
+    Points closer than a radius chosen to keep the graph connected with high
+    probability are joined; costs are distances scaled by 1000.
+
+    Parameters:
+    - n: Number of nodes.
+    - seed: Random seed.
+
+    Returns:
+    - Tuple of the graph, heuristic values by node id, start (nearest the origin)
+      and goal (nearest the opposite corner).
+    """
+    rng = np.random.default_rng(seed)
+    points = rng.random((n, 2))
+    radius = math.sqrt(2.0 * math.log(max(n, 2)) / (math.pi * n))
+    cells = {}
+    for node, cell in enumerate(map(tuple, np.floor(points / radius).astype(np.int64).tolist())):
+        cells.setdefault(cell, []).append(node)
+    sources = []
+    targets = []
+    for (cx, cy), members in cells.items():
+        candidates = [other for dx in (-1, 0, 1) for dy in (-1, 0, 1) for other in cells.get((cx + dx, cy + dy), ())]
+        candidates = np.array(candidates)
+        for node in members:
+            close = candidates[(candidates > node) & (np.hypot(*(points[candidates] - points[node]).T) <= radius)]
+            sources.extend([node] * len(close))
+            targets.extend(close.tolist())
+    sources = np.array(sources, dtype=np.int64)
+    targets = np.array(targets, dtype=np.int64)
+    weights = np.hypot(*(points[sources] - points[targets]).T) * 1000 if len(sources) else np.zeros(0)
+    graph = _undirected(n, sources, targets, weights)
+    start = int(np.argmin(np.hypot(*points.T)))
+    goal = int(np.argmin(np.hypot(*(1 - points).T)))
+    h_table = (np.hypot(*(points - points[goal]).T) * 1000).tolist()
+    return graph, h_table, str(start), str(goal)
+
+
+def scale_free_graph(n: int, seed: int = 0, links: int = 2) -> Tuple[CompactGraph, list, str, str]:
+    """
+    Barabasi-Albert preferential-attachment graph with random integer costs.
+
+    There is no geometry to derive a heuristic from, so it is zero everywhere.
+
+    Parameters:
+    - n: Number of nodes.
+    - seed: Random seed.
+    - links: Edges added by every new node.
+
+    Returns:
+    - Tuple of the graph, heuristic values by node id, start and goal.
+    """
+    rng = random.Random(seed)
+    endpoints = list(range(links))
+    sources = []
+    targets = []
+    for node in range(links, n):
+        chosen = set()
+        while len(chosen) < min(links, node):
+            chosen.add(endpoints[rng.randrange(len(endpoints))])
+        for other in chosen:
+            sources.append(node)
+            targets.append(other)
+            endpoints.extend((node, other))
+    weights = np.array([rng.randint(1, 9) for _ in sources], dtype=np.int64)
+    graph = _undirected(n, np.array(sources, dtype=np.int64), np.array(targets, dtype=np.int64), weights)
+    return graph, [0] * n, "0", str(n - 1)
+
+
+def chain_graph(n: int, seed: int = 0) -> Tuple[CompactGraph, list, str, str]:
+    """
+    Deep chain 0 -> 1 -> ... -> n-1 with unit costs, plus a one-node dead end off every tenth node.
+
+    Parameters:
+    - n: Number of chain nodes.
+    - seed: Unused; generators share one signature.
+
+    Returns:
+    - Tuple of the graph, the exact remaining distance as heuristic, start and goal.
+    """
+    chain = np.arange(n - 1)
+    spurs = np.arange(0, n - 1, 10)
+    sources = np.concatenate([chain, spurs])
+    targets = np.concatenate([chain + 1, n + np.arange(len(spurs))])
+    weights = np.ones(len(sources), dtype=np.int64)
+    graph = CompactGraph.from_arrays(_names(n + len(spurs)), sources, targets, weights)
+    h_table = [n - 1 - node for node in range(n)] + [n] * len(spurs)
+    return graph, h_table, "0", str(n - 1)
+
+
+GENERATORS = {
+    "grid": grid_graph,
+    "geometric": geometric_graph,
+    "scale_free": scale_free_graph,
+    "chain": chain_graph,
+}
+
+
+def run_case(graph: CompactGraph, h_table: list, start: str, goal: str, algorithm: str,
+             measure_memory: bool = True) -> Dict:
+    """
+    Benchmarks one algorithm on one graph.
+
+    Parameters:
+    - graph: The graph.
+    - h_table: Heuristic values by node id.
+    - start: The start node.
+    - goal: The goal node.
+    - algorithm: Name from ALGORITHMS.
+    - measure_memory: Also run under tracemalloc to record the peak allocation.
+
+    Returns:
+    - Dictionary with seconds, peak_bytes, expansions, generated, duplicates,
+      frontier_peak, cost and path_length.
+    """
+    func = ALGORITHMS[algorithm]
+    extra = (h_table,) if func in HEURISTIC_ALGORITHMS else ()
+    stats = SearchStats()
+    path, cost, _ = func(graph, start, goal, *extra, trace="off", stats=stats)
+    result = {"seconds": stats.total_seconds, "cost": cost, "path_length": len(path), "peak_bytes": None,
+              "expansions": stats.expanded, "generated": stats.generated, "duplicates": stats.duplicates,
+              "frontier_peak": stats.max_frontier}
+    if measure_memory:
+        tracemalloc.start()
+        func(graph, start, goal, *extra, trace="off")
+        result["peak_bytes"] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return result
+
+
+def run_suite(sizes: List[int], generators: List[str], algorithms: List[str], seed: int = 0,
+              measure_memory: bool = True, log=None) -> Dict:
+    """
+    Runs every algorithm on every generated graph size.
+
+    Parameters:
+    - sizes: Node counts to generate.
+    - generators: Names from GENERATORS.
+    - algorithms: Names from ALGORITHMS.
+    - seed: Seed shared by all generators.
+    - measure_memory: Record peak memory with tracemalloc.
+    - log: Optional callable receiving one progress line per case.
+
+    Returns:
+    - The report: metadata plus one record per (generator, size, algorithm).
+    """
+    report = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": seed,
+        "results": [],
+    }
+    for generator in generators:
+        for size in sizes:
+            began = time.perf_counter()
+            graph, h_table, start, goal = GENERATORS[generator](size, seed)
+            build_seconds = time.perf_counter() - began
+            for algorithm in algorithms:
+                record = {"generator": generator, "size": size, "nodes": len(graph), "edges": graph.num_edges,
+                          "algorithm": algorithm, "build_seconds": build_seconds}
+                record.update(run_case(graph, h_table, start, goal, algorithm, measure_memory))
+                report["results"].append(record)
+                if log:
+                    log(f"{generator:>10} {len(graph):>8} {algorithm:>13} {record['seconds']:9.4f}s "
+                        f"expansions={record['expansions']} peak={record['peak_bytes']}")
+    return report
+
+
+def compare_reports(current: Dict, baseline: Dict, tolerance: float = 1.25) -> List[str]:
+    """
+    Lists the cases that got slower than the baseline by more than the tolerance.
+
+    Parameters:
+    - current: Report from run_suite().
+    - baseline: An earlier report.
+    - tolerance: Allowed ratio of current to baseline time.
+
+    Returns:
+    - One message per regression.
+    """
+    def key(record):
+        return record["generator"], record["size"], record["algorithm"]
+
+    previous = {key(record): record for record in baseline["results"]}
+    regressions = []
+    for record in current["results"]:
+        old = previous.get(key(record))
+        if old and old["seconds"] > 0 and record["seconds"] / old["seconds"] > tolerance:
+            regressions.append(f"{record['generator']} n={record['size']} {record['algorithm']}: "
+                               f"{old['seconds']:.4f}s -> {record['seconds']:.4f}s")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the search algorithms on generated graphs.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--generators", nargs="+", default=list(GENERATORS), choices=list(GENERATORS))
+    parser.add_argument("--algorithms", nargs="+", default=DEFAULT_ALGORITHMS, choices=list(ALGORITHMS))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc run")
+    parser.add_argument("--output", default="benchmark_results.json", help="where to write the JSON report")
+    parser.add_argument("--compare", help="earlier JSON report to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=1.25, help="allowed slowdown ratio with --compare")
+    args = parser.parse_args(argv)
+
+    report = run_suite(args.sizes, args.generators, args.algorithms, args.seed,
+                       measure_memory=not args.no_memory, log=print)
+    with open(args.output, "w") as file:
+        json.dump(report, file, indent=2)
+    print(f"Results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as file:
+            regressions = compare_reports(report, json.load(file), args.tolerance)
+        for line in regressions:
+            print("REGRESSION", line)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,260 @@
+import hashlib
+from typing import Callable, Dict, Iterable, List, Tuple
+
+import numpy as np
+
+
+class CompactGraph:
+    """
+    Directed weighted graph with dense integer node ids and CSR adjacency.
+
+    Node names are mapped to ids 0..n-1. The outgoing edges of node u are
+    stored in targets[offsets[u]:offsets[u + 1]] with the matching weights,
+    in the same order as the adjacency dictionary they were built from.
+
+    Attributes:
+    - names: Node names indexed by node id.
+    - index: Mapping from node name to node id.
+    - offsets: int64 array of length n + 1 with the start of each node's edges.
+    - targets: int32 array with the target id of every edge.
+    - weights: int64 or float64 array with the cost of every edge.
+    - version: Counter bumped on every edge change; data derived from the graph
+      (see derived()) is rebuilt when it moves.
+
+    Parameters:
+    - index: Optional name-to-id mapping to share instead of building a new one.
+    """
+    def __init__(self, names: List[str], offsets: np.ndarray, targets: np.ndarray, weights: np.ndarray,
+                 index: Dict[str, int] = None):
+        self.names = list(names)
+        self.index = index if index is not None else {name: node for node, name in enumerate(self.names)}
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+        self.version = 0
+        self._derived = {}
+
+    def __getstate__(self) -> dict:
+        # Derived data can be large and is cheap to rebuild, so it is not pickled.
+        state = self.__dict__.copy()
+        state["_derived"] = {}
+        return state
+
+    @classmethod
+    def from_dict(cls, graph: Dict[str, Dict[str, float]]) -> 'CompactGraph':
+        """
+        Builds a compact graph from the dictionary-of-dictionaries format.
+
+        Parameters:
+        - graph: Mapping from each node to a mapping of its neighbors and edge costs.
+
+        Returns:
+        - The equivalent CompactGraph. Nodes that only appear as edge targets
+          get an id after the keys of the dictionary.
+        """
+        names = list(graph)
+        index = {name: node for node, name in enumerate(names)}
+        offsets = [0]
+        targets = []
+        weights = []
+        for name, neighbors in graph.items():
+            for neighbor, cost in neighbors.items():
+                if neighbor not in index:
+                    index[neighbor] = len(names)
+                    names.append(neighbor)
+                targets.append(index[neighbor])
+                weights.append(cost)
+            offsets.append(len(targets))
+        offsets.extend([len(targets)] * (len(names) + 1 - len(offsets)))
+        return cls(names, np.array(offsets, dtype=np.int64), np.array(targets, dtype=np.int32),
+                   _weight_array(weights))
+
+    @classmethod
+    def from_edges(cls, names: List[str], edges: Iterable[Tuple[int, int, float]]) -> 'CompactGraph':
+        """
+        Builds a compact graph from (source id, target id, cost) triples.
+
+        Edges keep their input order within each source node.
+
+        Parameters:
+        - names: Node names indexed by node id.
+        - edges: Iterable of (source, target, cost) triples using node ids.
+
+        Returns:
+        - The CompactGraph holding those edges.
+        """
+        edges = list(edges)
+        sources = np.array([edge[0] for edge in edges], dtype=np.int64)
+        targets = np.array([edge[1] for edge in edges], dtype=np.int32)
+        weights = _weight_array([edge[2] for edge in edges])
+        return cls.from_arrays(names, sources, targets, weights)
+
+    @classmethod
+    def from_arrays(cls, names: List[str], sources: np.ndarray, targets: np.ndarray,
+                    weights: np.ndarray, index: Dict[str, int] = None) -> 'CompactGraph':
+        """
+        Builds a compact graph from parallel edge arrays (COO form).
+
+        Edges keep their input order within each source node.
+
+        Parameters:
+        - names: Node names indexed by node id.
+        - sources: Source id of every edge.
+        - targets: Target id of every edge.
+        - weights: Cost of every edge.
+        - index: Optional name-to-id mapping matching names, shared instead of rebuilt.
+
+        Returns:
+        - The CompactGraph holding those edges.
+        """
+        order = np.argsort(sources, kind="stable")
+        offsets = np.zeros(len(names) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=len(names)), out=offsets[1:])
+        return cls(names, offsets, np.asarray(targets, dtype=np.int32)[order], np.asarray(weights)[order], index)
+
+    def to_dict(self) -> Dict[str, Dict[str, float]]:
+        """
+        Converts the graph back to the dictionary-of-dictionaries format.
+
+        Returns:
+        - Mapping from each node name to a mapping of neighbor names and edge costs.
+        """
+        names = self.names
+        offsets = self.offsets.tolist()
+        targets = self.targets.tolist()
+        weights = self.weights.tolist()
+        return {
+            name: {names[targets[edge]]: weights[edge] for edge in range(offsets[node], offsets[node + 1])}
+            for node, name in enumerate(names)
+        }
+
+    def neighbors(self, node: int):
+        """
+        Lists the outgoing edges of a node.
+
+        Parameters:
+        - node: The node id.
+
+        Returns:
+        - Iterable of (target id, cost) pairs with plain Python numbers.
+        """
+        lo, hi = self.offsets[node:node + 2].tolist()
+        return zip(self.targets[lo:hi].tolist(), self.weights[lo:hi].tolist())
+
+    def copy(self) -> 'CompactGraph':
+        """
+        Returns an independent copy whose edge costs can be changed without touching this graph.
+
+        The structure arrays and the name index are shared, since set_weight()
+        only ever writes to the weights.
+        """
+        return CompactGraph(self.names, self.offsets, self.targets, self.weights.copy(), self.index)
+
+    def reverse(self) -> 'CompactGraph':
+        """
+        Returns the graph with every edge reversed, built once per graph version.
+
+        The outgoing edges of a node in the reverse graph are its incoming edges
+        here, with the same costs. Node ids and the name index are shared.
+        """
+        def build() -> CompactGraph:
+            sources = np.repeat(np.arange(len(self), dtype=np.int64), np.diff(self.offsets))
+            return CompactGraph.from_arrays(self.names, self.targets, sources, self.weights, self.index)
+        return self.derived("reverse", build)
+
+    def node_id(self, name: str) -> int:
+        """Returns the id of a node name, raising KeyError if it is unknown."""
+        return self.index[name]
+
+    def edge_index(self, source: int, target: int) -> int:
+        """Returns the position of the edge source -> target in targets, or -1."""
+        lo, hi = self.offsets[source:source + 2].tolist()
+        matches = np.flatnonzero(self.targets[lo:hi] == target)
+        return lo + int(matches[0]) if len(matches) else -1
+
+    def set_weight(self, source: str, target: str, cost) -> None:
+        """
+        Changes the cost of an existing edge and bumps the graph version.
+
+        Parameters:
+        - source: Name of the edge's source node.
+        - target: Name of the edge's target node.
+        - cost: The new edge cost.
+        """
+        edge = self.edge_index(self.index[source], self.index[target])
+        if edge == -1:
+            raise KeyError(f"No edge {source!r} -> {target!r}")
+        if not isinstance(cost, (int, np.integer)) and self.weights.dtype.kind == "i":
+            self.weights = self.weights.astype(np.float64)
+        elif not self.weights.flags.writeable:
+            self.weights = self.weights.copy()
+        self.weights[edge] = cost
+        self.version += 1
+
+    def fingerprint(self) -> str:
+        """
+        Returns a content hash of the node names, structure and edge costs.
+
+        Graphs with identical names, ids, edges and costs share a fingerprint; the hash is
+        computed once per graph version.
+        """
+        def build() -> str:
+            digest = hashlib.blake2b(digest_size=16)
+            digest.update("\n".join(self.names).encode("utf-8"))
+            for data in (self.offsets, self.targets, self.weights):
+                digest.update(data.dtype.str.encode("ascii"))
+                digest.update(np.ascontiguousarray(data).tobytes())
+            return digest.hexdigest()
+        return self.derived("fingerprint", build)
+
+    def derived(self, key, build: Callable):
+        """
+        Returns data derived from the graph, building it at most once per graph version.
+
+        Parameters:
+        - key: Name of the derived data, e.g. "reverse" or ("spt", 3).
+        - build: Zero-argument callable that computes the data.
+
+        Returns:
+        - The cached or freshly built data.
+        """
+        entry = self._derived.get(key)
+        if entry is None or entry[0] != self.version:
+            entry = (self.version, build())
+            self._derived[key] = entry
+        return entry[1]
+
+    @property
+    def num_edges(self) -> int:
+        return len(self.targets)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.index
+
+    def __repr__(self) -> str:
+        return f"CompactGraph(nodes={len(self)}, edges={self.num_edges})"
+
+
+def _weight_array(weights: list) -> np.ndarray:
+    """Stores integer costs as int64 so results keep their type, anything else as float64."""
+    if all(isinstance(cost, (int, np.integer)) for cost in weights):
+        return np.array(weights, dtype=np.int64)
+    return np.array(weights, dtype=np.float64)
+
+
+def as_compact(graph) -> CompactGraph:
+    """
+    Returns the graph as a CompactGraph, converting the dictionary format if needed.
+
+    Parameters:
+    - graph: A CompactGraph or a dictionary-of-dictionaries graph.
+
+    Returns:
+    - A CompactGraph.
+    """
+    if isinstance(graph, CompactGraph):
+        return graph
+    return CompactGraph.from_dict(graph)
@@ -1,4 +1,16 @@
+import argparse
+import json
+import sys
+
 from algorithms import * 
+from all_pairs import all_pairs_table
+from graph_loader import add_graph_arguments, load_graph, load_heuristics
+from landmarks import inadmissible_entries, landmark_table
+from trace_file import TraceReader, TraceWriter
+
+# Menu entries after the algorithms.
+COMPARE_CHOICE = len(ALGORITHM_TITLES) + 1
+TOP_JOURNEYS_CHOICE = len(ALGORITHM_TITLES) + 2
 
 def display_intro():
     """Displays the introduction message for the program."""
@@ -11,11 +23,10 @@ def display_menu():
     """Displays the menu of available algorithms."""
     
     print("\n" + "-" * 40)
-    print("1. Depth-First Search (DFS)")
-    print("2. Breadth-First Search (BFS)")
-    print("3. Uninformed Cost Search")
-    print("4. A* Search")
-    print("5. Hill Climbing")
+    for number, title in enumerate(ALGORITHM_TITLES.values(), 1):
+        print(f"{number}. {title}")
+    print(f"{COMPARE_CHOICE}. Compare all algorithms")
+    print(f"{TOP_JOURNEYS_CHOICE}. Show the top journeys")
     print("0. Exit")
      
 def generate_description(optimal_path: list) -> str:
@@ -44,7 +55,7 @@ def generate_description(optimal_path: list) -> str:
     for i in range(0, len(optimal_path)):
         node = optimal_path[i]
         if i >= 0:
-            journey.append(descriptions[node])
+            journey.append(descriptions.get(node, node))
     description += " ".join(journey)
 
     return description 
@@ -59,41 +70,225 @@ def get_user_choice():
     while True:
         try:
             choice = int(input("Enter the number of your choice: "))
-            if 0 <= choice <= 5:
+            if 0 <= choice <= TOP_JOURNEYS_CHOICE:
                 return choice
             else:
-                print("Invalid choice. Please enter a number between 0 and 5.")
+                print(f"Invalid choice. Please enter a number between 0 and {TOP_JOURNEYS_CHOICE}.")
         except ValueError:
             print("Invalid input. Please enter a valid number.")      
 
 
-def main():
-    A = "A"
-    B = "B"
-    C = "C"
-    D = "D"
-    E = "E"
-    S = "S"
-    R = "R"
-    graph = {
-        A: {B: 2, R: 30},
-        B: {A: 1, C: 12, D: 3, E: 3},
-        C: {D: 6, E: 2},
-        D: {E: 5, R: 21},
-        E: {R: 40},
-        S: {A: 5, B: 8, D: 4, E: 1},
-        R: {}
-    }
-    heuristics = {
-        A: 40,
-        B: 30,
-        C: 30,
-        D: 35,
-        E: 2,
-        S: 25,
-        R: 0
-    }
+def warn_inadmissible(graph, heuristics, goal):
+    """
+    Warns when the heuristic table overestimates the cost to the goal, since A* may then miss the optimal path.
+
+    Parameters:
+    - graph: The loaded graph.
+    - heuristics: The heuristic table keyed by node name.
+    - goal: The goal node.
+    """
+    if goal not in graph:
+        return
+    flagged = inadmissible_entries(graph, heuristics, goal)
+    if flagged:
+        entries = ", ".join(f"{node} ({estimate} > {cost})" for node, (estimate, cost) in flagged.items())
+        print(f"Warning: the heuristic overestimates the cost to {goal} at {entries}.")
+        print("A* may not return the cheapest path; run with --landmarks K for an admissible heuristic.")
+
+
+def display_comparison(graph, heuristics, start, goal, timeout: float):
+    """
+    Runs the algorithms side by side and prints one table row as each finishes.
+
+    Parameters:
+    - graph: The loaded graph.
+    - heuristics: The heuristic table used by the heuristic algorithms.
+    - start: The start node.
+    - goal: The goal node.
+    - timeout: Seconds each algorithm may run.
+    """
+    print(f"{'Algorithm':<34} {'Cost':>8} {'Expanded':>9} {'Time (ms)':>10}  Path")
+    for row in compare_algorithms(graph, start, goal, heuristics, timeout=timeout):
+        title = ALGORITHM_TITLES.get(row["algorithm"], row["algorithm"])
+        if "error" in row:
+            print(f"{title:<34} {row['error']}")
+        else:
+            print(f"{title:<34} {row['cost']:>8} {row['expanded']:>9} {row['seconds'] * 1000:>10.2f}  "
+                  f"{' -> '.join(row['path']) or 'no path'}")
+    print()
+
+
+def display_top_journeys(graph, start, goal, k: int):
+    """
+    Prints the k cheapest journeys, cheapest first.
+
+    Parameters:
+    - graph: The loaded graph.
+    - start: The start node.
+    - goal: The goal node.
+    - k: Number of journeys.
+    """
+    journeys = k_shortest_paths(graph, start, goal, k)
+    if not journeys:
+        print(f"There is no journey from {start} to {goal}.\n")
+        return
+    for rank, (path, cost) in enumerate(journeys, 1):
+        print(f"{rank}. {' -> '.join(path)} ({cost} Years)")
+    print()
+
+
+def replay_trace(path: str, step: int = None):
+    """
+    Prints a trace saved with --save-trace.
+
+    Parameters:
+    - path: The trace file.
+    - step: Print only the frontier after this step; None prints every frontier state.
+      A ValueError is raised if it is not one of the steps of the trace.
+    """
+    with TraceReader(path) as trace:
+        if step is not None and not 0 <= step < trace.steps:
+            raise ValueError(f"{path} has steps 0 to {trace.steps - 1}, not {step}" if trace.steps
+                             else f"{path} has no steps")
+        print(f"Trace of {trace.steps} steps and {trace.pushes} search nodes")
+        if trace.goal != -1:
+            print("Journey Path:", trace.path(trace.goal))
+        if step is not None:
+            print(f"Frontier after step {step}:")
+            print(trace.snapshot(step))
+        else:
+            for state in trace:
+                print(state)
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """
+    Parses the command line options.
+
+    Parameters:
+    - argv: Argument list; defaults to sys.argv[1:].
+
+    Returns:
+    - The parsed options.
+    """
+    parser = argparse.ArgumentParser(description="Future Options Explorer")
+    add_graph_arguments(parser)
+    parser.add_argument("--batch", action="store_true",
+                        help="read JSONL queries ({\"start\": ..., \"goal\": ...}) from stdin and write JSONL results")
+    parser.add_argument("--algorithm", default="ucs", choices=sorted(ALGORITHMS),
+                        help="algorithm used in batch mode")
+    parser.add_argument("--workers", type=int, default=1, help="worker processes used in batch mode")
+    parser.add_argument("--chunksize", type=int, default=64, help="queries sent to a worker at a time")
+    parser.add_argument("--unordered", action="store_true",
+                        help="write batch results as they complete instead of in input order")
+    parser.add_argument("--precomputed", action="store_true",
+                        help="answer uniform-cost queries from a precomputed all-pairs table (saved next to the graph)")
+    parser.add_argument("--timeout", type=float, default=5.0,
+                        help="seconds each algorithm may run when comparing all algorithms")
+    parser.add_argument("--k", type=int, default=5, help="number of journeys listed by 'Show the top journeys'")
+    parser.add_argument("--save-trace", metavar="PATH",
+                        help="stream the frontier of every search run from the menu into this binary trace file "
+                             "instead of printing it")
+    parser.add_argument("--replay", metavar="PATH", help="print the frontier states of a saved trace and exit")
+    parser.add_argument("--step", type=int, help="with --replay, print only the frontier after this step")
+    args = parser.parse_args(argv)
+    if args.step is not None and not args.replay:
+        parser.error("--step needs --replay")
+    if args.step is not None and args.step < 0:
+        parser.error(f"--step must not be negative, got {args.step}")
+    return args
+
+
+def table_results(table, queries):
+    """
+    Answers queries from an all-pairs table, in the same format as run_batch.
+
+    Parameters:
+    - table: An AllPairsTable.
+    - queries: Iterable of queries as accepted by run_batch.
+
+    Yields:
+    - A result dictionary per query.
+    """
+    for index, query in enumerate(queries):
+        try:
+            start, goal = query_endpoints(query)
+        except Exception as e:
+            yield {"index": index, "error": f"{type(e).__name__}: {e}"}
+            continue
+        result = {"index": index, "start": start, "goal": goal}
+        try:
+            result["path"], result["cost"] = table.query(start, goal)
+        except Exception as e:
+            result["error"] = f"{type(e).__name__}: {e}"
+        yield result
+
+
+def read_queries(stream):
+    """
+    Decodes JSONL queries one line at a time, skipping blank lines.
+
+    Parameters:
+    - stream: The input lines.
+
+    Yields:
+    - The decoded query, or the decoding error for a malformed line so the batch reports it and goes on.
+    """
+    for line in stream:
+        if line.strip():
+            try:
+                yield json.loads(line)
+            except ValueError as e:
+                yield e
+
+
+def run_batch_mode(args: argparse.Namespace, graph, heuristics, table=None, stdin=None, stdout=None):
+    """
+    Answers JSONL queries from stdin with JSONL results on stdout, without prompting.
+
+    Parameters:
+    - args: The parsed command line options.
+    - graph: The loaded graph.
+    - heuristics: The loaded heuristic table, or a LandmarkTable with --landmarks.
+    - table: Optional AllPairsTable used for uniform-cost queries.
+    - stdin: Input stream; defaults to sys.stdin.
+    - stdout: Output stream; defaults to sys.stdout.
+    """
+    stdin = stdin or sys.stdin
+    stdout = stdout or sys.stdout
+    queries = read_queries(stdin)
+    if table is not None and args.algorithm == "ucs":
+        results = table_results(table, queries)
+    else:
+        h_table = heuristics if resolve_algorithm(args.algorithm) in HEURISTIC_ALGORITHMS else None
+        results = run_batch(graph, queries, args.algorithm, workers=args.workers, h_table=h_table,
+                            chunksize=args.chunksize, ordered=not args.unordered)
+    for result in results:
+        stdout.write(json.dumps(result) + "\n")
+        stdout.flush()
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.replay:
+        try:
+            replay_trace(args.replay, args.step)
+        except (OSError, ValueError) as e:
+            sys.exit(f"Cannot replay trace: {e}")
+        return
+    graph = load_graph(args.graph)
+    heuristics = load_heuristics(args.heuristics)
+    if args.landmarks:
+        heuristics = landmark_table(graph, args.graph, args.landmarks)
+    S = args.start
+    R = args.goal
+    table = all_pairs_table(graph, args.graph, workers=args.workers) if args.precomputed else None
+    if args.batch:
+        run_batch_mode(args, graph, heuristics, table)
+        return
     display_intro()
+    if not args.landmarks:
+        warn_inadmissible(graph, heuristics, R)
     
     while True:
         display_menu()
@@ -102,29 +297,61 @@ def main():
         if choice == 0:
             print("GoodBye...")
             break
+
+        if choice == COMPARE_CHOICE:
+            print("\nYou chose: Compare all algorithms\n")
+            display_comparison(graph, heuristics, S, R, args.timeout)
+            continue
+
+        if choice == TOP_JOURNEYS_CHOICE:
+            print(f"\nYou chose: Show the top {args.k} journeys\n")
+            display_top_journeys(graph, S, R, args.k)
+            continue
         
-        algorithm_functions = [
-            (DFS, graph, S, R),
-            (BFS, graph, S, R),
-            (Uninformed_cost_search, graph, S, R),
-            (A_star_search, graph, S, R, heuristics),
-            (hill_climbing, graph, S, R, heuristics)
-            ]
+        algorithm_functions = []
+        for name in ALGORITHM_TITLES:
+            func = ALGORITHMS[name]
+            extra = (heuristics,) if func in HEURISTIC_ALGORITHMS else ()
+            algorithm_functions.append((func, graph, S, R) + extra)
         
-        algorithm_names = ["Depth-First Search (DFS)", "Breadth-First Search (BFS)",
-                           "Uninformed Cost Search", "A* Search", "Hill Climbing"]
+        algorithm_names = list(ALGORITHM_TITLES.values())
         
         print(f"\nYou chose: {algorithm_names[choice - 1]}\n")
         
         try:
             func , *arg = algorithm_functions[choice -1]
-            path , cost , frontier_states = func(*arg)
+            stats = None
+            if func is Uninformed_cost_search and table is not None:
+                path , cost = table.query(S, R)
+                frontier_states = []
+                print("(Answered from the precomputed all-pairs table; no frontier to show.)")
+            elif func in STEP_FUNCTIONS and args.save_trace:
+                stats = SearchStats()
+                with TraceWriter(args.save_trace) as writer:
+                    path , cost , _ = run_steps(writer.tee(STEP_FUNCTIONS[func](*arg, stats=stats)), "off", stats)
+                frontier_states = []
+                print(f"Frontier trace of {writer.steps} steps saved to {args.save_trace}\n")
+            elif func in STEP_FUNCTIONS:
+                # Print the frontier while the search runs instead of after it
+                stats = SearchStats()
+                print("Exploring the frontier:")
+                path , cost , _ = run_steps(STEP_FUNCTIONS[func](*arg, stats=stats), "full", stats, on_state=print)
+                frontier_states = []
+                print()
+            else:
+                stats = SearchStats()
+                # Iterative deepening keeps memory linear in depth only when it records nothing
+                trace = "off" if func in (iterative_deepening_DFS, IDA_star_search) else "delta"
+                path , cost , frontier_states = func(*arg, trace=trace, stats=stats)
             print("Your Journey Path:",path)
             print("Your Journey duration:",cost,"Years\n")
+            if stats is not None:
+                print(f"Search stats: {stats}\n")
             print("Explore Your Journey Stations:\n"+ generate_description(path)+"\n")
             for state in frontier_states:
                 print(state)
 
         except Exception as e:  
             print(f"An error occured: {str(e)}\n")
-main() 
\ No newline at end of file
+if __name__ == "__main__":
+    main()
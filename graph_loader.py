@@ -0,0 +1,320 @@
+import csv
+import json
+import mmap
+import os
+import struct
+from array import array
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from compact_graph import CompactGraph
+
+CACHE_SUFFIX = ".fgc"
+CACHE_VERSION = 1
+
+_MAGIC = b"FOECACHE"
+# magic, version, source size, source mtime (ns), number of arrays, names blob length
+_HEADER = struct.Struct("<8sIQqIQ")
+# dtype code (e.g. b"<i8") and element count of each stored array
+_ARRAY_ENTRY = struct.Struct("<4sQ")
+
+
+def _parse_number(text: str):
+    """Parses an edge cost or heuristic value, keeping integers as int."""
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+
+def _is_number(text: str) -> bool:
+    try:
+        _parse_number(text)
+    except ValueError:
+        return False
+    return True
+
+
+def _delimiter_for(path: str) -> str:
+    """Picks the column delimiter from the file extension (tab unless .csv)."""
+    return "," if path.lower().endswith(".csv") else "\t"
+
+
+def _rows(path: str, delimiter: str = None):
+    """
+    Streams the data rows of a CSV/TSV file.
+
+    Blank lines, lines starting with '#' and a header row (detected by a
+    non-numeric last column) are skipped.
+
+    Yields:
+    - List of stripped fields for each row.
+    """
+    with open(path, newline="", encoding="utf-8") as file:
+        reader = csv.reader(file, delimiter=delimiter or _delimiter_for(path))
+        first = True
+        for row in reader:
+            if not row or row[0].lstrip().startswith("#"):
+                continue
+            row = [field.strip() for field in row]
+            if first:
+                first = False
+                if not _is_number(row[-1]):
+                    continue
+            yield row
+
+
+def source_stamp(path: str) -> Tuple[int, int]:
+    """Returns the size and modification time (ns) of a file, which identify the version a cache was built from."""
+    stat = os.stat(path)
+    return stat.st_size, stat.st_mtime_ns
+
+
+def save_sidecar(path: str, source_path: str = None, **arrays) -> None:
+    """
+    Writes arrays computed from a graph file to an .npz sidecar, stamped with that file.
+
+    Parameters:
+    - path: Destination file.
+    - source_path: The file the arrays were computed from; its size and mtime are
+      stored so load_sidecar() can tell when they are stale.
+    - arrays: The arrays to store, by name.
+    """
+    stamp = source_stamp(source_path) if source_path else (-1, -1)
+    with open(path, "wb") as file:
+        np.savez(file, stamp=np.array(stamp, dtype=np.int64), **arrays)
+
+
+def load_sidecar(path: str, source_path: str = None) -> Dict[str, np.ndarray]:
+    """
+    Reads the arrays written by save_sidecar().
+
+    Parameters:
+    - path: The .npz file.
+    - source_path: If given, the arrays are only returned when this file is
+      unchanged since they were saved.
+
+    Returns:
+    - The arrays by name, or None if the file is missing, unreadable or stale.
+    """
+    try:
+        data = np.load(path)
+    except (OSError, ValueError):
+        return None
+    with data:
+        if source_path and tuple(data["stamp"].tolist()) != source_stamp(source_path):
+            return None
+        return {name: data[name] for name in data.files if name != "stamp"}
+
+
+def write_cache(cache_path: str, source_path: str, arrays: List[np.ndarray], names: List[str]) -> bool:
+    """
+    Writes a binary sidecar cache: a fixed header, the raw arrays and the node names.
+
+    Parameters:
+    - cache_path: Where to write the cache.
+    - source_path: The file the data was loaded from; its size and mtime are stored
+      so a stale cache is detected.
+    - arrays: NumPy arrays to store, in order.
+    - names: Node names indexed by node id.
+
+    Returns:
+    - True if the cache was written, False if the location is not writable.
+    """
+    size, mtime = source_stamp(source_path)
+    names_blob = "\n".join(names).encode("utf-8")
+    temp_path = cache_path + ".tmp"
+    try:
+        with open(temp_path, "wb") as file:
+            file.write(_HEADER.pack(_MAGIC, CACHE_VERSION, size, mtime, len(arrays), len(names_blob)))
+            for data in arrays:
+                file.write(_ARRAY_ENTRY.pack(data.dtype.str.encode("ascii"), len(data)))
+            for data in arrays:
+                file.write(b"\0" * (-file.tell() % 8))
+                file.write(np.ascontiguousarray(data).tobytes())
+            file.write(names_blob)
+        os.replace(temp_path, cache_path)
+    except OSError:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        return False
+    return True
+
+
+def read_cache(cache_path: str, source_path: str):
+    """
+    Opens a sidecar cache with mmap.
+
+    The arrays are zero-copy views into the mapping, so only the pages a search
+    touches are read from disk.
+
+    Parameters:
+    - cache_path: The cache file.
+    - source_path: The file the cache was built from.
+
+    Returns:
+    - Tuple of (arrays, names), or None if the cache is missing, stale or unreadable.
+    """
+    try:
+        with open(cache_path, "rb") as file:
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+    try:
+        magic, version, size, mtime, count, names_length = _HEADER.unpack_from(mapped, 0)
+    except struct.error:
+        return None
+    if magic != _MAGIC or version != CACHE_VERSION or (size, mtime) != source_stamp(source_path):
+        return None
+    position = _HEADER.size
+    entries = []
+    for _ in range(count):
+        entries.append(_ARRAY_ENTRY.unpack_from(mapped, position))
+        position += _ARRAY_ENTRY.size
+    arrays = []
+    for dtype, length in entries:
+        position += -position % 8
+        dtype = np.dtype(dtype.rstrip(b"\0").decode("ascii"))
+        arrays.append(np.frombuffer(mapped, dtype=dtype, count=length, offset=position))
+        position += dtype.itemsize * length
+    names_blob = mapped[position:position + names_length].decode("utf-8")
+    names = names_blob.split("\n") if names_length else []
+    return arrays, names
+
+
+def load_edge_list(path: str, delimiter: str = None) -> CompactGraph:
+    """
+    Streams a CSV/TSV edge list with rows of source, target and cost.
+
+    Parameters:
+    - path: The edge-list file.
+    - delimiter: Column delimiter; by default ',' for .csv files and tab otherwise.
+
+    Returns:
+    - The graph as a CompactGraph, with node ids in order of first appearance.
+    """
+    index = {}
+    names = []
+    sources = array("q")
+    targets = array("q")
+    # Costs stay integers until the first fractional one turns the buffer into floats
+    weights = array("q")
+    for row in _rows(path, delimiter):
+        source, target, cost = row[0], row[1], _parse_number(row[2])
+        for name in (source, target):
+            if name not in index:
+                index[name] = len(names)
+                names.append(name)
+        sources.append(index[source])
+        targets.append(index[target])
+        if weights.typecode == "q" and not isinstance(cost, int):
+            weights = array("d", weights)
+        weights.append(cost)
+    return CompactGraph.from_arrays(names, np.frombuffer(sources, dtype=np.int64),
+                                    np.frombuffer(targets, dtype=np.int64), np.frombuffer(weights, dtype=weights.typecode))
+
+
+def load_json_adjacency(path: str) -> CompactGraph:
+    """
+    Loads a JSON adjacency file in the same dictionary-of-dictionaries format the app uses.
+
+    A .jsonl file holding one {"node": ..., "edges": {...}} object per line is
+    streamed line by line; a plain .json object is parsed in one go.
+
+    Parameters:
+    - path: The JSON or JSON Lines file.
+
+    Returns:
+    - The graph as a CompactGraph.
+    """
+    if not path.lower().endswith(".jsonl"):
+        with open(path, encoding="utf-8") as file:
+            return CompactGraph.from_dict(json.load(file))
+    graph = {}
+    with open(path, encoding="utf-8") as file:
+        for line in file:
+            if line.strip():
+                record = json.loads(line)
+                graph[record["node"]] = record.get("edges", {})
+    return CompactGraph.from_dict(graph)
+
+
+def load_graph(path: str, use_cache: bool = True) -> CompactGraph:
+    """
+    Loads a graph file, reusing or writing its binary sidecar cache.
+
+    .json and .jsonl files are read as adjacency; anything else as an edge list.
+    The cache is written next to the file as path + ".fgc" and is rebuilt
+    whenever the source file changes.
+
+    Parameters:
+    - path: The graph file.
+    - use_cache: Read and write the sidecar cache.
+
+    Returns:
+    - The graph as a CompactGraph.
+    """
+    cache_path = path + CACHE_SUFFIX
+    if use_cache:
+        cached = read_cache(cache_path, path)
+        if cached is not None:
+            (offsets, targets, weights), names = cached
+            return CompactGraph(names, offsets, targets, weights)
+    if path.lower().endswith((".json", ".jsonl")):
+        graph = load_json_adjacency(path)
+    else:
+        graph = load_edge_list(path)
+    if use_cache:
+        write_cache(cache_path, path, [graph.offsets, graph.targets, graph.weights], graph.names)
+    return graph
+
+
+def load_heuristics(path: str, use_cache: bool = True) -> Dict[str, float]:
+    """
+    Streams a heuristic table file with rows of node and estimated cost to the goal.
+
+    Parameters:
+    - path: The CSV/TSV heuristic file.
+    - use_cache: Read and write the sidecar cache.
+
+    Returns:
+    - Dictionary mapping node names to heuristic values.
+    """
+    cache_path = path + CACHE_SUFFIX
+    if use_cache:
+        cached = read_cache(cache_path, path)
+        if cached is not None:
+            (values,), names = cached
+            return dict(zip(names, values.tolist()))
+    heuristics = {}
+    for row in _rows(path):
+        heuristics[row[0]] = _parse_number(row[1])
+    if use_cache:
+        integers = all(isinstance(value, int) for value in heuristics.values())
+        values = np.array(list(heuristics.values()), dtype=np.int64 if integers else np.float64)
+        write_cache(cache_path, path, [values], list(heuristics))
+    return heuristics
+
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+DEFAULT_GRAPH_PATH = os.path.join(DATA_DIR, "roadmap.csv")
+DEFAULT_HEURISTICS_PATH = os.path.join(DATA_DIR, "roadmap_heuristics.csv")
+
+
+def add_graph_arguments(parser) -> None:
+    """
+    Adds the graph selection options shared by the console and Streamlit apps.
+
+    Parameters:
+    - parser: An argparse.ArgumentParser.
+    """
+    parser.add_argument("--graph", default=DEFAULT_GRAPH_PATH,
+                        help="graph file: CSV/TSV edge list (source, target, cost) or JSON/JSONL adjacency")
+    parser.add_argument("--heuristics", default=DEFAULT_HEURISTICS_PATH,
+                        help="heuristic table file: CSV/TSV rows of node and estimate")
+    parser.add_argument("--start", default="S", help="start node")
+    parser.add_argument("--goal", default="R", help="goal node")
+    parser.add_argument("--landmarks", type=int, default=0, metavar="K",
+                        help="give A* and hill climbing a landmark (ALT) heuristic from K landmarks, "
+                             "saved next to the graph, instead of the heuristic file")
@@ -0,0 +1,210 @@
+import random
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from algorithms import dijkstra, distance_array
+from compact_graph import CompactGraph, as_compact
+from graph_loader import load_sidecar, save_sidecar
+
+# Number of landmarks picked when none is given.
+DEFAULT_LANDMARKS = 8
+
+
+class LandmarkTable:
+    """
+    Shortest distances to and from a few landmark nodes (ALT preprocessing).
+
+    By the triangle inequality, for a landmark L and any nodes v and goal:
+    d(v, goal) >= d(L, goal) - d(L, v) and d(v, goal) >= d(v, L) - d(goal, L).
+    The largest of these bounds over all landmarks is an admissible and
+    consistent A* heuristic. Pass the table as h_table and the searches call
+    heuristic() for their goal.
+
+    Attributes:
+    - names: Node names indexed by node id.
+    - landmarks: Node ids of the landmarks.
+    - from_landmark: k x n float64 matrix; from_landmark[i, v] = d(landmark i, v) (inf when unreachable).
+    - to_landmark: k x n float64 matrix; to_landmark[i, v] = d(v, landmark i) (inf when unreachable).
+    - method: How the landmarks were picked (see compute_landmarks()).
+    - version: The graph version the table was computed at.
+    """
+    def __init__(self, names: List[str], landmarks: List[int], from_landmark: np.ndarray,
+                 to_landmark: np.ndarray, method: str = "farthest", version: int = 0):
+        self.names = list(names)
+        self.index = {name: node for node, name in enumerate(self.names)}
+        self.landmarks = list(landmarks)
+        self.from_landmark = from_landmark
+        self.to_landmark = to_landmark
+        self.method = method
+        self.version = version
+
+    def heuristic(self, goal: str) -> np.ndarray:
+        """
+        Computes the landmark lower bound on the cost from every node to goal.
+
+        Parameters:
+        - goal: The goal node name.
+
+        Returns:
+        - float64 array indexed by node id; inf for nodes that provably cannot
+          reach goal, 0 where no landmark gives a bound.
+        """
+        target = self.index.get(goal, -1)
+        if target == -1 or not self.landmarks:
+            return np.zeros(len(self.names))
+        with np.errstate(invalid="ignore"):
+            # d(L, goal) - d(L, v) and d(v, L) - d(goal, L); inf - inf (no information) gives nan
+            forward = self.from_landmark[:, target, None] - self.from_landmark
+            backward = self.to_landmark - self.to_landmark[:, target, None]
+            bounds = np.fmax(forward, backward)
+        bounds = np.nan_to_num(bounds, nan=0.0, posinf=np.inf, neginf=0.0)
+        h = bounds.max(axis=0)
+        np.maximum(h, 0, out=h)
+        h[target] = 0
+        return h
+
+    def save(self, path: str, source_path: str = None) -> None:
+        """
+        Writes the table to an .npz file.
+
+        Parameters:
+        - path: Destination file.
+        - source_path: Graph file the table was computed from; its size and mtime
+          are stored so load() can tell when the table is stale.
+        """
+        save_sidecar(path, source_path, names=np.array(self.names, dtype=str),
+                     landmarks=np.array(self.landmarks, dtype=np.int64),
+                     from_landmark=self.from_landmark, to_landmark=self.to_landmark,
+                     method=np.array(self.method))
+
+    @classmethod
+    def load(cls, path: str, source_path: str = None):
+        """
+        Reads a table written by save().
+
+        Parameters:
+        - path: The .npz file.
+        - source_path: If given, the table is only returned when this graph file
+          is unchanged since the table was saved.
+
+        Returns:
+        - The LandmarkTable, or None if the file is missing, stale or does not record its method.
+        """
+        data = load_sidecar(path, source_path)
+        if data is None or "method" not in data:
+            return None
+        return cls(data["names"].tolist(), data["landmarks"].tolist(), data["from_landmark"], data["to_landmark"],
+                   str(data["method"]))
+
+
+def _distance_row(graph: CompactGraph, source: int) -> np.ndarray:
+    """Runs Dijkstra from source and returns the distances as a float64 array (inf when unreachable)."""
+    return distance_array(dijkstra(graph, source)[0])
+
+
+def compute_landmarks(graph, k: int = DEFAULT_LANDMARKS, method: str = "farthest", seed: int = 0) -> LandmarkTable:
+    """
+    Picks k landmarks and computes the distances to and from each of them.
+
+    "farthest" starts from the node farthest from a random node, then repeatedly
+    adds the node farthest from all landmarks chosen so far (nodes no landmark
+    reaches count as farthest, so every component gets covered). "random" picks
+    k nodes uniformly.
+
+    Parameters:
+    - graph: The graph as a dictionary or a CompactGraph.
+    - k: Number of landmarks (capped at the number of nodes).
+    - method: "farthest" or "random".
+    - seed: Random seed.
+
+    Returns:
+    - The LandmarkTable.
+    """
+    graph = as_compact(graph)
+    n = len(graph)
+    k = min(k, n)
+    rng = random.Random(seed)
+    reverse = graph.reverse()
+    if method == "random":
+        landmarks = rng.sample(range(n), k)
+        from_rows = [_distance_row(graph, landmark) for landmark in landmarks]
+    elif method == "farthest":
+        landmarks = []
+        from_rows = []
+        if k:
+            seed_row = _distance_row(graph, rng.randrange(n))
+            nearest = np.where(np.isinf(seed_row), -np.inf, seed_row)
+            while len(landmarks) < k:
+                landmark = int(np.argmax(nearest))
+                row = _distance_row(graph, landmark)
+                landmarks.append(landmark)
+                from_rows.append(row)
+                nearest = row.copy() if len(landmarks) == 1 else np.minimum(nearest, row)
+                nearest[landmarks] = -1
+    else:
+        raise ValueError(f"Unknown landmark method {method!r}; expected 'farthest' or 'random'")
+    to_rows = [_distance_row(reverse, landmark) for landmark in landmarks]
+    from_landmark = np.array(from_rows, dtype=np.float64).reshape(len(landmarks), n)
+    to_landmark = np.array(to_rows, dtype=np.float64).reshape(len(landmarks), n)
+    return LandmarkTable(graph.names, landmarks, from_landmark, to_landmark, method, graph.version)
+
+
+def landmark_table(graph: CompactGraph, source_path: str = None, k: int = DEFAULT_LANDMARKS,
+                   method: str = "farthest"):
+    """
+    Returns the landmark table of a graph, computing it only when the graph changes.
+
+    The table is cached on the graph per version. When source_path is given it
+    is also saved next to that file (source_path + ".alt.npz") and reused by
+    later runs until the file changes or a different k or method is asked for.
+
+    Parameters:
+    - graph: The CompactGraph.
+    - source_path: The file the graph was loaded from, if any.
+    - k: See compute_landmarks().
+    - method: See compute_landmarks().
+
+    Returns:
+    - The LandmarkTable.
+    """
+    def build() -> LandmarkTable:
+        table_path = source_path + ".alt.npz" if source_path else None
+        if table_path and graph.version == 0:
+            table = LandmarkTable.load(table_path, source_path)
+            if (table is not None and table.names == graph.names and len(table.landmarks) == min(k, len(graph))
+                    and table.method == method):
+                return table
+        table = compute_landmarks(graph, k, method)
+        if table_path and graph.version == 0:
+            try:
+                table.save(table_path, source_path)
+            except OSError:
+                pass
+        return table
+
+    return graph.derived(("landmarks", k, method), build)
+
+
+def inadmissible_entries(graph, h_table: Dict[str, float], goal: str) -> Dict[str, Tuple[float, float]]:
+    """
+    Finds the heuristic values that overestimate the true cost to goal.
+
+    A* is only guaranteed to return an optimal path when no entry is listed.
+
+    Parameters:
+    - graph: The graph as a dictionary or a CompactGraph.
+    - h_table: Heuristic table keyed by node name.
+    - goal: The goal node the table estimates costs to.
+
+    Returns:
+    - Mapping from each overestimating node to its (heuristic value, true cost).
+    """
+    graph = as_compact(graph)
+    dist, _ = dijkstra(graph.reverse(), graph.node_id(goal))
+    flagged = {}
+    for node, name in enumerate(graph.names):
+        estimate = h_table.get(name)
+        if estimate is not None and dist[node] is not None and estimate > dist[node]:
+            flagged[name] = (estimate, dist[node])
+    return flagged
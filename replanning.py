@@ -0,0 +1,165 @@
+import heapq
+import math
+from typing import List, Tuple
+
+from algorithms import SearchStats, _heuristic_list
+from compact_graph import as_compact
+
+
+class IncrementalPlanner:
+    """
+    Lifelong Planning A* (LPA*) between a fixed start and goal.
+
+    The planner keeps its g-values, right-hand-side values and priority queue
+    between queries. After update_edge() only the nodes whose distance the
+    change can affect are expanded again, instead of searching from scratch.
+
+    It works on its own copy of the graph, so the graph passed in (which may be
+    shared, e.g. by every Streamlit session) is never modified. Edge costs must
+    be positive: along a zero-cost cycle nodes keep vouching for each other's
+    old distances after the edge that supported them got more expensive.
+
+    Parameters:
+    - graph: The graph as a dictionary or a CompactGraph.
+    - start: The start node name.
+    - goal: The goal node name.
+    - h_table: Optional consistent heuristic (see A_star_search). It must stay
+      consistent for the edited costs too, so leave it out when costs can
+      drop below their original values; the default is zero everywhere.
+
+    Attributes:
+    - graph: The planner's copy of the graph with the current edge costs.
+    - changes: Mapping from (source, target) names to the edited costs.
+    - expanded: Total node expansions since the planner was created.
+    """
+    def __init__(self, graph, start: str, goal: str, h_table=None):
+        self.graph = as_compact(graph).copy()
+        if len(self.graph.weights) and self.graph.weights.min() <= 0:
+            raise ValueError("IncrementalPlanner needs positive edge costs")
+        self.reverse = self.graph.reverse()
+        self.start = self.graph.node_id(start)
+        self.goal = self.graph.node_id(goal)
+        n = len(self.graph)
+        self._h = _heuristic_list(self.graph, h_table, goal) if h_table is not None else [0] * n
+        self._g = [math.inf] * n
+        self._rhs = [math.inf] * n
+        self._rhs[self.start] = 0
+        self._heap = []
+        self._queued = {}
+        self.changes = {}
+        self.expanded = 0
+        self._insert(self.start)
+
+    def _key(self, node: int) -> Tuple[float, float]:
+        best = min(self._g[node], self._rhs[node])
+        return best + self._h[node], best
+
+    def _insert(self, node: int) -> None:
+        key = self._key(node)
+        self._queued[node] = key
+        heapq.heappush(self._heap, (key[0], key[1], node))
+
+    def _top_key(self) -> Tuple[float, float]:
+        """Returns the smallest queued key, dropping heap entries that were superseded."""
+        heap = self._heap
+        queued = self._queued
+        while heap and queued.get(heap[0][2]) != heap[0][:2]:
+            heapq.heappop(heap)
+        return heap[0][:2] if heap else (math.inf, math.inf)
+
+    def _update_vertex(self, node: int) -> None:
+        """Recomputes the right-hand side of a node and queues it if it became inconsistent."""
+        if node != self.start:
+            g = self._g
+            best = math.inf
+            for previous, edge_cost in self.reverse.neighbors(node):
+                candidate = g[previous] + edge_cost
+                if candidate < best:
+                    best = candidate
+            self._rhs[node] = best
+        self._queued.pop(node, None)
+        if self._g[node] != self._rhs[node]:
+            self._insert(node)
+
+    def plan(self, stats: SearchStats = None) -> Tuple[List[str], int]:
+        """
+        Brings the solution up to date with all edge changes so far.
+
+        Parameters:
+        - stats: Optional SearchStats; expanded counts only the nodes this call repaired.
+
+        Returns:
+        - Tuple of the shortest path and its cost, or ([], 0) if goal is unreachable.
+        """
+        if stats is not None:
+            stats.start()
+        g = self._g
+        rhs = self._rhs
+        goal = self.goal
+        while self._top_key() < self._key(goal) or rhs[goal] != g[goal]:
+            _, _, node = heapq.heappop(self._heap)
+            del self._queued[node]
+            self.expanded += 1
+            if g[node] > rhs[node]:
+                g[node] = rhs[node]
+            else:
+                g[node] = math.inf
+                self._update_vertex(node)
+            for next_node, _ in self.graph.neighbors(node):
+                self._update_vertex(next_node)
+            if stats is not None:
+                stats.expansion(len(self._queued))
+        if stats is not None:
+            stats.finish()
+        return self.path()
+
+    def path(self) -> Tuple[List[str], int]:
+        """
+        Reads the current shortest path off the g-values, following the best predecessor back from goal.
+
+        Returns:
+        - Tuple of the path and its cost, or ([], 0) if goal is unreachable.
+        """
+        g = self._g
+        if g[self.goal] == math.inf:
+            return [], 0
+        node = self.goal
+        path = [node]
+        on_path = {node}
+        while node != self.start:
+            best = math.inf
+            best_node = -1
+            for previous, edge_cost in self.reverse.neighbors(node):
+                candidate = g[previous] + edge_cost
+                if candidate < best and previous not in on_path:
+                    best = candidate
+                    best_node = previous
+            node = best_node
+            path.append(node)
+            on_path.add(node)
+        path.reverse()
+        names = self.graph.names
+        return [names[node] for node in path], g[self.goal]
+
+    def edge_cost(self, source: str, target: str):
+        """Returns the current cost of the edge source -> target."""
+        edge = self.graph.edge_index(self.graph.node_id(source), self.graph.node_id(target))
+        if edge == -1:
+            raise KeyError(f"No edge {source!r} -> {target!r}")
+        return self.graph.weights[edge].item()
+
+    def update_edge(self, u: str, v: str, cost) -> None:
+        """
+        Changes the cost of the edge u -> v; the next plan() repairs the solution.
+
+        Parameters:
+        - u: Name of the edge's source node.
+        - v: Name of the edge's target node.
+        - cost: The new cost, greater than 0; math.inf blocks the edge.
+        """
+        if not cost > 0:
+            raise ValueError(f"Edge costs must be positive, got {cost!r}")
+        self.graph.set_weight(u, v, cost)
+        self.reverse.set_weight(v, u, cost)
+        self.changes[(u, v)] = cost
+        self._update_vertex(self.graph.node_id(v))
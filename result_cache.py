@@ -0,0 +1,98 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable
+
+# Streamlit re-executes streamlit_app.py on every rerun but keeps imported modules,
+# so state kept here is shared by every session served by the process.
+
+
+class ResultCache:
+    """
+    Thread-safe LRU cache of search results.
+
+    When several sessions ask for the same missing key at once, only the first
+    one computes it; the others wait for its result.
+
+    Parameters:
+    - max_entries: Number of results kept before the least recently used is evicted.
+    """
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._pending = {}
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key: Hashable, compute: Callable):
+        """
+        Returns the cached value for key, computing and storing it on a miss.
+
+        Parameters:
+        - key: Hashable cache key.
+        - compute: Zero-argument callable producing the value.
+
+        Returns:
+        - The cached or freshly computed value.
+        """
+        while True:
+            with self._lock:
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return self._entries[key]
+                pending = self._pending.get(key)
+                if pending is None:
+                    pending = self._pending[key] = threading.Event()
+                    self.misses += 1
+                    break
+            # Another session is computing this key; wait for it, then look again.
+            pending.wait()
+
+        try:
+            value = compute()
+            with self._lock:
+                self._entries[key] = value
+                if len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+            return value
+        finally:
+            with self._lock:
+                del self._pending[key]
+            pending.set()
+
+    def clear(self) -> None:
+        """Drops every cached result."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def heuristics_fingerprint(heuristics: Dict[str, float]) -> str:
+    """Returns a content hash of a heuristic table, independent of key order."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr(sorted(heuristics.items())).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def result_key(graph, heuristics: Dict[str, float], algorithm: str, start: str, goal: str) -> tuple:
+    """
+    Builds the cache key of a query.
+
+    Parameters:
+    - graph: The CompactGraph searched.
+    - heuristics: The heuristic table in use.
+    - algorithm: Name of the algorithm.
+    - start: The start node.
+    - goal: The goal node.
+
+    Returns:
+    - Tuple of the graph and heuristic fingerprints, the algorithm, start and goal.
+    """
+    return graph.fingerprint(), heuristics_fingerprint(heuristics), algorithm, start, goal
+
+
+SHARED_RESULTS = ResultCache()
@@ -0,0 +1,244 @@
+import base64
+import io
+import os
+import threading
+from typing import Iterable, List
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow comes with streamlit; without it images are sent at full size
+    Image = None
+
+# Like result_cache, the registry is created once per process and shared by every session.
+
+# Position names of the roadmap stations, by node name.
+STATION_NAMES = {
+    "A": "Industry",
+    "B": "Grad School",
+    "C": "Professor Job",
+    "D": "Government",
+    "E": "Entrepreneur",
+    "R": "Retirement",
+    "S": "SQU"
+}
+
+# Largest side in pixels of a downscaled image: the 6rem (96px) display size at 2x for high-DPI screens.
+DISPLAY_SIDE = 192
+
+
+class AssetRegistry:
+    """
+    Station images loaded and base64-encoded once, ready to paste into the path page.
+
+    The images of the given node names are read when the registry is created,
+    any other node's on first use. Images larger than max_side are shrunk to it
+    when Pillow is available, which cuts the payload of every page that shows them.
+
+    Parameters:
+    - directory: Folder holding <node name in lower case>.png files.
+    - max_side: Longest side in pixels kept after downscaling; None keeps the original files.
+    - names: Node names whose images are loaded up front.
+
+    Attributes:
+    - encoded: Base64 PNG data by lower-case node name.
+    - original_bytes: Total size of the image files read.
+    - encoded_bytes: Total size of the base64 data kept.
+    """
+    def __init__(self, directory: str = "img", max_side: int = DISPLAY_SIDE, names: Iterable[str] = STATION_NAMES):
+        self.directory = directory
+        self.max_side = max_side
+        self.encoded = {}
+        self.original_bytes = 0
+        self.encoded_bytes = 0
+        self._lock = threading.Lock()
+        for name in names:
+            self._load(name.lower())
+
+    def _load(self, stem: str) -> str:
+        """Reads, optionally downscales and encodes one image; returns its base64 data ("" if missing)."""
+        try:
+            with open(os.path.join(self.directory, f"{stem}.png"), "rb") as file:
+                data = file.read()
+        except OSError:
+            return ""
+        size = len(data)
+        data = _downscaled(data, self.max_side)
+        encoded = base64.b64encode(data).decode()
+        with self._lock:
+            self.encoded[stem] = encoded
+            self.original_bytes += size
+            self.encoded_bytes += len(encoded)
+        return encoded
+
+    def image_data(self, name: str) -> str:
+        """
+        Returns the base64 PNG data of a node's image.
+
+        Parameters:
+        - name: The node name; its image is <name in lower case>.png.
+
+        Returns:
+        - The data, or "" when the node has no image.
+        """
+        stem = name.lower()
+        encoded = self.encoded.get(stem)
+        if encoded is None:
+            # Images added after startup are picked up on first use
+            encoded = self._load(stem)
+        return encoded
+
+
+def _downscaled(data: bytes, max_side: int) -> bytes:
+    """Shrinks a PNG so neither side exceeds max_side, keeping the original when that saves nothing."""
+    if Image is None or max_side is None:
+        return data
+    try:
+        with Image.open(io.BytesIO(data)) as image:
+            if max(image.size) <= max_side:
+                return data
+            image.thumbnail((max_side, max_side), Image.LANCZOS)
+            output = io.BytesIO()
+            image.save(output, format="PNG", optimize=True)
+    except OSError:
+        return data
+    smaller = output.getvalue()
+    return smaller if len(smaller) < len(data) else data
+
+
+STATION_ASSETS = AssetRegistry()
+
+_ITEM_TEMPLATE = """
+            <li>
+                <div class="content">
+                    {image_element}
+                    <p>{position}</p>
+                </div>
+            </li>
+            """
+
+_PAGE_TEMPLATE = """
+    <!DOCTYPE html>
+    <html lang="en">
+        <head>
+            <meta charset="UTF-8" />
+            <meta name="viewport" content="width=device-width, initial-scale=1.0" />
+            <title>Document</title>
+            <link rel="stylesheet" href="try.css" />
+            <style>
+                .path-bar {
+                    position: absolute;
+                    top: 0; /* Updated to display content at the top */
+                    left: 0; /* Updated to display content at the left */
+                }
+                .path-bar ul {
+                    padding-left: 50px;
+                    position: relative;
+                    list-style-type: none;
+                }
+                .path-bar ul::after {
+                    content: "";
+                    position: absolute;
+                    background: #31333F;
+                    width: 3px;
+                    height: <path_len>rem;
+                    top: 0;
+                    left: 40px;
+                    margin-top: 3rem;
+                    z-index: -1;
+                }
+                .path-bar ul li {
+                    text-decoration: none;
+                    margin-bottom: 1rem;
+                }
+                .path-bar ul li .content {
+                    display: flex;
+                    flex-direction: row;
+                    gap: 0, 5rem;
+                    text-align: center;
+                    align-items: center;
+                    align-content: center;
+                }
+                .path-bar ul li img {
+                    width: 6rem;
+                    height: 6rem;
+                }
+                .path-bar ul li p {
+                    text-decoration: none;
+                    position: relative;
+                    color: #FF4B4B;
+                    font-size: 1.5rem;
+                    line-height: 1rem;
+                    font-weight: 500;
+                }
+                .path-bar ul li .content::before {
+                    content: "";
+                    position: absolute;
+                    background: #31333F;
+                    width: 18px;
+                    height: 18px;
+                    left: 33px;
+                    border-radius: 50px;
+                }
+            </style>
+        </head>
+        <body>
+            <div class="path-bar">
+                <ul>
+                    <items>
+                </ul>
+            </div>
+        </body>
+    </html>
+    """
+
+# The page split once around its two variable parts: the line height and the list items.
+_PAGE_HEAD, _, _rest = _PAGE_TEMPLATE.partition("<path_len>")
+_PAGE_MIDDLE, _, _PAGE_TAIL = _rest.partition("<items>")
+
+
+# List items of the stations with an image. Nodes without one are not kept, so an
+# image added later still shows up, and the dict stays as small as the image folder.
+_path_items = {}
+
+
+def path_item(name: str) -> str:
+    """
+    Returns the HTML list item of one station, built once per node name that has an image.
+
+    Parameters:
+    - name: The node name.
+
+    Returns:
+    - The <li> fragment with the station's image (if any) and position name.
+    """
+    item = _path_items.get(name)
+    if item is not None:
+        return item
+    position = STATION_NAMES.get(name, name)
+    encoded = STATION_ASSETS.image_data(name)
+    if not encoded:
+        return _ITEM_TEMPLATE.format(image_element="", position=position)
+    if position == "SQU":
+        style_attribute = 'style="width: 6rem; height: 5rem;"'
+    else:
+        style_attribute = ''
+    image_element = f'<img src="data:image/png;base64,{encoded}" alt="Your Image" {style_attribute}>'
+    item = _path_items[name] = _ITEM_TEMPLATE.format(image_element=image_element, position=position)
+    return item
+
+
+def path_page(path: List[str]) -> str:
+    """
+    Renders the page showing a path, joining the cached fragments.
+
+    Parameters:
+    - path: List of node names in the path.
+
+    Returns:
+    - The HTML document.
+    """
+    if len(path) > 3:
+        path_len = (len(path) - 1) * 6 + 5
+    else:
+        path_len = (len(path) - 1) * 6 + 1
+    return "".join([_PAGE_HEAD, str(path_len), _PAGE_MIDDLE, *map(path_item, path), _PAGE_TAIL])
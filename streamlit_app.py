@@ -1,133 +1,32 @@
 import streamlit as st
-import base64
+import argparse
+import os
+import sys
+import time
+import numpy as np
 from algorithms import *  
+from all_pairs import all_pairs_table
+from result_cache import SHARED_RESULTS, heuristics_fingerprint, result_key
+from graph_loader import add_graph_arguments, load_graph, load_heuristics
+from landmarks import DEFAULT_LANDMARKS, inadmissible_entries, landmark_table
+from replanning import IncrementalPlanner
+from station_assets import path_page
+
+# Frontier entries shown while a search is animated.
+FRONTIER_ROWS = 8
 
 
 def display_streamlit_path(path):
     """
     Display the path in a Streamlit app with associated images.
 
+    The images and the page around them are prepared once per process by
+    station_assets, so a render only joins cached fragments.
+
     Parameters:
     - path (list): List of positions in the path.
     """
-    names = {
-        "A": "Industry",
-        "B": "Grad School",
-        "C": "Professor Job",
-        "D": "Government",
-        "E": "Entrepreneur",
-        "R": "Retirement",
-        "S": "SQU"
-    }
-    base64_img = []
-    html_img_elements = []
-
-    for i in path:
-        position = names[i]
-        i = i.lower()
-        
-        # Convert the PNG image to base64 format for displaying in HTML
-        with open(f"img/{i}.png", "rb") as file:
-            image_data = file.read()
-        base64_img = base64.b64encode(image_data).decode()
-
-        if position == "SQU":
-            style_attribute = 'style="width: 6rem; height: 5rem;"'
-        else:
-            style_attribute = ''
-
-        # Construct the HTML code for the image element
-        html_code = f"""
-            <li>
-                <div class="content">
-                    <img src="data:image/png;base64,{base64_img}" alt="Your Image" {style_attribute}>
-                    <p>{position}</p>
-                </div>
-            </li>
-            """
-        html_img_elements.append(html_code)
-    if len(path) > 3:
-        path_len = (len(path) - 1) * 6 + 5
-    else:
-        path_len = (len(path) - 1) * 6 + 1
-
-    # HTML code for the entire document
-    html_code = f"""
-    <!DOCTYPE html>
-    <html lang="en">
-        <head>
-            <meta charset="UTF-8" />
-            <meta name="viewport" content="width=device-width, initial-scale=1.0" />
-            <title>Document</title>
-            <link rel="stylesheet" href="try.css" />
-            <style>
-                .path-bar {{
-                    position: absolute;
-                    top: 0; /* Updated to display content at the top */
-                    left: 0; /* Updated to display content at the left */
-                }}
-                .path-bar ul {{
-                    padding-left: 50px;
-                    position: relative;
-                    list-style-type: none;
-                }}
-                .path-bar ul::after {{
-                    content: "";
-                    position: absolute;
-                    background: #31333F;
-                    width: 3px;
-                    height: {path_len}rem;
-                    top: 0;
-                    left: 40px;
-                    margin-top: 3rem;
-                    z-index: -1;
-                }}
-                .path-bar ul li {{
-                    text-decoration: none;
-                    margin-bottom: 1rem;
-                }}
-                .path-bar ul li .content {{
-                    display: flex;
-                    flex-direction: row;
-                    gap: 0, 5rem;
-                    text-align: center;
-                    align-items: center;
-                    align-content: center;
-                }}
-                .path-bar ul li img {{
-                    width: 6rem;
-                    height: 6rem;
-                }}
-                .path-bar ul li p {{
-                    text-decoration: none;
-                    position: relative;
-                    color: #FF4B4B;
-                    font-size: 1.5rem;
-                    line-height: 1rem;
-                    font-weight: 500;
-                }}
-                .path-bar ul li .content::before {{
-                    content: "";
-                    position: absolute;
-                    background: #31333F;
-                    width: 18px;
-                    height: 18px;
-                    left: 33px;
-                    border-radius: 50px;
-                }}
-            </style>
-        </head>
-        <body>
-            <div class="path-bar">
-                <ul>
-                    {''.join(html_img_elements)}
-                </ul>
-            </div>
-        </body>
-    </html>
-    """
-
-    st.components.v1.html(html_code, width=500, height=113*len(path), scrolling=True)
+    st.components.v1.html(path_page(path), width=500, height=113*len(path), scrolling=True)
     
 def generate_description(optimal_path: list) -> str:
     """
@@ -155,41 +54,219 @@ def generate_description(optimal_path: list) -> str:
     for i in range(0, len(optimal_path)):
         node = optimal_path[i]
         if i >= 0:
-            journey.append(descriptions[node])
+            journey.append(descriptions.get(node, node))
     description += " ".join(journey)
 
     return description 
 
 
+def parse_args(argv=None) -> argparse.Namespace:
+    """
+    Parses the script options, passed after "--" on the streamlit command line.
+
+    Parameters:
+    - argv: Argument list; defaults to sys.argv[1:].
+
+    Returns:
+    - The parsed options.
+    """
+    parser = argparse.ArgumentParser(description="Future Options Explorer (Streamlit)")
+    add_graph_arguments(parser)
+    return parser.parse_known_args(sys.argv[1:] if argv is None else argv)[0]
+
+
+def file_stamps(*paths) -> tuple:
+    """Returns the (size, mtime) of each file, so cached inputs are reloaded when one changes."""
+    return tuple((os.stat(path).st_size, os.stat(path).st_mtime_ns) for path in paths)
+
+
+@st.cache(allow_output_mutation=True, show_spinner=False)
+def load_inputs(graph_path: str, heuristics_path: str, stamps: tuple):
+    """
+    Loads the graph and heuristics once per file version, shared by every session.
+
+    Parameters:
+    - graph_path: The graph file.
+    - heuristics_path: The heuristic table file.
+    - stamps: file_stamps() of both files; part of the cache key only.
+
+    Returns:
+    - Tuple of the graph and the heuristic table.
+    """
+    return load_graph(graph_path), load_heuristics(heuristics_path)
+
+
+def display_search_stats(stats):
+    """
+    Shows the counters of the search that produced the displayed path.
+
+    Parameters:
+    - stats: The SearchStats of the search, or None when the path came from the all-pairs table.
+    """
+    if stats is None:
+        st.markdown("📋 Looked up in the precomputed all-pairs table; no search was run.")
+        return
+    counters = [("Nodes expanded", stats.expanded), ("Nodes generated", stats.generated),
+                ("Duplicate pushes", stats.duplicates), ("Largest frontier", stats.max_frontier),
+                ("Heuristic evaluations", stats.evaluations or None)]
+    lines = "".join(f"\n        - {label}: {value}" for label, value in counters if value is not None)
+    st.markdown(f"""
+        **📊 Search stats**{lines}
+        - Search time: {stats.expand_seconds * 1000:.2f} ms
+        """)
+
+
+def animate_search(step_function, args, delay: float):
+    """
+    Runs a search step by step, redrawing the node being expanded and the frontier after every step.
+
+    Parameters:
+    - step_function: The step generator of the chosen algorithm (see STEP_FUNCTIONS).
+    - args: Its graph, start, goal and, for heuristic searches, heuristic arguments.
+    - delay: Seconds to pause after each step.
+
+    Returns:
+    - Tuple of the path, its cost and the SearchStats of the search.
+    """
+    stats = SearchStats()
+    progress = st.empty()
+    path, cost = [], 0
+    step = 0
+    for event in step_function(*args, stats=stats):
+        if isinstance(event, GoalFound):
+            path, cost = event.path, event.cost
+        elif isinstance(event, Expand):
+            step += 1
+            frontier = event.frontier_paths(limit=FRONTIER_ROWS)
+            rows = "\n".join(f"- {' → '.join(entry) or '(start)'}" for entry in frontier)
+            progress.markdown(f"**Step {step}:** expanding {' → '.join(event.path)}\n\n"
+                              f"Frontier:\n{rows or '(empty)'}")
+            time.sleep(delay)
+    progress.empty()
+    return path, cost, stats
+
+
+def display_heuristic_warning(graph, heuristics, goal):
+    """
+    Warns when the heuristic table overestimates the cost to the goal.
+
+    Parameters:
+    - graph: The loaded graph.
+    - heuristics: The heuristic table keyed by node name.
+    - goal: The goal node.
+    """
+    if goal not in graph:
+        return
+    # Checked once per graph version and heuristic table, not on every rerun
+    flagged = graph.derived(("inadmissible", heuristics_fingerprint(heuristics), goal),
+                            lambda: inadmissible_entries(graph, heuristics, goal))
+    if flagged:
+        entries = ", ".join(f"{node} ({estimate} > {cost})" for node, (estimate, cost) in flagged.items())
+        st.warning(f"The heuristic overestimates the remaining years at {entries}, so A* may miss the "
+                   "shortest journey. Tick the landmark option for an estimate that never overestimates.")
+
+
+def display_comparison_panel(graph, heuristics, start, goal):
+    """
+    Runs the algorithms side by side in worker processes and fills one table as they finish.
+
+    Each algorithm has its own time limit, and a failing or slow one only marks
+    its own row. Any click while the comparison runs reruns the app, which
+    closes the comparison and stops the searches still running.
+
+    Parameters:
+    - graph: The loaded (shared) graph.
+    - heuristics: The heuristic table used by the heuristic algorithms.
+    - start: The start node.
+    - goal: The goal node.
+    """
+    st.subheader("⚖️ Compare all algorithms")
+    timeout = st.number_input("Seconds allowed per algorithm", min_value=0.5, value=5.0, step=0.5)
+    if not st.button("Compare"):
+        return
+    table = st.empty()
+    rows = []
+    for row in compare_algorithms(graph, start, goal, heuristics, timeout=timeout):
+        title = ALGORITHM_TITLES.get(row["algorithm"], row["algorithm"])
+        if "error" in row:
+            rows.append({"Algorithm": title, "Path": row["error"], "Years": "", "Expanded": "", "Time (ms)": ""})
+        else:
+            rows.append({"Algorithm": title, "Path": " → ".join(row["path"]) or "no path", "Years": row["cost"],
+                         "Expanded": row["expanded"], "Time (ms)": f"{row['seconds'] * 1000:.2f}"})
+        table.table(rows)
+
+
+def display_top_journeys(graph, start, goal):
+    """
+    Lists the k cheapest journeys (see k_shortest_paths), cheapest first.
+
+    Parameters:
+    - graph: The loaded (shared) graph.
+    - start: The start node.
+    - goal: The goal node.
+    """
+    st.subheader("🔀 Your top journeys")
+    k = int(st.number_input("How many journeys?", min_value=1, max_value=50, value=5, step=1))
+    journeys = k_shortest_paths(graph, start, goal, k)
+    if not journeys:
+        st.markdown(f"There is no journey from {start} to {goal}.")
+        return
+    rows = "\n".join(f"{rank}. {' → '.join(path)}: **{cost} years**"
+                     for rank, (path, cost) in enumerate(journeys, 1))
+    st.markdown(rows)
+
+
+def display_what_if_panel(graph, start, goal):
+    """
+    Lets the user change edge costs and replans incrementally with the session's IncrementalPlanner.
+
+    The planner works on its own copy of the shared graph, so edits stay private
+    to the session, and each edit only repairs the part of the search it affects.
+
+    Parameters:
+    - graph: The loaded (shared) graph.
+    - start: The start node.
+    - goal: The goal node.
+    """
+    st.subheader("🔧 What if a step took a different number of years?")
+    planner_key = (graph.fingerprint(), start, goal)
+    reset = st.button("Reset changes")
+    if reset or st.session_state.get("planner_key") != planner_key:
+        try:
+            st.session_state.planner = IncrementalPlanner(graph, start, goal)
+        except ValueError as e:
+            st.markdown(f"Replanning is not available for this graph: {e}")
+            return
+        st.session_state.planner_key = planner_key
+    planner = st.session_state.planner
+
+    sources = [graph.names[node] for node in np.flatnonzero(np.diff(graph.offsets)).tolist()]
+    source = st.selectbox("From", sources)
+    targets = [graph.names[target] for target, _ in graph.neighbors(graph.node_id(source))]
+    target = st.selectbox("To", targets)
+    current = planner.edge_cost(source, target)
+    new_cost = st.number_input("Years for this step", min_value=0.01, value=float(current), step=1.0)
+    if st.button("Apply change"):
+        planner.update_edge(source, target, int(new_cost) if float(new_cost).is_integer() else new_cost)
+
+    stats = SearchStats()
+    path, cost = planner.plan(stats)
+    if planner.changes:
+        changes = ", ".join(f"{u} → {v}: {c}" for (u, v), c in planner.changes.items())
+        st.markdown(f"Changed steps: {changes}")
+    display_streamlit_path(path)
+    st.markdown(f"<h6>🕒 With these changes the journey takes {cost} years "
+                f"(replanned by revisiting {stats.expanded} of {len(graph)} stations)</h6>", unsafe_allow_html=True)
+
+
 def main():
     """
     Main function to create the Streamlit app.
     """
-    A = "A"
-    B = "B"
-    C = "C"
-    D = "D"
-    E = "E"
-    S = "S"
-    R = "R"
-    graph = {
-        A: {B: 2, R: 30},
-        B: {A: 1, C: 12, D: 3, E: 3},
-        C: {D: 6, E: 2},
-        D: {E: 5, R: 21},
-        E: {R: 40},
-        S: {A: 5, B: 8, D: 4, E: 1},
-        R: {}
-    }
-    heuristics = {
-        A: 40,
-        B: 30,
-        C: 30,
-        D: 35,
-        E: 2,
-        S: 25,
-        R: 0
-    }
+    args = parse_args()
+    graph, heuristics = load_inputs(args.graph, args.heuristics, file_stamps(args.graph, args.heuristics))
+    S = args.start
+    R = args.goal
   
     st.header("🚀 The Future Options Explorer!")
     st.markdown("Embark on a journey from SQU graduation to retirement with our interactive tool! Discover your path through various search algorithms and unlock thrilling opportunities ahead! ✨🔍")
@@ -201,33 +278,68 @@ def main():
 
     st.markdown("---")
     st.subheader("💡 Choose an algorithm to unveil your path:")
-    algorithm_choices = ["Depth-First Search (DFS)",
-                    "Breadth-First Search (BFS)",
-                    "Uninformed Cost Search",
-                    "A* Search",
-                    "Hill Climbing"]
+    algorithm_choices = list(ALGORITHM_TITLES.values())
     chosen_algorithm = st.radio("", algorithm_choices)
+    use_landmarks = st.checkbox("Use landmark (ALT) estimates for A* and Hill Climbing", value=bool(args.landmarks))
+    if use_landmarks:
+        h_source = landmark_table(graph, args.graph, args.landmarks or DEFAULT_LANDMARKS)
+    else:
+        h_source = heuristics
+        display_heuristic_warning(graph, heuristics, R)
+    animate = st.checkbox("Animate the search step by step")
+    delay = st.slider("Seconds per step", 0.0, 2.0, 0.5) if animate else 0.0
     if st.button("Begin Journey🔍"):
         st.write(chosen_algorithm)
 
         # Call the appropriate algorithm function based on the user's selection
-        algorithm_functions = {
-            "Depth-First Search (DFS)": (DFS, graph, S, R),
-            "Breadth-First Search (BFS)": (BFS, graph, S, R),
-            "Uninformed Cost Search": (Uninformed_cost_search, graph, S, R),
-            "A* Search": (A_star_search, graph, S, R, heuristics),
-            "Hill Climbing": (hill_climbing, graph, S, R, heuristics)
-        }
+        algorithm_functions = {}
+        for name, title in ALGORITHM_TITLES.items():
+            func = ALGORITHMS[name]
+            extra = (h_source,) if func in HEURISTIC_ALGORITHMS else ()
+            algorithm_functions[title] = (func, graph, S, R) + extra
 
         # Call the selected algorithm function and display the path
         algorithm_function = algorithm_functions[chosen_algorithm]
         func , *arg = algorithm_function
-        path , cost , frontier_states = func(*arg)
-        display_streamlit_path(path)
+
+        def run_search():
+            # Shortest-path queries are table lookups; the table is only rebuilt when the graph file changes
+            table = all_pairs_table(graph, args.graph) if func is Uninformed_cost_search else None
+            if table is not None:
+                path , cost = table.query(S, R)
+                return path , cost , None
+            stats = SearchStats()
+            path , cost , frontier_states = func(*arg, trace="off", stats=stats)
+            return path , cost , stats
+
+        step_function = STEP_FUNCTIONS.get(func)
+        if animate and step_function is not None:
+            path , cost , stats = animate_search(step_function, arg, delay)
+        else:
+            if animate:
+                st.markdown("This algorithm reports no steps; showing its result directly.")
+            # Results are shared by every session, keyed on the graph and heuristic contents
+            algorithm_key = chosen_algorithm + (" (landmarks)" if use_landmarks else "")
+            key = result_key(graph, heuristics, algorithm_key, S, R)
+            path , cost , stats = SHARED_RESULTS.get_or_compute(key, run_search)
+        path_column, stats_column = st.columns([3, 1])
+        with path_column:
+            display_streamlit_path(path)
+        with stats_column:
+            display_search_stats(stats)
 
         # Display the description of the journey
         description = generate_description(path)
         st.markdown("<h6>🧭 " + description + "</h6>", unsafe_allow_html=True)
         st.markdown(f"<h6>🕒 This journey will take {cost} years to be completed</h6>", unsafe_allow_html=True)
 
+    st.markdown("---")
+    display_top_journeys(graph, S, R)
+
+    st.markdown("---")
+    display_comparison_panel(graph, h_source, S, R)
+
+    st.markdown("---")
+    display_what_if_panel(graph, S, R)
+
 main()  
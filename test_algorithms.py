@@ -0,0 +1,355 @@
+import os
+import random
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import all_pairs
+import landmarks
+import station_assets
+from algorithms import (BFS, DFS, HEURISTIC_ALGORITHMS, IDA_star_search, STEP_FUNCTIONS, SearchStats,
+                        Uninformed_cost_search, Uninformed_cost_search_steps, bidirectional_UCS,
+                        hill_climbing, iterative_deepening_DFS, k_shortest_paths, restart_hill_climbing,
+                        run_batch, run_steps, shortest_path_tree)
+from all_pairs import all_pairs_table, compute_all_pairs, floyd_warshall, repeated_dijkstra
+from compact_graph import as_compact
+from console_main import main as console_main
+from graph_loader import load_graph
+from landmarks import compute_landmarks, inadmissible_entries, landmark_table
+from replanning import IncrementalPlanner
+from station_assets import AssetRegistry, path_item
+from trace_file import TraceReader, TraceWriter, save_trace
+
+# The built-in roadmap from S (SQU) to R (Retirement), costs in years.
+ROADMAP = {
+    "A": {"B": 2, "R": 30},
+    "B": {"A": 1, "C": 12, "D": 3, "E": 3},
+    "C": {"D": 6, "E": 2},
+    "D": {"E": 5, "R": 21},
+    "E": {"R": 40},
+    "S": {"A": 5, "B": 8, "D": 4, "E": 1},
+    "R": {},
+}
+
+# The built-in heuristic: estimated years left to R.
+ROADMAP_HEURISTICS = {"A": 40, "B": 30, "C": 30, "D": 35, "E": 2, "S": 25, "R": 0}
+
+ROADMAP_CSV = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "roadmap.csv")
+
+
+def random_graph(seed, nodes=8, edges=20, max_cost=4):
+    """A small random directed graph; low costs make tied paths common."""
+    rng = random.Random(seed)
+    names = [f"n{i}" for i in range(nodes)]
+    graph = {name: {} for name in names}
+    for _ in range(edges):
+        u, v = rng.sample(names, 2)
+        graph[u][v] = rng.randint(1, max_cost)
+    return graph
+
+
+def test_bfs_roadmap():
+    path, cost, _ = BFS(ROADMAP, "S", "R")
+    assert (path, cost) == (["S", "A", "R"], 35)
+
+
+def test_bfs_visited_on_enqueue_roadmap():
+    path, cost, _ = BFS(ROADMAP, "S", "R", visited_on_enqueue=True)
+    assert (path, cost) == (["S", "A", "R"], 35)
+
+
+def test_dfs_roadmap():
+    path, cost, _ = DFS(ROADMAP, "S", "R")
+    assert (path, cost) == (["S", "E", "R"], 41)
+
+
+def test_roadmap_file_matches_builtin_graph():
+    graph = load_graph(ROADMAP_CSV, use_cache=False)
+    assert BFS(graph, "S", "R", trace="off")[:2] == (["S", "A", "R"], 35)
+    assert DFS(graph, "S", "R", trace="off")[:2] == (["S", "E", "R"], 41)
+
+
+def test_batch_reports_malformed_queries():
+    queries = [{"start": "S", "goal": "R"}, {"start": "S"}, ValueError("bad line"), ("S", "R")]
+    results = list(run_batch(ROADMAP, queries, "bfs", chunksize=2))
+    assert [result["index"] for result in results] == [0, 1, 2, 3]
+    assert results[0]["path"] == results[3]["path"] == ["S", "A", "R"]
+    assert "error" in results[1] and "error" in results[2]
+
+
+def test_interleaved_batches_keep_their_own_graph():
+    other = {"S": {"R": 1}, "R": {}}
+    first = run_batch(ROADMAP, [("S", "R")] * 3, "ucs", chunksize=1)
+    second = run_batch(other, [("S", "R")] * 3, "bfs", chunksize=1)
+    for _ in range(3):
+        assert next(first)["cost"] == 25
+        assert next(second)["cost"] == 1
+    first.close()
+    assert [result["path"] for result in second] == []
+    with ThreadPoolExecutor(4) as pool:
+        batches = pool.map(lambda graph: [result["cost"] for result in run_batch(graph, [("S", "R")] * 50, "ucs")],
+                           [ROADMAP, other] * 4)
+        assert list(batches) == [[25] * 50, [1] * 50] * 4
+
+
+def test_bidirectional_ucs_breaks_ties_like_ucs():
+    graph = {"n0": {"n4": 2, "n3": 3, "n1": 3, "n2": 3}, "n1": {"n5": 1}, "n2": {}, "n3": {"n2": 1, "n0": 2},
+             "n4": {"n3": 1, "n2": 3, "n1": 3, "n5": 2}, "n5": {"n0": 3, "n2": 3}}
+    expected = Uninformed_cost_search(graph, "n0", "n5", trace="off")[:2]
+    assert expected == (["n0", "n4", "n5"], 4)
+    assert bidirectional_UCS(graph, "n0", "n5")[:2] == expected
+
+
+def test_restart_hill_climbing_respects_evaluation_budget():
+    stats = SearchStats()
+    restart_hill_climbing(ROADMAP, "S", "R", ROADMAP_HEURISTICS, trace="off", stats=stats, restarts=32,
+                          max_evaluations=10, time_budget=None)
+    assert 0 < stats.evaluations <= 10
+    assert stats.generated is None and "generated" not in str(stats)
+
+
+def test_restart_hill_climbing_in_threads():
+    def climb(seed):
+        return restart_hill_climbing(ROADMAP, "S", "R", ROADMAP_HEURISTICS, trace="off", restarts=64,
+                                     time_budget=None, seed=seed)[:2]
+
+    expected = [climb(seed) for seed in range(16)]
+    with ThreadPoolExecutor(8) as pool:
+        for _ in range(4):
+            assert list(pool.map(climb, range(16))) == expected
+
+
+@pytest.mark.parametrize("block_steps", [1, 2, 3, 1024])
+def test_trace_file_round_trip(tmp_path, block_steps):
+    trace_path = str(tmp_path / "search.fgt")
+    h_table = {f"n{i}": 0 for i in range(8)}
+    for graph, start, goal, heuristics in [(ROADMAP, "S", "R", ROADMAP_HEURISTICS)] + \
+            [(random_graph(seed), "n0", "n5", h_table) for seed in range(10)]:
+        for func, steps in STEP_FUNCTIONS.items():
+            if func is hill_climbing:
+                continue
+            args = (graph, start, goal, heuristics) if func in HEURISTIC_ALGORITHMS else (graph, start, goal)
+            with TraceWriter(trace_path, block_steps) as writer:
+                path, cost, states = run_steps(writer.tee(steps(*args)), "full")
+            delta = run_steps(steps(*args), "delta")[2]
+            with TraceReader(trace_path) as trace:
+                assert trace.steps == delta.steps
+                assert list(trace) == states
+                assert [trace.snapshot(step) for step in range(trace.steps)] == \
+                       [delta.snapshot(step) for step in range(delta.steps)]
+                if path:
+                    assert trace.path(trace.goal) == path
+                else:
+                    assert trace.goal == -1
+
+
+def test_replay_reports_bad_traces_and_steps(tmp_path, capsys):
+    trace_path = str(tmp_path / "search.fgt")
+    save_trace(Uninformed_cost_search_steps(ROADMAP, "S", "R"), trace_path)
+    console_main(["--replay", trace_path, "--step", "0"])
+    assert "Frontier after step 0:" in capsys.readouterr().out
+    corrupt = tmp_path / "corrupt.fgt"
+    corrupt.write_bytes(b"not a trace")
+    empty = tmp_path / "empty.fgt"
+    empty.write_bytes(b"")
+    for argv in (["--replay", trace_path, "--step", "1000"], ["--replay", str(tmp_path / "missing.fgt")],
+                 ["--replay", str(corrupt)], ["--replay", str(empty)]):
+        with pytest.raises(SystemExit) as exit_info:
+            console_main(argv)
+        assert str(exit_info.value.code).startswith("Cannot replay trace:")
+    with pytest.raises(SystemExit):
+        console_main(["--replay", trace_path, "--step", "-1"])
+
+
+def path_cost(graph, path):
+    return sum(graph[u][v] for u, v in zip(path, path[1:]))
+
+
+def test_incremental_planner_matches_fresh_search():
+    for seed in range(30):
+        graph = random_graph(seed, edges=24)
+        edges = [(u, v) for u in graph for v in graph[u]]
+        planner = IncrementalPlanner(graph, "n0", "n5")
+        rng = random.Random(seed)
+        for _ in range(8):
+            u, v = rng.choice(edges)
+            cost = rng.choice([float("inf"), 1, graph[u][v] + 3, max(1, graph[u][v] - 2)])
+            planner.update_edge(u, v, cost)
+            graph[u][v] = cost
+            path, cost = planner.plan()
+            reachable = {u: {v: c for v, c in targets.items() if c != float("inf")} for u, targets in graph.items()}
+            expected_path, expected_cost, _ = Uninformed_cost_search(reachable, "n0", "n5", trace="off")
+            assert cost == expected_cost
+            assert bool(path) == bool(expected_path)
+            if path:
+                assert (path[0], path[-1]) == ("n0", "n5") and path_cost(graph, path) == cost
+                assert planner.edge_cost(path[0], path[1]) == graph[path[0]][path[1]]
+
+
+def test_incremental_planner_rejects_non_positive_costs():
+    planner = IncrementalPlanner(ROADMAP, "S", "R")
+    for cost in (0, -1, float("nan")):
+        with pytest.raises(ValueError):
+            planner.update_edge("S", "A", cost)
+    assert planner.edge_cost("S", "A") == 5
+    with pytest.raises(ValueError):
+        IncrementalPlanner({"S": {"R": 0}, "R": {}}, "S", "R")
+
+
+def simple_path_costs(graph, start, goal):
+    """Costs of every loopless path from start to goal, cheapest first, by brute force."""
+    costs = []
+
+    def extend(node, visited, cost):
+        if node == goal:
+            costs.append(cost)
+            return
+        for next_node, edge_cost in graph[node].items():
+            if next_node not in visited:
+                extend(next_node, visited | {next_node}, cost + edge_cost)
+
+    extend(start, {start}, 0)
+    return sorted(costs)
+
+
+def test_k_shortest_paths_match_brute_force():
+    for seed in range(200):
+        graph = random_graph(seed, nodes=random.Random(seed).randint(2, 7), max_cost=3)
+        names = sorted(graph)
+        start, goal = names[0], names[-1]
+        expected = simple_path_costs(graph, start, goal)
+        for k in (1, 3, len(expected) + 2):
+            found = k_shortest_paths(graph, start, goal, k)
+            assert [cost for _, cost in found] == expected[:k]
+            assert len({tuple(path) for path, _ in found}) == len(found)
+            for path, cost in found:
+                assert (path[0], path[-1]) == (start, goal) and len(set(path)) == len(path)
+                assert path_cost(graph, path) == cost
+
+
+def ucs_cost(graph, start, goal):
+    path, cost, _ = Uninformed_cost_search(graph, start, goal, trace="off")
+    return cost if path else float("inf")
+
+
+@pytest.mark.parametrize("method", ["floyd", "dijkstra"])
+def test_all_pairs_match_ucs(method):
+    for seed in range(20):
+        graph = random_graph(seed)
+        names = list(graph)
+        dist, _ = floyd_warshall(graph) if method == "floyd" else repeated_dijkstra(graph)
+        table = compute_all_pairs(graph, method)
+        for start in names:
+            for goal in names:
+                expected = ucs_cost(graph, start, goal)
+                assert dist[names.index(start), names.index(goal)] == expected
+                path, cost = table.query(start, goal)
+                if expected == float("inf"):
+                    assert path == []
+                else:
+                    assert (path[0], path[-1], cost) == (start, goal, expected)
+                    assert path_cost(graph, path) == cost
+
+
+def test_all_pairs_table_reloads_until_the_graph_file_changes(tmp_path, monkeypatch):
+    graph_path = str(tmp_path / "roadmap.csv")
+    shutil.copy(ROADMAP_CSV, graph_path)
+    table = all_pairs_table(load_graph(graph_path, use_cache=False), graph_path)
+    assert os.path.exists(graph_path + ".apsp.npz")
+    assert table.query("S", "R") == (["S", "D", "R"], 25)
+
+    def no_compute(*args):
+        raise AssertionError("the saved table should have been reused")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(all_pairs, "compute_all_pairs", no_compute)
+        assert all_pairs_table(load_graph(graph_path, use_cache=False), graph_path).query("S", "R") == \
+               (["S", "D", "R"], 25)
+
+    with open(graph_path) as file:
+        text = file.read()
+    with open(graph_path, "w") as file:
+        file.write(text.replace("D,R,21", "D,R,99"))
+    stat = os.stat(graph_path)
+    os.utime(graph_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert all_pairs_table(load_graph(graph_path, use_cache=False), graph_path).query("S", "R") == \
+           (["S", "A", "R"], 35)
+
+
+def test_shortest_path_tree_answers_like_ucs():
+    for seed in range(20):
+        graph = random_graph(seed)
+        compact = as_compact(graph)
+        for start in graph:
+            for goal in graph:
+                path, cost, _ = Uninformed_cost_search(compact, start, goal, one_to_all=True)
+                expected = ucs_cost(graph, start, goal)
+                if expected == float("inf"):
+                    assert (path, cost) == ([], 0)
+                else:
+                    assert (path[0], path[-1], cost) == (start, goal, expected)
+                    assert path_cost(graph, path) == cost
+
+
+def test_shortest_path_tree_is_rebuilt_after_set_weight():
+    graph = as_compact(ROADMAP)
+    tree = shortest_path_tree(graph, "S")
+    assert shortest_path_tree(graph, "S") is tree
+    assert Uninformed_cost_search(graph, "S", "R", one_to_all=True)[:2] == (["S", "D", "R"], 25)
+    graph.set_weight("D", "R", 99)
+    assert shortest_path_tree(graph, "S") is not tree
+    assert Uninformed_cost_search(graph, "S", "R", one_to_all=True)[:2] == (["S", "A", "R"], 35)
+
+
+def test_landmark_table_reloads_only_for_the_same_method(tmp_path, monkeypatch):
+    graph_path = str(tmp_path / "roadmap.csv")
+    shutil.copy(ROADMAP_CSV, graph_path)
+    built = []
+    compute = landmarks.compute_landmarks
+    monkeypatch.setattr(landmarks, "compute_landmarks", lambda *args: built.append(args[2]) or compute(*args))
+    for method in ("random", "random", "farthest", "farthest"):
+        table = landmark_table(load_graph(graph_path, use_cache=False), graph_path, 3, method)
+        assert table.method == method
+    assert built == ["random", "farthest"]
+
+
+@pytest.mark.parametrize("method", ["farthest", "random"])
+def test_landmark_bounds_are_admissible(method):
+    for seed in range(20):
+        graph = random_graph(seed)
+        table = compute_landmarks(graph, 3, method, seed)
+        for goal in graph:
+            h = table.heuristic(goal)
+            for node, name in enumerate(table.names):
+                assert h[node] <= ucs_cost(graph, name, goal)
+            assert inadmissible_entries(graph, dict(zip(table.names, h.tolist())), goal) == {}
+
+
+def test_inadmissible_entries_roadmap():
+    assert inadmissible_entries(ROADMAP, ROADMAP_HEURISTICS, "R") == {
+        "A": (40, 26), "B": (30, 24), "C": (30, 27), "D": (35, 21)}
+
+
+IMG_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "img")
+
+
+def test_station_images_load_by_node_and_late_images_show_up(tmp_path, monkeypatch):
+    for file_name in ("a.png", "graph.png"):
+        shutil.copy(os.path.join(IMG_DIR, file_name), tmp_path / file_name)
+    registry = AssetRegistry(str(tmp_path), names=["A", "B"])
+    assert list(registry.encoded) == ["a"]
+    monkeypatch.setattr(station_assets, "STATION_ASSETS", registry)
+    monkeypatch.setattr(station_assets, "_path_items", {})
+    assert "<img" in path_item("A")
+    assert "<img" not in path_item("B")
+    shutil.copy(os.path.join(IMG_DIR, "b.png"), tmp_path / "b.png")
+    assert "<img" in path_item("B")
+
+
+def test_iterative_deepening_reports_only_tracked_counters():
+    for search, args in ((iterative_deepening_DFS, ()), (IDA_star_search, (ROADMAP_HEURISTICS,))):
+        stats = SearchStats()
+        search(ROADMAP, "S", "R", *args, stats=stats)
+        assert stats.generated >= stats.expanded > 0 and stats.max_frontier > 0
+        assert stats.duplicates is None and "duplicates" not in str(stats)
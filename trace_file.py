@@ -0,0 +1,476 @@
+import mmap
+import struct
+from array import array
+from bisect import bisect_right
+from typing import Iterator, List, Tuple
+
+import numpy as np
+
+from algorithms import Expand, GoalFound, Push, SearchEvent, run_steps
+
+TRACE_SUFFIX = ".fgt"
+TRACE_VERSION = 1
+
+# Pops per block: a reader replays at most this many events' worth of steps to reach any step.
+DEFAULT_BLOCK_STEPS = 1024
+
+_MAGIC = b"FOETRACE"
+# magic, version, ordering, flags, block_steps
+_HEADER = struct.Struct("<8sIBBI")
+# blocks offset, block count, names offset, names length, steps, pushes, goal, magic
+_TRAILER = struct.Struct("<QQQQQQq8s")
+# events offset, events length, first step, pushes before the block, node records offset
+_BLOCK_FIELDS = 5
+# graph node id and parent index of one search node
+_RECORD = struct.Struct("<qq")
+_FLOAT = struct.Struct("<d")
+
+_ORDERINGS = ("lifo", "fifo", "priority")
+_PARENT_PATHS = 1
+_LAZY = 2
+_RECORD_GOAL = 4
+
+# An event is a varint whose low 3 bits hold the tag and bit 3 marks a push of an
+# already settled graph node; the value above them is the delta of an integer
+# priority (pushes) or the distance from the newest search node (pops).
+_PUSH = 0
+_PUSH_INT = 1
+_PUSH_FLOAT = 2
+_POP = 3
+_TAG_MASK = 7
+_STALE = 8
+_VALUE_SHIFT = 4
+
+
+def _put_varint(buffer: bytearray, value: int) -> None:
+    while value >= 0x80:
+        buffer.append((value & 0x7F) | 0x80)
+        value >>= 7
+    buffer.append(value)
+
+
+def _get_varint(data, position: int) -> Tuple[int, int]:
+    value = data[position]
+    position += 1
+    if value < 0x80:
+        return value, position
+    value &= 0x7F
+    shift = 7
+    while True:
+        byte = data[position]
+        position += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, position
+        shift += 7
+
+
+def _zigzag(value: int) -> int:
+    return value << 1 if value >= 0 else (-value << 1) - 1
+
+
+def _unzigzag(value: int) -> int:
+    return (value >> 1) ^ -(value & 1)
+
+
+def _put_priority(buffer: bytearray, priority) -> None:
+    """Writes a checkpoint priority: a tag byte, then a zigzag varint or a float64."""
+    if priority is None:
+        buffer.append(_PUSH)
+    elif isinstance(priority, int):
+        buffer.append(_PUSH_INT)
+        _put_varint(buffer, _zigzag(priority))
+    else:
+        buffer.append(_PUSH_FLOAT)
+        buffer += _FLOAT.pack(priority)
+
+
+def _get_priority(data, position: int):
+    tag = data[position]
+    position += 1
+    if tag == _PUSH_INT:
+        value, position = _get_varint(data, position)
+        return _unzigzag(value), position
+    if tag == _PUSH_FLOAT:
+        return _FLOAT.unpack_from(data, position)[0], position + _FLOAT.size
+    return None, position
+
+
+class TraceWriter:
+    """
+    Streams the events of a search into a binary trace file while the search runs.
+
+    The file is a sequence of blocks of block_steps pops each. A block holds a
+    checkpoint of the search nodes on the frontier when it starts, so it can be
+    replayed without the blocks before it; its events as varints; and the graph
+    node id and parent of every search node pushed in it, as fixed-width
+    integers a reader can look up directly. Full blocks go straight to disk, so
+    the writer only keeps the current block and the live frontier in memory.
+    close() appends the block index and the node names.
+
+    Parameters:
+    - path: Destination file, conventionally ending in TRACE_SUFFIX.
+    - block_steps: Pops per block.
+    """
+    def __init__(self, path: str, block_steps: int = DEFAULT_BLOCK_STEPS):
+        if block_steps < 1:
+            raise ValueError(f"block_steps must be at least 1, got {block_steps!r}")
+        self.trace_path = path
+        self.block_steps = block_steps
+        self.steps = 0
+        self.pushes = 0
+        self.goal = -1
+        self._view = None
+        self._names = []
+        self._blocks = []
+        self._events = bytearray()
+        self._records = array("q")
+        # Frontier entries by search node index, in push order: (graph node id, priority)
+        self._live = {}
+        self._settled = set()
+        self._block_pops = 0
+        self._previous_priority = 0
+        self._file = open(path, "wb")
+        self._file.write(bytes(_HEADER.size))
+        self._start_block()
+
+    def _flush_block(self) -> None:
+        """Writes the buffered events and node records of the current block."""
+        file = self._file
+        block = self._blocks[-1]
+        block[0] = file.tell()
+        block[1] = len(self._events)
+        file.write(self._events)
+        file.write(bytes(-file.tell() % 8))
+        block[4] = file.tell()
+        file.write(self._records.tobytes())
+        self._events = bytearray()
+        self._records = array("q")
+
+    def _start_block(self) -> None:
+        if self._blocks:
+            self._flush_block()
+        self._blocks.append([0, 0, self.steps, self.pushes, 0])
+        self._block_pops = 0
+        self._previous_priority = 0
+        live = self._live
+        if self._settled:
+            # Entries of settled nodes are hidden from a lazy frontier for good
+            for index in [index for index, (node, _) in live.items() if node in self._settled]:
+                del live[index]
+        buffer = self._events
+        _put_varint(buffer, len(live))
+        previous = 0
+        for index, (_, priority) in live.items():
+            _put_varint(buffer, index - previous)
+            _put_priority(buffer, priority)
+            previous = index
+
+    def record(self, event: SearchEvent) -> None:
+        """
+        Appends one event of a step generator.
+
+        Parameters:
+        - event: A Push, Expand or GoalFound event.
+        """
+        pool = event.pool
+        index = event.index
+        if self._view is None:
+            if event.view.ordering not in _ORDERINGS:
+                raise ValueError(f"Searches with {event.view.ordering!r} ordering cannot be saved as a trace")
+            self._view = event.view
+            self._names = pool.labels
+        kind = type(event)
+        if kind is Push:
+            node = pool.nodes[index]
+            self._records.append(node)
+            self._records.append(pool.parents[index])
+            self.pushes += 1
+            stale = _STALE if node in self._settled else 0
+            priority = event.priority
+            buffer = self._events
+            if priority is None:
+                _put_varint(buffer, _PUSH | stale)
+            elif isinstance(priority, int):
+                _put_varint(buffer, (_zigzag(priority - self._previous_priority) << _VALUE_SHIFT) | _PUSH_INT | stale)
+                self._previous_priority = priority
+            else:
+                _put_varint(buffer, _PUSH_FLOAT | stale)
+                buffer += _FLOAT.pack(priority)
+            if not stale:
+                self._live[index] = (node, priority)
+        elif kind is Expand:
+            if self._block_pops == self.block_steps:
+                self._start_block()
+            self._block_pops += 1
+            _put_varint(self._events, ((self.pushes - 1 - index) << _VALUE_SHIFT) | _POP)
+            self._live.pop(index, None)
+            if self._view.lazy:
+                self._settled.add(pool.nodes[index])
+            self.steps += 1
+        elif kind is GoalFound:
+            self.goal = index
+
+    def tee(self, steps: Iterator[SearchEvent]) -> Iterator[SearchEvent]:
+        """Records every event of a step generator while passing it on, e.g. to run_steps()."""
+        for event in steps:
+            self.record(event)
+            yield event
+
+    def close(self) -> None:
+        """Writes the last block, the block index, the names and the header; the trace is unreadable before."""
+        file = self._file
+        if file.closed:
+            return
+        self._flush_block()
+        blocks_offset = file.tell()
+        file.write(array("q", [value for block in self._blocks for value in block]).tobytes())
+        names_offset = file.tell()
+        names_blob = "\n".join(self._names).encode("utf-8")
+        file.write(names_blob)
+        file.write(_TRAILER.pack(blocks_offset, len(self._blocks), names_offset, len(names_blob),
+                                 self.steps, self.pushes, self.goal, _MAGIC))
+        view = self._view
+        ordering = flags = 0
+        if view is not None:
+            ordering = _ORDERINGS.index(view.ordering)
+            flags = ((_PARENT_PATHS if view.parent_paths else 0) | (_LAZY if view.lazy else 0)
+                     | (_RECORD_GOAL if view.record_goal else 0))
+        file.seek(0)
+        file.write(_HEADER.pack(_MAGIC, TRACE_VERSION, ordering, flags, self.block_steps))
+        file.close()
+
+    def __enter__(self) -> 'TraceWriter':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class TraceReader:
+    """
+    Memory-mapped view of a trace written by TraceWriter.
+
+    Opening a trace reads only its header, trailer and block index. snapshot()
+    jumps to the block holding a step through the index and replays that block
+    alone from its checkpoint; paths are rebuilt from the node records of the
+    blocks they pass through. Snapshots and iteration match the frontier states
+    the search itself records (see FrontierTrace).
+
+    Parameters:
+    - path: The trace file.
+
+    Attributes:
+    - steps: Number of pops (frontier states) in the trace.
+    - pushes: Number of search nodes.
+    - goal: Search node index of the goal, or -1 if it was not reached.
+    - ordering, parent_paths, lazy, record_goal: How the search showed its frontier.
+    """
+    def __init__(self, path: str):
+        self.trace_path = path
+        with open(path, "rb") as file:
+            try:
+                self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                raise ValueError(f"{path} is not a complete version {TRACE_VERSION} search trace") from None
+        data = self._map
+        try:
+            magic, version, ordering, flags, self.block_steps = _HEADER.unpack_from(data, 0)
+            (blocks_offset, block_count, names_offset, names_length, self.steps, self.pushes, self.goal,
+             end_magic) = _TRAILER.unpack_from(data, len(data) - _TRAILER.size)
+        except struct.error:
+            magic = end_magic = None
+        if magic != _MAGIC or end_magic != _MAGIC or version != TRACE_VERSION:
+            self._map.close()
+            raise ValueError(f"{path} is not a complete version {TRACE_VERSION} search trace")
+        self.ordering = _ORDERINGS[ordering]
+        self.parent_paths = bool(flags & _PARENT_PATHS)
+        self.lazy = bool(flags & _LAZY)
+        self.record_goal = bool(flags & _RECORD_GOAL)
+        self._blocks = np.frombuffer(data, dtype=np.int64, count=block_count * _BLOCK_FIELDS,
+                                     offset=blocks_offset).reshape(block_count, _BLOCK_FIELDS)
+        # Small per-block lists, searched with bisect for every record lookup
+        self._first_steps = self._blocks[:, 2].tolist()
+        self._pushes_before = self._blocks[:, 3].tolist()
+        self._record_offsets = self._blocks[:, 4].tolist()
+        self._names_span = (names_offset, names_length)
+        self._names = None
+
+    @property
+    def names(self) -> List[str]:
+        """Graph node names by node id, decoded on first use."""
+        if self._names is None:
+            offset, length = self._names_span
+            self._names = self._map[offset:offset + length].decode("utf-8").split("\n") if length else []
+        return self._names
+
+    def _record(self, index: int) -> Tuple[int, int]:
+        """Returns the graph node id and parent index of a search node."""
+        if not 0 <= index < self.pushes:
+            raise IndexError(f"search node {index} out of range for a trace of {self.pushes} nodes")
+        block = bisect_right(self._pushes_before, index) - 1
+        offset = self._record_offsets[block] + (index - self._pushes_before[block]) * _RECORD.size
+        return _RECORD.unpack_from(self._map, offset)
+
+    def node(self, index: int) -> str:
+        """Name of the graph node of a search node."""
+        return self.names[self._record(index)[0]]
+
+    def parent(self, index: int) -> int:
+        """Index of a search node's parent (-1 for the root)."""
+        return self._record(index)[1]
+
+    def path(self, index: int) -> List[str]:
+        """Rebuilds the node names from the root to a search node (empty for -1)."""
+        names = self.names
+        path = []
+        while index != -1:
+            node, index = self._record(index)
+            path.append(names[node])
+        path.reverse()
+        return path
+
+    def _frontiers(self, block: int, step: int) -> Iterator[List[int]]:
+        """
+        Replays the trace from a block's checkpoint, yielding the frontier after each pop from step on.
+
+        Parameters:
+        - block: The block to start from.
+        - step: First step to yield; earlier pops of the block are replayed silently.
+
+        Yields:
+        - List of search node indices in frontier order.
+        """
+        data = self._map
+        blocks = self._blocks
+        by_priority = self.ordering == "priority"
+        lazy = self.lazy
+        live = {}
+        settled = set()
+        current = int(blocks[block, 2])
+        for block in range(block, len(blocks)):
+            position, length, _, pushes, _ = map(int, blocks[block])
+            end = position + length
+            # The checkpoint repeats what replaying the previous block left live
+            count, position = _get_varint(data, position)
+            live.clear()
+            index = 0
+            for _ in range(count):
+                delta, position = _get_varint(data, position)
+                index += delta
+                priority, position = _get_priority(data, position)
+                live[index] = (priority, index)
+            previous_priority = 0
+            while position < end:
+                value, position = _get_varint(data, position)
+                tag = value & _TAG_MASK
+                if tag == _POP:
+                    index = pushes - 1 - (value >> _VALUE_SHIFT)
+                    del live[index]
+                    if current >= step:
+                        if by_priority:
+                            nodes = sorted(live, key=live.__getitem__)
+                            if lazy:
+                                nodes = [n for n in nodes if self._record(n)[0] not in settled]
+                        else:
+                            nodes = list(live)
+                        yield nodes
+                    if lazy:
+                        settled.add(self._record(index)[0])
+                    current += 1
+                    continue
+                if tag == _PUSH_INT:
+                    previous_priority += _unzigzag(value >> _VALUE_SHIFT)
+                    priority = previous_priority
+                elif tag == _PUSH_FLOAT:
+                    priority = _FLOAT.unpack_from(data, position)[0]
+                    position += _FLOAT.size
+                else:
+                    priority = None
+                if not value & _STALE:
+                    live[pushes] = (priority, pushes)
+                pushes += 1
+
+    def _paths(self, nodes: List[int]) -> List[List[str]]:
+        """Turns frontier node indices into paths the way the search shows them."""
+        if not self.parent_paths:
+            return [self.path(node) for node in nodes]
+        seen = set()
+        iteration = []
+        for index in nodes:
+            parent = self.parent(index)
+            if parent not in seen:
+                seen.add(parent)
+                iteration.append(self.path(parent))
+        return iteration
+
+    def frontier(self, step: int) -> List[int]:
+        """
+        Returns the search node indices on the frontier after the given pop, replaying one block.
+
+        Parameters:
+        - step: Index of the pop, from 0 to steps - 1.
+
+        Returns:
+        - The indices in frontier order.
+        """
+        if not 0 <= step < self.steps:
+            raise IndexError(f"step {step} out of range for a trace of {self.steps} steps")
+        block = bisect_right(self._first_steps, step) - 1
+        return next(self._frontiers(block, step))
+
+    def snapshot(self, step: int) -> List[List[str]]:
+        """
+        Rebuilds the frontier paths as they were after the given pop.
+
+        Parameters:
+        - step: Index of the pop, from 0 to steps - 1.
+
+        Returns:
+        - The frontier paths at that step.
+        """
+        return self._paths(self.frontier(step))
+
+    def __iter__(self) -> Iterator[List[List[str]]]:
+        """Yields the distinct frontier states in order, then the goal state, like a delta trace."""
+        seen = set()
+        last = []
+        for nodes in self._frontiers(0, 0) if self.steps else ():
+            last = self._paths(nodes)
+            key = tuple(map(tuple, last))
+            if key not in seen:
+                seen.add(key)
+                yield last
+        if self.record_goal and self.goal != -1:
+            yield last + [self.path(self.goal)]
+
+    def __len__(self) -> int:
+        return self.steps
+
+    def close(self) -> None:
+        self._blocks = None
+        self._map.close()
+
+    def __enter__(self) -> 'TraceReader':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def save_trace(steps: Iterator[SearchEvent], trace_path: str,
+               block_steps: int = DEFAULT_BLOCK_STEPS) -> Tuple[List[str], int]:
+    """
+    Runs a step generator to the end, streaming its events into a trace file.
+
+    Parameters:
+    - steps: A step generator, e.g. Uninformed_cost_search_steps(graph, start, goal).
+    - trace_path: Destination file.
+    - block_steps: Pops per block of the trace.
+
+    Returns:
+    - Tuple of the path found (empty if goal was not reached) and its cost.
+    """
+    with TraceWriter(trace_path, block_steps) as writer:
+        path, cost, _ = run_steps(writer.tee(steps), "off")
+    return path, cost